@@ -0,0 +1,132 @@
+"""Profile the pytest_collection_modifyitems hooks of the plugins
+
+With ``--collection-profile`` each implementation of the hook is timed, and the number of items it
+receives and leaves and the memory it allocates are recorded. The profile is reported in the
+terminal summary and logged, and exported to a JSON file when a path is given, e.g. to track the
+collection time in CI. With xdist, the workers collect: each one exports its own file, suffixed
+with the worker id.
+"""
+
+import json
+from pathlib import Path
+import time
+import tracemalloc
+
+import pytest
+from xdist import get_xdist_worker_id
+
+from robottelo.logging import collection_logger as logger
+
+profile_key = pytest.StashKey[list]()
+
+
+def pytest_addoption(parser):
+    """Add --collection-profile option to profile the collection modifying hooks"""
+    parser.addoption(
+        '--collection-profile',
+        nargs='?',
+        const=True,
+        default=False,
+        metavar='JSON_PATH',
+        help='Time and count the items and allocations of each pytest_collection_modifyitems '
+        'hook, report them in the terminal summary and export them to JSON_PATH if provided.',
+    )
+
+
+def _profiled(hookimpl, records):
+    """Return the hook implementation function recording its profile in records"""
+    function = hookimpl.function
+    items_index = hookimpl.argnames.index('items') if 'items' in hookimpl.argnames else None
+
+    def profiled(*args):
+        items = None if items_index is None else args[items_index]
+        items_in = None if items is None else len(items)
+        tracemalloc.reset_peak()
+        memory_start = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            duration = time.perf_counter() - start
+            memory_end, memory_peak = tracemalloc.get_traced_memory()
+            records.append(
+                {
+                    'plugin': hookimpl.plugin_name,
+                    'function': function.__qualname__,
+                    'duration': duration,
+                    'items_in': items_in,
+                    'items_out': None if items is None else len(items),
+                    'allocated': memory_end - memory_start,
+                    'peak': memory_peak - memory_start,
+                }
+            )
+
+    return profiled
+
+
+@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+def pytest_collection_modifyitems(session, config, items):
+    """Wrap the other implementations of the hook, including the ones of the conftest files"""
+    profile = config.getoption('collection_profile', False)
+    if not profile:
+        yield
+        return
+    hookimpls = [
+        hookimpl
+        for hookimpl in config.hook.pytest_collection_modifyitems.get_hookimpls()
+        if not (hookimpl.hookwrapper or hookimpl.wrapper)
+    ]
+    records = []
+    functions = {hookimpl: hookimpl.function for hookimpl in hookimpls}
+    for hookimpl in hookimpls:
+        hookimpl.function = _profiled(hookimpl, records)
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    start = time.perf_counter()
+    yield
+    duration = time.perf_counter() - start
+    if not tracing:
+        tracemalloc.stop()
+    for hookimpl, function in functions.items():
+        hookimpl.function = function
+
+    config.stash[profile_key] = records
+    for record in records:
+        logger.info('Collection profile: %s', record)
+    if profile is not True:
+        path = Path(profile)
+        worker_id = get_xdist_worker_id(session)
+        if worker_id != 'master':
+            path = path.with_name(f'{path.stem}.{worker_id}{path.suffix}')
+        path.write_text(
+            json.dumps(
+                {'worker': worker_id, 'duration': duration, 'items': len(items), 'hooks': records},
+                indent=4,
+            )
+        )
+
+
+def _format_size(size):
+    return f'{size / 1024:,.0f}K'
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Report the profile of the collection modifying hooks, in the order they ran"""
+    records = config.stash.get(profile_key, None)
+    if not records:
+        return
+    total = sum(record['duration'] for record in records) or 1
+    terminalreporter.write_sep('=', 'collection profile')
+    terminalreporter.write_line(
+        f'{"duration":>9} {"share":>6} {"items in":>9} {"items out":>9} '
+        f'{"allocated":>9} {"peak":>9}  hook'
+    )
+    for record in records:
+        terminalreporter.write_line(
+            f'{record["duration"]:8.3f}s {record["duration"] / total:6.1%} '
+            f'{record["items_in"] if record["items_in"] is not None else "-":>9} '
+            f'{record["items_out"] if record["items_out"] is not None else "-":>9} '
+            f'{_format_size(record["allocated"]):>9} {_format_size(record["peak"]):>9}  '
+            f'{record["plugin"]}::{record["function"]}'
+        )
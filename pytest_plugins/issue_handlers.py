@@ -1,8 +1,5 @@
 from collections import defaultdict
 from datetime import datetime
-import inspect
-import json
-import re
 
 import pytest
 
@@ -13,9 +10,11 @@ from robottelo.utils.issue_handlers import (
     add_workaround,
     bugzilla,
     is_open,
+    jira,
     should_deselect,
 )
-from robottelo.utils.version import VersionEncoder, search_version_key
+from robottelo.utils.issue_handlers.cache import IssueCache
+from robottelo.utils.metadata_index import get_metadata_index
 
 DEFAULT_BZ_CACHE_FILE = 'bz_cache.json'
 
@@ -29,9 +28,8 @@ def pytest_addoption(parser):
     parser.addoption(
         "--bz-cache",
         action='store_true',
-        help=f"Use an existing {DEFAULT_BZ_CACHE_FILE} file instead of calling BZ API."
-        f"Without this flag a cache file will be created with the name {DEFAULT_BZ_CACHE_FILE}."
-        "This default cache file can be used on subsequent runs by including this flag",
+        help=f"Use and update the {DEFAULT_BZ_CACHE_FILE} issue cache file, only the new issues "
+        "and the ones whose cache time to live is over are fetched from the BZ and Jira APIs.",
     )
     parser.addoption(
         "--BZ",
@@ -100,35 +98,6 @@ def pytest_collection_modifyitems(session, items, config):
     items[:] = selected
 
 
-IS_OPEN = re.compile(
-    # To match `if is_open('BZ:123456'):`
-    r"\s*if\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"
-)
-
-NOT_IS_OPEN = re.compile(
-    # To match `if not is_open('BZ:123456'):`
-    r"\s*if\snot\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"
-)
-
-COMPONENT = re.compile(
-    # To match :CaseComponent: FooBar
-    r"\s*:CaseComponent:\s*(?P<component>\S*)",
-    re.IGNORECASE,
-)
-
-IMPORTANCE = re.compile(
-    # To match :CaseImportance: Critical
-    r"\s*:CaseImportance:\s*(?P<importance>\S*)",
-    re.IGNORECASE,
-)
-
-BZ = re.compile(
-    # To match :BZ: 123456, 456789
-    r"\s*:BZ:\s*(?P<bz>.*\S*)",
-    re.IGNORECASE,
-)
-
-
 def generate_issue_collection(items, config):  # pragma: no cover
     """Generates a dictionary with the usage of Issue blockers
 
@@ -173,23 +142,14 @@ def generate_issue_collection(items, config):  # pragma: no cover
     valid_markers = ["skip_if_open", "skip", "deselect"]
     collected_data = defaultdict(lambda: {"data": {}, "used_in": []})
 
-    use_bz_cache = config.getoption('bz_cache', None)  # use existing json cache?
+    use_bz_cache = config.getoption('bz_cache', None)  # use and update the issue cache?
+    issue_cache = IssueCache(DEFAULT_BZ_CACHE_FILE) if use_bz_cache else None
     cached_data = None
-    if use_bz_cache:
-        try:
-            with open(DEFAULT_BZ_CACHE_FILE) as bz_cache_file:
-                logger.info(f'Using BZ cache file for issue collection: {DEFAULT_BZ_CACHE_FILE}')
-                cached_data = {
-                    k: search_version_key(k, v) for k, v in json.load(bz_cache_file).items()
-                }
-        except FileNotFoundError:
-            # no bz cache file exists
-            logger.warning(
-                f'--bz-cache option used, cache file [{DEFAULT_BZ_CACHE_FILE}] not found'
-            )
 
     deselect_data = {}  # a local cache for deselected tests
 
+    metadata_index = get_metadata_index()
+
     test_modules = set()
 
     # --- Build the issue marked usage collection ---
@@ -206,10 +166,9 @@ def generate_issue_collection(items, config):  # pragma: no cover
         test_modules.add(item.module)
         # Find matches from docstrings top-down from: module, class, function.
         mod_cls_fun = (item.module, getattr(item, 'cls', None), item.function)
-        for docstring in [d for d in map(inspect.getdoc, mod_cls_fun) if d is not None]:
-            bz_matches = BZ.findall(docstring)
-            if bz_matches:
-                bz_marks_to_add.extend(b.strip() for b in bz_matches[-1].split(','))
+        for tokens in [t for t in map(metadata_index.docstring_tokens, mod_cls_fun) if t]:
+            if tokens['bz']:
+                bz_marks_to_add.extend(tokens['bz'])
 
         filepath, lineno, testcase = item.location
         # Component and importance marks are determined by testimony tokens
@@ -241,8 +200,8 @@ def generate_issue_collection(items, config):  # pragma: no cover
                 bz_marks_to_add.append(issue_key.split(':')[-1])
 
         # Then take the workarounds using `is_open` helper.
-        source = inspect.getsource(item.function)
-        if 'is_open(' in source:
+        workarounds = metadata_index.source_workarounds(item.function)
+        if workarounds['is_open'] or workarounds['not_is_open']:
             kwargs = {
                 'filepath': filepath,
                 'lineno': lineno,
@@ -251,8 +210,8 @@ def generate_issue_collection(items, config):  # pragma: no cover
                 'importance': importance_mark,
                 'component_mark': component_slug,
             }
-            add_workaround(collected_data, IS_OPEN.findall(source), 'is_open', **kwargs)
-            add_workaround(collected_data, NOT_IS_OPEN.findall(source), 'not is_open', **kwargs)
+            add_workaround(collected_data, workarounds['is_open'], 'is_open', **kwargs)
+            add_workaround(collected_data, workarounds['not_is_open'], 'not is_open', **kwargs)
 
         # Add BZs from tokens as a marker to enable filter e.g: "--BZ 123456"
         if bz_marks_to_add:
@@ -260,17 +219,13 @@ def generate_issue_collection(items, config):  # pragma: no cover
 
     # Take uses of `is_open` from outside of test cases e.g: SetUp methods
     for test_module in test_modules:
-        module_source = inspect.getsource(test_module)
-        component_matches = COMPONENT.findall(module_source)
-        module_component = None
-        if component_matches:
-            module_component = component_matches[0]
-        if 'is_open(' in module_source:
+        workarounds = metadata_index.source_workarounds(test_module)
+        if workarounds['is_open'] or workarounds['not_is_open']:
             kwargs = {
                 'filepath': test_module.__file__,
                 'lineno': 1,
                 'testcase': test_module.__name__,
-                'component': module_component,
+                'component': workarounds['component'],
             }
 
             def validation(data, issue, usage, **kwargs):
@@ -278,21 +233,29 @@ def generate_issue_collection(items, config):  # pragma: no cover
 
             add_workaround(
                 collected_data,
-                IS_OPEN.findall(module_source),
+                workarounds['is_open'],
                 'is_open',
                 validation=validation,
                 **kwargs,
             )
             add_workaround(
                 collected_data,
-                NOT_IS_OPEN.findall(module_source),
+                workarounds['not_is_open'],
                 'not is_open',
                 validation=validation,
                 **kwargs,
             )
 
-    # --- Collect BUGZILLA data ---
+    # --- Take the fresh issues from the cache ---
+    if issue_cache is not None:
+        logger.info(f'Using issue cache file for issue collection: {DEFAULT_BZ_CACHE_FILE}')
+        cached_data = issue_cache.get_cached_data(list(collected_data))
+
+    # --- Collect BUGZILLA data, and Jira data to be cached ---
     bugzilla.collect_data_bz(collected_data, cached_data)
+    if issue_cache is not None:
+        # without the cache the Jira issues are fetched when is_open is called
+        jira.collect_data_jira(collected_data, cached_data)
 
     # --- add deselect markers dynamically ---
     for item in items:
@@ -301,17 +264,19 @@ def generate_issue_collection(items, config):  # pragma: no cover
             collected_data[issue]['data']['is_deselected'] = True
             item.add_marker(pytest.mark.deselect(reason=issue))
 
-    # --- if no cache file existed write a new cache file ---
-    if cached_data is None and use_bz_cache:
-        collected_data['_meta'] = {
-            "version": settings.server.version,
-            "hostname": settings.server.hostname,
-            "created": datetime.now().isoformat(),
-            "pytest": {"args": config.args, "pwd": str(config.invocation_dir)},
-        }
-        # bz_cache_filename could be None from the option not being passed, write the file anyway
-        with open(DEFAULT_BZ_CACHE_FILE, 'w') as collect_file:
-            json.dump(collected_data, collect_file, indent=4, cls=VersionEncoder)
-            logger.info(f"Generated BZ cache file {DEFAULT_BZ_CACHE_FILE}")
+    # --- update the cache file with the new and refreshed issues ---
+    if issue_cache is not None:
+        issue_cache.update(
+            collected_data,
+            cached_data,
+            meta={
+                "version": settings.server.version,
+                "hostname": settings.server.hostname,
+                "updated": datetime.now().isoformat(),
+                "pytest": {"args": config.args, "pwd": str(config.invocation_dir)},
+            },
+        )
+        issue_cache.save()
+        logger.info(f"Updated issue cache file {DEFAULT_BZ_CACHE_FILE}")
 
     return collected_data
@@ -3,8 +3,9 @@ import logging
 
 import logzero
 import pytest
-from xdist import is_xdist_worker
+from xdist import get_xdist_worker_id, is_xdist_worker
 
+from robottelo.cli import hammer_shell
 from robottelo.logging import (
     DEFAULT_DATE_FORMAT,
     broker_log_setup,
@@ -13,6 +14,7 @@ from robottelo.logging import (
     robottelo_log_dir,
     robottelo_log_file,
 )
+from robottelo.utils.ssh import get_ssh_pool
 
 with contextlib.suppress(ImportError):
     from pytest_reportportal import RPLogger, RPLogHandler
@@ -76,3 +78,11 @@ def pytest_runtest_logreport(report):
     """Process the TestReport produced for each of the setup,
     call and teardown runtest phases of an item."""
     logger.info('Finished %s for test: %s, result: %s', report.when, report.nodeid, report.outcome)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Report the ssh session pool usage of this worker and close the persistent connections"""
+    hammer_shell.close_all()
+    if pool := get_ssh_pool():
+        logger.info('SSH session pool stats for %s: %s', get_xdist_worker_id(session), pool.stats())
+        pool.clear()
@@ -1,6 +1,4 @@
 import datetime
-import inspect
-import re
 
 import pytest
 
@@ -9,6 +7,7 @@ from robottelo.hosts import get_sat_rhel_version
 from robottelo.logging import collection_logger as logger
 from robottelo.utils import parse_comma_separated_list
 from robottelo.utils.issue_handlers.jira import are_any_jira_open
+from robottelo.utils.metadata_index import get_metadata_index
 
 FMT_XUNIT_TIME = '%Y-%m-%dT%H:%M:%S'
 IMPORTANCE_LEVELS = []
@@ -63,37 +62,6 @@ def pytest_configure(config):
         config.addinivalue_line("markers", marker)
 
 
-component_regex = re.compile(
-    # To match :CaseComponent: FooBar
-    r'\s*:CaseComponent:\s*(?P<component>\S*)',
-    re.IGNORECASE,
-)
-
-importance_regex = re.compile(
-    # To match :CaseImportance: Critical
-    r'\s*:CaseImportance:\s*(?P<importance>\S*)',
-    re.IGNORECASE,
-)
-
-team_regex = re.compile(
-    # To match :Team: Rocket
-    r'\s*:Team:\s*(?P<team>\S*)',
-    re.IGNORECASE,
-)
-
-blocked_by_regex = re.compile(
-    # To match :BlockedBy: SAT-32932
-    r'\s*:BlockedBy:\s*(?P<blocked_by>.*\S*)',
-    re.IGNORECASE,
-)
-
-verifies_regex = re.compile(
-    # To match :Verifies: SAT-32932
-    r'\s*:Verifies:\s*(?P<verifies>.*\S*)',
-    re.IGNORECASE,
-)
-
-
 def handle_verification_issues(item, verifies_marker, verifies_issues):
     """Handles the logic for deselecting tests based on Verifies testimony token
     and --verifies-issues pytest option.
@@ -162,6 +130,7 @@ def pytest_collection_modifyitems(items, config):
     team = [a.lower() for a in (config.getoption('team') or '').split(',') if a != '']
     verifies_issues = config.getoption('verifies_issues')
     blocked_by = config.getoption('blocked_by')
+    metadata_index = get_metadata_index()
     logger.info('Processing test items to add testimony token markers')
     for item in items:
         item.user_properties.append(
@@ -173,34 +142,31 @@ def pytest_collection_modifyitems(items, config):
 
         # apply the marks for importance, component, and team
         # Find matches from docstrings starting at smallest scope
-        item_docstrings = [
-            d
-            for d in map(inspect.getdoc, (item.function, getattr(item, 'cls', None), item.module))
-            if d is not None
+        # the docstrings are parsed once and indexed, see robottelo.utils.metadata_index
+        item_tokens = [
+            t
+            for t in map(
+                metadata_index.docstring_tokens,
+                (item.function, getattr(item, 'cls', None), item.module),
+            )
+            if t is not None
         ]
         blocked_by_marks_to_add = []
         verifies_marks_to_add = []
-        for docstring in item_docstrings:
+        for tokens in item_tokens:
             item_mark_names = [m.name for m in item.iter_markers()]
             # Add marker starting at smallest docstring scope
             # only add the mark if it hasn't already been applied at a lower scope
-            doc_component = component_regex.findall(docstring)
-            if doc_component and 'component' not in item_mark_names:
-                item.add_marker(pytest.mark.component(doc_component[0].lower()))
-            doc_importance = importance_regex.findall(docstring)
-            if doc_importance and 'importance' not in item_mark_names:
-                item.add_marker(pytest.mark.importance(doc_importance[0].lower()))
-            doc_team = team_regex.findall(docstring)
-            if doc_team and 'team' not in item_mark_names:
-                item.add_marker(pytest.mark.team(doc_team[0].lower()))
-            doc_verifies = verifies_regex.findall(docstring)
-            if doc_verifies and 'verifies_issues' not in item_mark_names:
-                verifies_marks_to_add.extend(str(b.strip()) for b in doc_verifies[-1].split(','))
-            doc_blocked_by = blocked_by_regex.findall(docstring)
-            if doc_blocked_by and 'blocked_by' not in item_mark_names:
-                blocked_by_marks_to_add.extend(
-                    str(b.strip()) for b in doc_blocked_by[-1].split(',')
-                )
+            if tokens['component'] is not None and 'component' not in item_mark_names:
+                item.add_marker(pytest.mark.component(tokens['component'].lower()))
+            if tokens['importance'] is not None and 'importance' not in item_mark_names:
+                item.add_marker(pytest.mark.importance(tokens['importance'].lower()))
+            if tokens['team'] is not None and 'team' not in item_mark_names:
+                item.add_marker(pytest.mark.team(tokens['team'].lower()))
+            if tokens['verifies'] and 'verifies_issues' not in item_mark_names:
+                verifies_marks_to_add.extend(tokens['verifies'])
+            if tokens['blocked_by'] and 'blocked_by' not in item_mark_names:
+                blocked_by_marks_to_add.extend(tokens['blocked_by'])
         if blocked_by_marks_to_add:
             item.add_marker(pytest.mark.blocked_by(blocked_by_marks_to_add))
         if verifies_marks_to_add:
@@ -278,3 +244,8 @@ def pytest_collection_modifyitems(items, config):
     # selected will be empty if no filter option was passed, defaulting to full items list
     items[:] = selected if deselected else items
     config.hook.pytest_deselected(items=deselected)
+
+
+def pytest_collection_finish(session):
+    """Persist the metadata index for the next collections"""
+    get_metadata_index().save()
@@ -1,16 +1,39 @@
 """Generic base class for cli hammer commands."""
 
+import base64
+from concurrent.futures import ThreadPoolExecutor
 import re
+import threading
+import uuid
 
+from box import Box
+from broker.helpers import Result
 from wait_for import wait_for
 
 from robottelo import ssh
-from robottelo.cli import hammer
+from robottelo.cli import command_tree, hammer, hammer_shell, rest_read
 from robottelo.config import settings
-from robottelo.exceptions import CLIDataBaseError, CLIError, CLIReturnCodeError
+from robottelo.exceptions import (
+    CLIBaseError,
+    CLIDataBaseError,
+    CLIError,
+    CLIReturnCodeError,
+)
 from robottelo.logging import logger
 from robottelo.utils.ssh import get_client
 
+_prefetch_executor = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def _get_prefetch_executor():
+    """Return the thread pool fetching the next pages of :meth:`Base.paginate`"""
+    global _prefetch_executor
+    with _prefetch_executor_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(thread_name_prefix='hammer-prefetch')
+        return _prefetch_executor
+
 
 class Base:
     """Base class for hammer CLI interaction
@@ -23,6 +46,9 @@ class Base:
     command_sub = None  # specific to instance, like: create, update, etc.
     command_end = None  # extending commands like for directory to pass
     command_requires_org = False  # True when command requires organization-id
+    # False when create returns its own output instead of fetching the entity, the fetch is
+    # deferred for the entities of performance.lean_create, see Base.create
+    fetch_created = True
     hostname = None  # Now used for Satellite class hammer execution
     logger = logger
     _db_error_regex = re.compile(r'.*INSERT INTO|.*SELECT .*FROM|.*violates foreign key')
@@ -86,6 +112,10 @@ class Base:
     def create(cls, options=None, timeout=None):
         """
         Creates a new record using the arguments passed via dictionary.
+
+        The new record is fetched with ``info`` when ``fetch_created`` is set. For the entities
+        of ``performance.lean_create`` the fetch is deferred: a :class:`CreatedEntity` holding
+        the id is returned instead.
         """
 
         cls.command_sub = 'create'
@@ -96,7 +126,7 @@ class Base:
         result = cls.execute(cls._construct_command(options), output_format='csv', timeout=timeout)
 
         # Extract new object ID if it was successfully created
-        if len(result) > 0 and 'id' in result[0]:
+        if cls.fetch_created and len(result) > 0 and 'id' in result[0]:
             obj_id = result[0]['id']
 
             # Fetch new object
@@ -108,17 +138,10 @@ class Base:
                     raise CLIError(tmpl.format(cls.__name__))
                 info_options['organization-id'] = options['organization-id']
 
-            # organization creation can take some time
-            if cls.command_base == 'organization':
-                new_obj, _ = wait_for(
-                    lambda: cls.info(info_options),
-                    timeout=300000,
-                    delay=5,
-                    silent_failure=True,
-                    handle_exception=True,
-                )
-            else:
-                new_obj = cls.info(info_options)
+            if cls._lean_create():
+                return CreatedEntity({'id': obj_id}, fetch=lambda: cls._fetch_created(info_options))
+
+            new_obj = cls._fetch_created(info_options)
 
             # stdout should be a dictionary containing the object
             if len(new_obj) > 0:
@@ -126,6 +149,27 @@ class Base:
 
         return result
 
+    @classmethod
+    def _lean_create(cls):
+        """Whether create defers fetching the new entity, see ``performance.lean_create``"""
+        lean_settings = settings.performance.lean_create
+        return lean_settings.enabled and cls.command_base in lean_settings.entities
+
+    @classmethod
+    def _fetch_created(cls, info_options):
+        """Fetch an entity just created by :meth:`create`"""
+        # organization creation can take some time
+        if cls.command_base == 'organization':
+            new_obj, _ = wait_for(
+                lambda: cls.info(info_options),
+                timeout=300000,
+                delay=5,
+                silent_failure=True,
+                handle_exception=True,
+            )
+            return new_obj
+        return cls.info(info_options)
+
     @classmethod
     def delete(cls, options=None, timeout=None):
         """Deletes existing record."""
@@ -172,6 +216,26 @@ class Base:
 
         return (username, password)
 
+    @classmethod
+    def _get_credentials(cls, user=None, password=None):
+        """Return the hammer credentials, ``(None, None)`` when omitting credentials"""
+        if cls.omitting_credentials:
+            return (None, None)
+        return cls._get_username_password(user, password)
+
+    @staticmethod
+    def _hammer_command(command, user, password, output_format=None, time_hammer=False):
+        """Build the full hammer command line for ``command``"""
+        # add time to measure hammer performance
+        return 'LANG={} {} hammer -v {} {} {} {}'.format(
+            settings.robottelo.locale,
+            'time -p' if time_hammer else '',
+            f'-u {user}' if user else "--interactive no",
+            f'-p {password}' if password else "",
+            f'--output={output_format}' if output_format else "",
+            command,
+        )
+
     @classmethod
     def execute(
         cls,
@@ -184,32 +248,54 @@ class Base:
         ignore_stderr=None,
         return_raw_response=None,
     ):
-        """Executes the cli ``command`` on the server via ssh"""
-        if cls.omitting_credentials:
-            user, password = None, None
-        else:
-            user, password = cls._get_username_password(user, password)
+        """Executes the cli ``command`` on the server via ssh
+
+        With ``performance.hammer_shell`` enabled the command is run by the persistent hammer
+        process of the server, see :mod:`robottelo.cli.hammer_shell`.
+        """
+        user, password = cls._get_credentials(user, password)
         time_hammer = settings.performance.time_hammer
+        hostname = hostname or cls.hostname or settings.server.hostname
 
-        # add time to measure hammer performance
-        cmd = 'LANG={} {} hammer -v {} {} {} {}'.format(
-            settings.robottelo.locale,
-            'time -p' if time_hammer else '',
-            f'-u {user}' if user else "--interactive no",
-            f'-p {password}' if password else "",
-            f'--output={output_format}' if output_format else "",
-            command,
-        )
-        response = ssh.command(
-            cmd,
-            hostname=hostname or cls.hostname or settings.server.hostname,
-            output_format=output_format,
-            timeout=timeout,
-        )
+        response = None
+        if settings.performance.hammer_shell and not time_hammer:
+            response = cls._execute_in_hammer_shell(
+                command, hostname, user, password, output_format, timeout
+            )
+        if response is None:
+            response = ssh.command(
+                cls._hammer_command(command, user, password, output_format, time_hammer),
+                hostname=hostname,
+                output_format=output_format,
+                timeout=timeout,
+            )
         if return_raw_response:
             return response
         return cls._handle_response(response, ignore_stderr=ignore_stderr)
 
+    @classmethod
+    def _execute_in_hammer_shell(cls, command, hostname, user, password, output_format, timeout):
+        """Run ``command`` through the persistent hammer process
+
+        :return: the response or None if the command has to be run by a one-shot hammer
+        """
+        args = hammer_shell.split_command(command)
+        if args is None:
+            return None
+        hammer_args = ['-v']
+        hammer_args += ['-u', user] if user else ['--interactive', 'no']
+        if password:
+            hammer_args += ['-p', password]
+        if output_format:
+            hammer_args.append(f'--output={output_format}')
+        return hammer_shell.execute(
+            hostname,
+            hammer_args + args,
+            output_format=output_format,
+            timeout=timeout,
+            read_only=cls.command_sub in hammer_shell.READ_ONLY_SUBCOMMANDS,
+        )
+
     @classmethod
     def sm_execute(cls, command, hostname=None, timeout=None, **kwargs):
         """Executes the satellite-maintain cli commands on the server via ssh"""
@@ -227,6 +313,7 @@ class Base:
         If ``options`` argument already have a search key, then the ``search``
         argument will not be evaluated. Which allows different search query.
 
+        Only the first page of one entity is requested.
         """
 
         if options is None:
@@ -235,11 +322,12 @@ class Base:
         if search is not None and 'search' not in options:
             options.update({'search': f'{search[0]}=\\"{search[1]}\\"'})
 
-        result = cls.list(options)
-        if result:
-            result = result[0]
-
-        return result
+        if cls.list.__func__ is not Base.list.__func__:
+            # the list command is customized, e.g. it does not accept --per-page
+            result = cls.list(options)
+            return result[0] if result else result
+        # only the first match is needed
+        return next(cls.paginate(options, per_page=1, prefetch=False), [])
 
     @classmethod
     def info(cls, options=None, output_format=None, return_raw_response=None):
@@ -266,6 +354,8 @@ class Base:
         """
         List information.
         @param options: ID (sometimes name works as well) to retrieve info.
+
+        Unless ``per-page`` is given, csv lists are read page by page, see :meth:`paginate`.
         """
 
         cls.command_sub = 'list'
@@ -273,8 +363,9 @@ class Base:
         if options is None:
             options = {}
 
-        if 'per-page' not in options and per_page:
-            options['per-page'] = 10000
+        paginated = 'per-page' not in options and per_page
+        if paginated:
+            options['per-page'] = settings.performance.pagination.per_page
 
         # With the introduction of hammer defaults, a default organization can be set
         # this makes getting around this check awkward.
@@ -282,7 +373,102 @@ class Base:
         # if cls.command_requires_org and 'organization-id' not in options:
         #     raise CLIError(f'organization-id option is required for {cls.__name__}.list')
 
-        return cls.execute(cls._construct_command(options), output_format=output_format)
+        from_api = output_format == 'csv' and rest_read.supports(cls, 'list', options)
+        if from_api and not settings.performance.rest_read.validate:
+            return rest_read.read(cls, 'list', options)
+
+        if paginated and output_format == 'csv' and 'page' not in options:
+            result = None
+            for page in cls._iter_pages(options):
+                result = page if result is None else result + page
+        else:
+            result = cls.execute(cls._construct_command(options), output_format=output_format)
+        if from_api:
+            rest_read.validate(cls, 'list', options, result)
+        return result
+
+    @classmethod
+    def paginate(cls, options=None, per_page=None, prefetch=None):
+        """Iterate over the listed entities, reading them page by page.
+
+        A page is only requested once the previous one is consumed, so breaking out of the loop
+        saves the remaining queries.
+
+        :param dict options: the hammer list options
+        :param int per_page: the page size, ``performance.pagination.per_page`` if None
+        :param bool prefetch: request the next page while the current one is consumed,
+            ``performance.pagination.prefetch`` if None
+        """
+        options = {
+            **(options or {}),
+            'per-page': per_page or settings.performance.pagination.per_page,
+        }
+        for page in cls._iter_pages(options, prefetch=prefetch):
+            yield from page
+
+    @classmethod
+    def _iter_pages(cls, options, prefetch=None):
+        """Yield the pages of ``hammer <command_base> list`` with ``options['per-page']`` rows"""
+        if prefetch is None:
+            prefetch = settings.performance.pagination.prefetch
+        per_page = int(options['per-page'])
+        cls.command_sub = 'list'
+
+        def command(page):
+            # built in the calling thread, command_sub is shared by all callers of the class
+            page_options = dict(options)
+            if page > 1:
+                page_options['page'] = page
+            return cls._construct_command(page_options)
+
+        page, next_page = 1, None
+        rows = cls.execute(command(page), output_format='csv')
+        try:
+            while True:
+                # a short page is the last one
+                last = len(rows) < per_page
+                if prefetch and not last:
+                    next_page = _get_prefetch_executor().submit(
+                        cls.execute, command(page + 1), output_format='csv'
+                    )
+                yield rows
+                if last:
+                    return
+                page += 1
+                if next_page is not None:
+                    rows, next_page = next_page.result(), None
+                else:
+                    rows = cls.execute(command(page), output_format='csv')
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    @classmethod
+    def iter_list(cls, options=None, per_page=True):
+        """Iterate over the listed entities.
+
+        Like :meth:`list` with the csv output format, but the rows are parsed while hammer output
+        is read from the ssh channel, so the complete output is never held in memory. Breaking
+        out of the loop closes the channel.
+
+        :raises robottelo.exceptions.CLIReturnCodeError: when the output is exhausted, if hammer
+            failed
+        """
+        cls.command_sub = 'list'
+
+        if options is None:
+            options = {}
+
+        if 'per-page' not in options and per_page:
+            options['per-page'] = settings.performance.pagination.per_page
+
+        user, password = cls._get_credentials()
+        response = ssh.stream_command(
+            cls._hammer_command(cls._construct_command(options), user, password, 'csv'),
+            hostname=cls.hostname or settings.server.hostname,
+        )
+        yield from hammer.iter_csv(response.stdout)
+        cls._handle_response(response)
 
     @classmethod
     def puppetclasses(cls, options=None):
@@ -338,6 +524,16 @@ class Base:
             return_raw_response=return_raw_response,
         )
 
+    @classmethod
+    def batch(cls, hostname=None, timeout=None, raise_on_error=True):
+        """Context Manager queueing hammer commands to run them in a single ssh call
+
+        See :class:`HammerBatch`.
+        """
+        return HammerBatch(
+            hostname=hostname or cls.hostname, timeout=timeout, raise_on_error=raise_on_error
+        )
+
     @classmethod
     def with_user(cls, username=None, password=None):
         """Context Manager for credentials"""
@@ -361,6 +557,9 @@ class Base:
         if options is None:
             options = {}
 
+        if settings.performance.validate_hammer_options:
+            command_tree.validate_options(cls.command_base, cls.command_sub, options)
+
         for key, val in options.items():
             if val is None:
                 continue
@@ -371,3 +570,190 @@ class Base:
                     val = ','.join(str(el) for el in val)
                 tail += f' --{key}="{val}"'
         return f"{cls.command_base or ''} {cls.command_sub or ''} {tail.strip()} {cls.command_end or ''}"
+
+
+class CreatedEntity(Box):
+    """Entity returned by :meth:`Base.create` in lean mode
+
+    It only holds the id of the entity, the entity is fetched with ``info`` the first time another
+    field is looked up. Iterating over it, or checking whether it contains a field, does not
+    fetch it.
+
+    :param fetch: callable returning the ``info`` of the entity
+    """
+
+    def __init__(self, *args, fetch=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        object.__setattr__(self, '_fetch', fetch)
+
+    def __getitem__(self, item, _ignore_default=False):
+        try:
+            return super().__getitem__(item, _ignore_default)
+        except KeyError:
+            fetch = self.__dict__.get('_fetch')
+            if fetch is None:
+                raise
+            object.__setattr__(self, '_fetch', None)
+            self.update(fetch() or {})
+            return super().__getitem__(item, _ignore_default)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class HammerBatchResult:
+    """Result of one command queued in a :class:`HammerBatch`
+
+    ``result`` holds what the equivalent :class:`Base` call would have returned and ``error``
+    the exception it would have raised, both are set when the batch has run.
+    """
+
+    def __init__(self, cli_cls, command_sub, command, output_format=None, ignore_stderr=None):
+        self.cli_cls = cli_cls
+        self.command_sub = command_sub
+        self.command = command
+        self.output_format = output_format
+        self.ignore_stderr = ignore_stderr
+        self.response = None
+        self.result = None
+        self.error = None
+
+    def _set_response(self, response):
+        """Handle the response like :meth:`Base.execute` and parse it like the Base methods"""
+        self.response = response
+        # _handle_response reports the sub-command of the class
+        self.cli_cls.command_sub = self.command_sub
+        try:
+            stdout = self.cli_cls._handle_response(response, ignore_stderr=self.ignore_stderr)
+        except CLIBaseError as err:
+            self.error = err
+            return
+        if self.output_format == 'csv':
+            self.result = hammer.parse_csv(stdout) if stdout else {}
+        elif self.output_format == 'json':
+            self.result = hammer.parse_json(stdout) if stdout else None
+        elif self.command_sub == 'info':
+            self.result = hammer.parse_info(stdout)
+        else:
+            self.result = stdout
+
+
+class HammerBatch:
+    """Queue independent hammer commands and run them in a single ssh call
+
+    The commands are run one after another by one remote script, so a setup issuing many
+    hammer commands pays for a single ssh round-trip. The output of a command can't be used by
+    a later command of the same batch. Usage::
+
+        with target_sat.cli.batch() as batch:
+            product = batch.add(target_sat.cli.Product, 'create', {'name': 'p', 'organization-id': 1})
+            orgs = batch.add(target_sat.cli.Org, 'list', output_format='csv')
+        product.result, orgs.result
+
+    :param str hostname: the server to run hammer on, ``settings.server.hostname`` by default
+    :param timeout: timeout of the whole batch, see :func:`robottelo.ssh.command`
+    :param bool raise_on_error: raise the error of the first failed command when the batch has
+        run, the results of the other commands are set anyway
+    """
+
+    def __init__(self, hostname=None, timeout=None, raise_on_error=True):
+        self.hostname = hostname
+        self.timeout = timeout
+        self.raise_on_error = raise_on_error
+        self.results = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.run()
+
+    def add(
+        self,
+        cli_cls,
+        command_sub,
+        options=None,
+        output_format='csv',
+        ignore_stderr=None,
+        user=None,
+        password=None,
+    ):
+        """Queue ``hammer <cli_cls.command_base> <command_sub> <options>``
+
+        :param cli_cls: a :class:`Base` subclass, e.g. ``target_sat.cli.Product``
+        :param str command_sub: the sub-command, e.g. ``create``
+        :param dict options: the command options, as for :meth:`Base._construct_command`
+        :param str output_format: json, csv or None, ``info`` output is parsed when None
+        :return: a :class:`HammerBatchResult` populated when the batch has run
+        """
+        cli_cls.command_sub = command_sub
+        command = cli_cls._construct_command(options)
+        user, password = cli_cls._get_credentials(user, password)
+        result = HammerBatchResult(
+            cli_cls,
+            command_sub,
+            cli_cls._hammer_command(command, user, password, output_format),
+            output_format=output_format,
+            ignore_stderr=ignore_stderr,
+        )
+        self.results.append(result)
+        return result
+
+    def _script(self, sentinel):
+        """Build the remote script running all queued commands"""
+        lines = ['d=$(mktemp -d)']
+        for index, result in enumerate(self.results):
+            lines.append(
+                f'{result.command} >"$d/{index}.out" 2>"$d/{index}.err"; echo $? >"$d/{index}.rc"'
+            )
+        lines += [
+            f'for i in $(seq 0 {len(self.results) - 1}); do',
+            f'echo "{sentinel} $i $(cat "$d/$i.rc")"; base64 -w0 "$d/$i.out"; echo; base64 -w0 "$d/$i.err"; echo',
+            'done',
+            'rm -rf "$d"',
+        ]
+        return '\n'.join(lines)
+
+    def run(self):
+        """Run all queued commands and populate their results
+
+        :return: the list of :class:`HammerBatchResult`
+        :raises robottelo.exceptions.CLIReturnCodeError: if the batch script failed or, with
+            ``raise_on_error``, the first error of the queued commands
+        """
+        if not self.results:
+            return self.results
+        sentinel = f'__robottelo_batch_{uuid.uuid4().hex}__'
+        response = ssh.command(
+            self._script(sentinel),
+            hostname=self.hostname or settings.server.hostname,
+            timeout=self.timeout,
+        )
+        lines = response.stdout.split('\n')
+        frames = {}
+        for pos, line in enumerate(lines):
+            if line.startswith(f'{sentinel} '):
+                _, index, status = line.split(' ')
+                frames[int(index)] = Result(
+                    status=int(status),
+                    stdout=base64.b64decode(lines[pos + 1]).decode(),
+                    stderr=base64.b64decode(lines[pos + 2]).decode(),
+                )
+        if len(frames) != len(self.results):
+            raise CLIReturnCodeError(
+                response.status,
+                response.stderr,
+                f'hammer batch returned {len(frames)} of {len(self.results)} results\n'
+                f'stderr contains:\n{response.stderr}',
+            )
+        for index, result in enumerate(self.results):
+            result._set_response(frames[index])
+        if self.raise_on_error:
+            for result in self.results:
+                if result.error is not None:
+                    raise result.error
+        return self.results
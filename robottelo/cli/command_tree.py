@@ -0,0 +1,212 @@
+"""Cached hammer command tree, used to validate hammer options before running a command.
+
+The tree maps every hammer command to its subcommands and to the names of the options it
+accepts, as read from ``hammer <command> --help``. It is generated once per Satellite version,
+the ``--help`` of all the commands of a level being read in parallel, and saved as json in the
+robottelo tmp directory so the next sessions against the same version only load it.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import json
+import os
+import re
+import threading
+
+from pytest_services.locks import file_lock
+
+from robottelo import ssh
+from robottelo.cli import hammer
+from robottelo.config import robottelo_tmp_dir, settings
+from robottelo.exceptions import CLIUnknownOptionError
+from robottelo.logging import logger
+
+# hammer exits with EX_USAGE on unknown options
+UNKNOWN_OPTION_STATUS = 64
+# seconds a session waits for another one to generate the tree
+GENERATE_TIMEOUT = 900
+
+_OPTION_NAME_REGEX = re.compile(r'--(?P<negation>\[no-\])?(?P<name>[\w\[\]|-]+)')
+_GROUPED_OPTION_REGEX = re.compile(r'^(?P<prefix>[\w-]+)\[(?P<postfixes>\S+)\]$')
+
+_tree = None
+_lock = threading.Lock()
+
+
+def _explode_option_name(name):
+    """Return the names of an option disguised as several, e.g. --hostgroup[s|-ids|-titles]"""
+    match = _GROUPED_OPTION_REGEX.search(name)
+    if not match:
+        return [name]
+    postfixes = match.group('postfixes').split('|')
+    if postfixes[0].startswith('-'):
+        postfixes.insert(0, '')
+    return [f'{match.group("prefix")}{postfix}' for postfix in postfixes]
+
+
+def parse_option_names(output):
+    """Return the names of all the options listed in the help output of a hammer command
+
+    Unlike :func:`robottelo.cli.hammer.parse_help`, deprecated names and the negated form of
+    ``--[no-]`` options are included, as hammer accepts them too.
+
+    :param str output: the output of ``hammer <command> --help``
+    :return: a sorted list of option names, without the leading dashes
+    """
+    names = set()
+    in_options = False
+    for line in output.splitlines():
+        if line.startswith('Options:'):
+            in_options = True
+        elif line and not line.startswith(' '):
+            in_options = False
+        elif in_options and line.startswith(' -'):
+            # the option column is separated from the help text by two spaces at least
+            definition = re.split(r'\s{2,}', line.strip(), maxsplit=1)[0]
+            for match in _OPTION_NAME_REGEX.finditer(definition):
+                for name in _explode_option_name(match.group('name')):
+                    names.add(name)
+                    if match.group('negation'):
+                        names.add(f'no-{name}')
+    return sorted(names)
+
+
+def _read_help(command, hostname):
+    return ssh.command(f'{command} --help', hostname=hostname).stdout
+
+
+def read_help(hostname=None, max_workers=8):
+    """Read the help of hammer and of all its subcommands, recursively
+
+    The commands of a level are all read in parallel before descending to the next level.
+
+    :param str hostname: the Satellite to read the help from, the configured one by default
+    :param int max_workers: how many ``--help`` commands are run at the same time
+    :return: a dict mapping commands, e.g. ``hammer organization create``, to their help output
+    """
+    hostname = hostname or settings.server.hostname
+    helps = {}
+    level = ['hammer']
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hammer-help') as executor:
+        while level:
+            outputs = executor.map(functools.partial(_read_help, hostname=hostname), level)
+            next_level = []
+            for command, output in zip(level, outputs, strict=True):
+                helps[command] = output
+                next_level.extend(
+                    f'{command} {subcommand["name"]}'
+                    for subcommand in hammer.parse_help(output)['subcommands']
+                )
+            level = next_level
+    return helps
+
+
+def build_command_tree(helps):
+    """Build the command tree out of the help outputs returned by :func:`read_help`
+
+    :return: the ``hammer`` node, every node is a dict with the ``options`` names of the command
+        and its ``subcommands`` nodes by name
+    """
+    nodes = {}
+    for command in sorted(helps, key=len):
+        nodes[command] = {'options': parse_option_names(helps[command]), 'subcommands': {}}
+        parent, _, name = command.rpartition(' ')
+        if parent in nodes:
+            nodes[parent]['subcommands'][name] = nodes[command]
+    return nodes.get('hammer', {})
+
+
+def get_command_tree_path(version):
+    """Return the path of the cached command tree of a Satellite version"""
+    return robottelo_tmp_dir.joinpath(f'hammer_command_tree_{version}.json')
+
+
+def load_command_tree(version, hostname=None, max_workers=8):
+    """Return the command tree of a Satellite version, generating and caching it if needed
+
+    The generation is guarded by a file lock, so concurrent sessions generate it only once.
+
+    :param version: the Satellite version the tree is cached for
+    :param str hostname: the Satellite to read the help from when the tree is not cached
+    :param int max_workers: see :func:`read_help`
+    """
+    path = get_command_tree_path(version)
+    if path.exists():
+        return json.loads(path.read_text())
+    with file_lock(f'{path}.lock', remove=False, timeout=GENERATE_TIMEOUT):
+        if not path.exists():
+            logger.info(f'Generating the hammer command tree of Satellite {version}')
+            tree = build_command_tree(read_help(hostname=hostname, max_workers=max_workers))
+            tmp_path = path.with_name(f'{path.name}.{os.getpid()}')
+            tmp_path.write_text(json.dumps(tree, sort_keys=True))
+            tmp_path.replace(path)
+            return tree
+    return json.loads(path.read_text())
+
+
+def get_command_tree():
+    """Return the command tree of the configured Satellite, loaded once per process
+
+    An empty tree is returned when it could not be generated, and no option is validated then.
+    """
+    global _tree
+    if _tree is None:
+        with _lock:
+            if _tree is None:
+                # robottelo.hosts imports the cli classes
+                from robottelo.hosts import get_sat_version
+
+                try:
+                    _tree = load_command_tree(get_sat_version())
+                except Exception as err:
+                    logger.warning(f'Hammer options will not be validated: {err}')
+                    _tree = {}
+    return _tree
+
+
+def clear_cache():
+    """Drop the command tree loaded by :func:`get_command_tree`"""
+    global _tree
+    with _lock:
+        _tree = None
+
+
+def validate_options(command_base, command_sub, options, tree=None):
+    """Check that hammer accepts the options of a command, without running it
+
+    Commands missing from the tree, e.g. ones only available in another Satellite version, are
+    not validated.
+
+    :param str command_base: the hammer command, e.g. ``content-view filter``
+    :param str command_sub: the hammer subcommand, e.g. ``create``
+    :param dict options: the options passed to :meth:`robottelo.cli.base.Base._construct_command`
+    :param dict tree: the command tree, the one of the configured Satellite by default
+    :raises robottelo.exceptions.CLIUnknownOptionError: if an option is not accepted
+    """
+    if not options:
+        return
+    if tree is None:
+        tree = get_command_tree()
+    command = f'{command_base or ""} {command_sub or ""}'.split()
+    node = tree
+    for name in command:
+        node = node.get('subcommands', {}).get(name)
+        if node is None:
+            return
+    if not node or node['subcommands']:
+        return
+    accepted = set(node['options']).union(tree['options'])
+    unknown = [
+        key
+        for key, val in options.items()
+        if val is not None and val is not False and key not in accepted
+    ]
+    if unknown:
+        command = ' '.join(['hammer', *command])
+        stderr = ''.join(f"Error: Unrecognised option '--{key}'.\n" for key in unknown)
+        stderr += f"\nSee: '{command} --help'.\n"
+        raise CLIUnknownOptionError(
+            UNKNOWN_OPTION_STATUS,
+            stderr,
+            f'Command "{command}" does not accept the options: {", ".join(unknown)}',
+        )
@@ -60,7 +60,7 @@ class ContentViewFilterRule(Base):
         result = cls.execute(cls._construct_command(options), output_format='csv', timeout=timeout)
 
         # Extract new CV filter rule ID if it was successfully created
-        if len(result) > 0 and 'id' in result[0]:
+        if cls.fetch_created and len(result) > 0 and 'id' in result[0]:
             cvfr_id = result[0]['id']
             # CV filter rule can only be fetched by specifying either
             # content-view-filter-id or content-view-filter + content-view-id.
@@ -6,6 +6,10 @@ import re
 
 from robottelo.logging import logger
 
+_INFO_LIST_ITEM_REGEX = re.compile(r'\d+\)\s+(.+)$')
+_INFO_NUMBERED_KEY_REGEX = re.compile(r'(\d+)\)')
+_INFO_NUMBER_REGEX = re.compile(r'\d+\)')
+
 
 def _normalize(header):
     """Replace empty spaces with '-' and lower all chars"""
@@ -39,14 +43,24 @@ def _normalize_obj(obj):
 
 def parse_csv(output):
     """Parse CSV output from Hammer CLI and return a Python dictionary."""
-    output = output.splitlines()
+    return list(iter_csv(output.splitlines()))
+
+
+def iter_csv(lines):
+    """Parse CSV output from Hammer CLI and yield a Python dictionary per row.
+
+    Rows are parsed as the lines are consumed, so the output does not have to be held in memory.
 
-    # Normalize the column names to use when generating the dictionary
+    :param lines: an iterable of output lines, e.g. the stdout of
+        :func:`robottelo.utils.ssh.stream_command`
+    """
+    lines = iter(lines)
     try:
-        keys = [_normalize(header) for header in next(csv.reader(output))]
-        return [value for value in csv.DictReader(output[1:], fieldnames=keys)]
+        # Normalize the column names to use when generating the dictionary
+        keys = [_normalize(header) for header in next(csv.reader(lines), [])]
+        yield from csv.DictReader(lines, fieldnames=keys)
     except csv.Error as err:
-        logger.error(f'Exception while parsing CSV output {output}: {err}')
+        logger.error(f'Exception while parsing CSV output: {err}')
         raise
 
 
@@ -169,6 +183,15 @@ def get_line_indentation_level(line, tab_spaces=4, indentation_spaces=4):
     return spaces // indentation_spaces + (1 if spaces % indentation_spaces > 0 else 0)
 
 
+def _get_indentation_level(line):
+    """Inlined :func:`get_line_indentation_level` with the default tab and level widths"""
+    if len(line) < 4:
+        return 0
+    indent = len(line) - len(line.lstrip(' \t'))
+    spaces = indent + 3 * line.count('\t', 0, indent)
+    return (spaces + 3) // 4
+
+
 def parse_info(output):
     """Parse the info output and returns a dict mapping the values."""
     # info dictionary
@@ -181,111 +204,107 @@ def parse_info(output):
         # skip empty lines and dividers
         if line == '' or line == '---':
             continue
-        current_indent_level = get_line_indentation_level(line)
+        current_indent_level = _get_indentation_level(line)
         if current_indent_level <= 1:
             # we are entering or leaving a second level from lower/upper levels
             # clear the second level key
             second_level_key = None
-        if line.startswith(' '):  # sub-properties are indented
-            # values are separated by ':' or '=>', but not by '::' which can be
-            # entity name like 'test::params::keys'
-            if line.find(':') != -1 and line.find('::') == -1:
-                key, value = line.lstrip().split(":", 1)
-            elif line.find('=>') != -1 and len(line.lstrip().split(" =>", 1)) == 2:
-                key, value = line.lstrip().split(" =>", 1)
-            else:
-                key = value = None
-
-            if key is None and value is None:
-                # Parse single attribute collection properties
-                # Template
-                #  1) template1
-                #  2) template2
-                #
-                # or
-                # Template
-                #  template1
-                #  template2
-                match = re.match(r'\d+\)\s+(.+)$', line.lstrip())
-
-                if match is None:
-                    match = re.match(r'(.*)$', line.lstrip())
-
-                value = match.group(1)
+        stripped = line.lstrip()
+        if line[0] != ' ':
+            sub_num = None  # new property implies no sub property
+            key, value = stripped.split(':', 1)
+            key = key.replace(' ', '-').lower()
+            value = value.lstrip()
+            if value == '':  # 'key:' no value, new sub-property
+                sub_prop = key
+                contents[sub_prop] = {}
+            else:  # 'key: value' line
+                contents[key] = value
+            continue
 
+        # sub-properties are indented
+        # values are separated by ':' or '=>', but not by '::' which can be
+        # entity name like 'test::params::keys'
+        if ':' in line and '::' not in line:
+            key, value = stripped.split(':', 1)
+        elif '=>' in line and ' =>' in stripped:
+            key, value = stripped.split(' =>', 1)
+        else:
+            # Parse single attribute collection properties
+            # Template
+            #  1) template1
+            #  2) template2
+            #
+            # or
+            # Template
+            #  template1
+            #  template2
+            match = _INFO_LIST_ITEM_REGEX.match(stripped)
+            value = stripped if match is None else match.group(1)
+            section = contents[sub_prop]
+            if isinstance(section, dict) and not section:
                 # adding list to 1 level, for example:
                 # {'template': ['template1', 'template2']}
-                if isinstance(contents[sub_prop], dict) and not contents[sub_prop]:
-                    contents[sub_prop] = []
-                    contents[sub_prop].append(value)
-                elif isinstance(contents[sub_prop], list):
-                    contents[sub_prop].append(value)
-                else:
-                    # adding list to 2 level, for example:
-                    # {'subscription-information':
-                    #      {'registered-by-activation-keys': ['ak1', 'ak2']}
-                    #  }
-                    last_key = list(contents[sub_prop].keys())[-1]
-                    if not contents[sub_prop][last_key]:
-                        contents[sub_prop][last_key] = [value]
-                    else:
-                        contents[sub_prop][last_key].append(value)
+                contents[sub_prop] = [value]
+            elif isinstance(section, list):
+                section.append(value)
             else:
-                # some properties have many numbered values
-                # Example:
-                # Content:
-                #  1) Repo Name: repo1
-                #     URL:       /custom/4f84fc90-9ffa-...
-                #  2) Repo Name: puppet1
-                #     URL:       /custom/4f84fc90-9ffa-...
-                starts_with_number = re.match(r'(\d+)\)', key)
-                if starts_with_number:
-                    # if this is a numbered list on level 2, do nothing - this script doesn't support it
-                    if current_indent_level >= 2:
-                        continue
-                    sub_num = int(starts_with_number.group(1))
-                    # no. 1) we need to change dict() to list()
-                    if sub_num == 1:
-                        contents[sub_prop] = []
-                    # remove number from key
-                    key = re.sub(r'\d+\)', '', key)
-                    # append empty dict to array
-                    contents[sub_prop].append({})
-
-                key = key.lstrip().replace(' ', '-').lower()
-                value = value.lstrip()
-                # add value to dictionary
-                if sub_num is not None:
-                    contents[sub_prop][-1][key] = value
+                # adding list to 2 level, for example:
+                # {'subscription-information':
+                #      {'registered-by-activation-keys': ['ak1', 'ak2']}
+                #  }
+                last_key = next(reversed(section.keys()))
+                if not section[last_key]:
+                    section[last_key] = [value]
                 else:
-                    # a third level is always represented as a dictionary and
-                    # we need to detect if we are at third level
-                    # example:
-                    # Content Information:
-                    #     Content View:
-                    #         ID:   10
-                    #         Name: Default Organization View
-                    # the "ID" and "Name" are located at third indent level
-                    # "content view" is located at second indent level
-                    if current_indent_level == 2 and second_level_key:
-                        # we are at third level indentation
-                        if not contents[sub_prop][second_level_key]:
-                            contents[sub_prop][second_level_key] = {}
-                        contents[sub_prop][second_level_key][key] = value
-                    else:
-                        contents[sub_prop][key] = value
-                    if current_indent_level == 1 and not value:
-                        # always set the last possible second level key
-                        # that can form a third level
-                        second_level_key = key
+                    section[last_key].append(value)
+            continue
+
+        # some properties have many numbered values
+        # Example:
+        # Content:
+        #  1) Repo Name: repo1
+        #     URL:       /custom/4f84fc90-9ffa-...
+        #  2) Repo Name: puppet1
+        #     URL:       /custom/4f84fc90-9ffa-...
+        starts_with_number = _INFO_NUMBERED_KEY_REGEX.match(key)
+        if starts_with_number:
+            # if this is a numbered list on level 2, do nothing - this script doesn't support it
+            if current_indent_level >= 2:
+                continue
+            sub_num = int(starts_with_number.group(1))
+            # no. 1) we need to change dict() to list()
+            if sub_num == 1:
+                contents[sub_prop] = []
+            # remove number from key
+            key = _INFO_NUMBER_REGEX.sub('', key)
+            # append empty dict to array
+            contents[sub_prop].append({})
+
+        key = key.lstrip().replace(' ', '-').lower()
+        value = value.lstrip()
+        # add value to dictionary
+        if sub_num is not None:
+            contents[sub_prop][-1][key] = value
+        elif current_indent_level == 2 and second_level_key:
+            # a third level is always represented as a dictionary and
+            # we need to detect if we are at third level
+            # example:
+            # Content Information:
+            #     Content View:
+            #         ID:   10
+            #         Name: Default Organization View
+            # the "ID" and "Name" are located at third indent level
+            # "content view" is located at second indent level
+            section = contents[sub_prop]
+            if not section[second_level_key]:
+                section[second_level_key] = {}
+            section[second_level_key][key] = value
         else:
-            sub_num = None  # new property implies no sub property
-            key, value = line.lstrip().split(":", 1)
-            key = key.lstrip().replace(' ', '-').lower()
-            if value.lstrip() == '':  # 'key:' no value, new sub-property
-                sub_prop = key
-                contents[sub_prop] = {}
-            else:  # 'key: value' line
-                contents[key] = value.lstrip()
+            contents[sub_prop][key] = value
+            if current_indent_level == 1 and not value:
+                # always set the last possible second level key
+                # that can form a third level
+                second_level_key = key
 
     return contents
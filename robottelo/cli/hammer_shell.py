@@ -0,0 +1,285 @@
+"""Persistent hammer process used as an opt-in execution backend of
+:meth:`robottelo.cli.base.Base.execute`.
+
+Every one-shot hammer call pays for a Ruby interpreter start, loading of all hammer plugins and
+the API documentation. With ``performance.hammer_shell`` enabled, a single Ruby process per
+Satellite keeps hammer loaded and runs the commands sent to it over one ssh channel. Commands
+and answers are framed::
+
+    -> ["-v", "-u", "admin", "-p", "changeme", "organization", "list"]\\n
+    <- <sentinel> <status> <stdout bytes> <stderr bytes>\\n<stdout><stderr>
+
+Anything unexpected on the channel is a desync: the process is dropped and the command goes
+through the one-shot path, unless it may already have changed data on the server.
+"""
+
+import hashlib
+import json
+import math
+import re
+import shlex
+import threading
+import time
+import uuid
+
+from broker.helpers import Result, translate_timeout
+
+from robottelo.cli import hammer
+from robottelo.exceptions import CLIError, HammerShellDesyncError
+from robottelo.logging import logger
+
+HAMMER_SHELL_DRIVER = r"""# robottelo persistent hammer driver, one JSON encoded argument list per line
+require 'json'
+require 'stringio'
+
+hammer_bin, sentinel = ARGV.shift(2)
+real_stdout, real_stderr = $stdout, $stderr
+real_stdout.sync = true
+last_credentials = nil
+real_stdout.write("#{sentinel} ready\n")
+while (line = $stdin.gets)
+  args = JSON.parse(line)
+  credentials = args.each_cons(2).select { |switch, _| %w[-u -p].include?(switch) }
+  if credentials != last_credentials && defined?(HammerCLI) && HammerCLI.context[:api_connection]
+    HammerCLI.context[:api_connection].drop_all
+  end
+  last_credentials = credentials
+  out, err = StringIO.new, StringIO.new
+  verbose = $VERBOSE
+  $stdout, $stderr = out, err
+  status = begin
+    ARGV.replace(args)
+    $VERBOSE = nil
+    load hammer_bin
+    0
+  rescue SystemExit => e
+    e.status
+  rescue Exception => e
+    err.puts("#{e.class}: #{e.message}")
+    70
+  ensure
+    $VERBOSE = verbose
+    $stdout, $stderr = real_stdout, real_stderr
+  end
+  real_stdout.write("#{sentinel} #{status} #{out.string.bytesize} #{err.string.bytesize}\n")
+  real_stdout.write(out.string, err.string)
+end
+"""
+HAMMER_SHELL_DRIVER_PATH = (
+    f'/tmp/robottelo_hammer_shell_{hashlib.md5(HAMMER_SHELL_DRIVER.encode()).hexdigest()}.rb'
+)
+# libssh2 error code of a read that would block, the read is retried
+LIBSSH2_ERROR_EAGAIN = -37
+# sub-commands that can be safely re-run through the one-shot path after a desync
+READ_ONLY_SUBCOMMANDS = ('info', 'list', 'ping', 'dump', 'puppet-classes', 'sc-params')
+
+_QUOTED_REGEX = re.compile(r'"(?:[^"\\]|\\.)*"|\'[^\']*\'')
+_SHELL_EXPANSION_CHARS = set('$`')
+_SHELL_OPERATOR_CHARS = set('|;&<>*?~(){}\n')
+
+
+def split_command(command):
+    """Split a hammer command line as bash would, return None if it needs a real shell
+
+    :param str command: the command line built by ``Base._construct_command``
+    :return: a list of arguments or None if the command uses pipes, redirections, expansions or
+        other features only bash can handle
+    """
+    if _SHELL_EXPANSION_CHARS.intersection(command):
+        return None
+    if _SHELL_OPERATOR_CHARS.intersection(_QUOTED_REGEX.sub('', command)):
+        return None
+    try:
+        return shlex.split(command)
+    except ValueError:
+        return None
+
+
+class HammerShell:
+    """A persistent hammer process on one Satellite
+
+    Incremental reads from the ssh channel require the ``ssh2-python`` broker ssh backend, with
+    any other backend :meth:`start` fails and the one-shot path is used.
+    """
+
+    def __init__(self, hostname):
+        self.hostname = hostname
+        self.sentinel = f'__robottelo_hammer_{uuid.uuid4().hex}__'
+        self.lock = threading.Lock()
+        self.disabled = False
+        self._client = None
+        self._session = None
+        self._shell = None
+        self._buffer = b''
+
+    @property
+    def started(self):
+        return self._shell is not None
+
+    def start(self):
+        """Upload the driver and start the hammer process"""
+        from robottelo.config import settings
+        from robottelo.hosts import ContentHost
+
+        # a dedicated client, the session pool hands out clients per thread
+        self._client = ContentHost(
+            hostname=self.hostname,
+            username=settings.server.ssh_username,
+            password=settings.server.ssh_password,
+            port=settings.server.ssh_client.port,
+            ipv6=settings.server.is_ipv6,
+        )
+        result = self._client.execute(
+            f"test -f {HAMMER_SHELL_DRIVER_PATH} || "
+            f"cat > {HAMMER_SHELL_DRIVER_PATH} <<'EOF'\n{HAMMER_SHELL_DRIVER}EOF"
+        )
+        if result.status != 0:
+            raise CLIError(f'Unable to upload the hammer shell driver: {result.stderr}')
+        self._shell = self._client.session.shell()
+        if not hasattr(self._shell, 'stdout'):
+            raise CLIError('The broker ssh backend does not support incremental channel reads')
+        # the ssh2 session, its timeout bounds the blocking channel reads
+        self._session = self._client.session.session
+        self._shell.send(
+            f'LANG={settings.robottelo.locale} exec ruby {HAMMER_SHELL_DRIVER_PATH} '
+            f'"$(command -v hammer)" {self.sentinel}'
+        )
+        # discard whatever the login shell printed before the driver is ready
+        deadline = time.monotonic() + settings.server.ssh_client.connection_timeout
+        while (ready := self._read_line(deadline)) != f'{self.sentinel} ready':
+            logger.debug(f'hammer shell preamble on {self.hostname}: {ready}')
+        logger.info(f'Started persistent hammer process on {self.hostname}')
+
+    def close(self):
+        """Stop the hammer process and drop the channel"""
+        shell, client = self._shell, self._client
+        self._shell = self._client = self._session = None
+        self._buffer = b''
+        try:
+            if shell is not None:
+                shell.close()
+            if client is not None:
+                client.close()
+        except Exception as err:
+            logger.debug(f'Failed to close hammer shell on {self.hostname}: {err}')
+
+    def _fill(self, deadline):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise HammerShellDesyncError('Timed out waiting for the hammer process', sent=True)
+        # a read must not block past the deadline, a timeout of 0 means no timeout
+        self._session.set_timeout(0 if math.isinf(remaining) else math.ceil(remaining * 1000))
+        # InteractiveShell exposes the raw ssh2 channel read returning (size, bytes)
+        size, data = self._shell.read(65535)
+        if size == LIBSSH2_ERROR_EAGAIN:
+            return
+        if size < 0:
+            raise HammerShellDesyncError(
+                f'Reading from the hammer process failed with ssh2 error {size}', sent=True
+            )
+        if size == 0 and self._shell.eof():
+            raise HammerShellDesyncError('The hammer process exited', sent=True)
+        if size > 0:
+            self._buffer += data
+
+    def _read_line(self, deadline):
+        while b'\n' not in self._buffer:
+            self._fill(deadline)
+        line, self._buffer = self._buffer.split(b'\n', 1)
+        return line.decode(errors='replace')
+
+    def _read_exact(self, size, deadline):
+        while len(self._buffer) < size:
+            self._fill(deadline)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def run(self, args, timeout=None):
+        """Run hammer with ``args`` and return a result object
+
+        :param list args: hammer arguments, without the ``hammer`` executable
+        :param timeout: command timeout in milliseconds or as a '20m' like string, the ssh client
+            default if None
+        :raises HammerShellDesyncError: if the answer does not match the expected framing
+        """
+        from robottelo.config import settings
+
+        timeout = translate_timeout(timeout or settings.server.ssh_client.command_timeout)
+        # like the ssh client, a timeout of 0 means no timeout
+        deadline = time.monotonic() + timeout / 1000 if timeout else float('inf')
+        try:
+            self._shell.send(json.dumps(args))
+        except Exception as err:
+            raise HammerShellDesyncError(f'Unable to send to the hammer process: {err}') from err
+        try:
+            header = self._read_line(deadline).split()
+            if len(header) != 4 or header[0] != self.sentinel:
+                raise HammerShellDesyncError(f'Unexpected hammer frame header: {header}')
+            status, stdout_size, stderr_size = (int(value) for value in header[1:])
+            body = self._read_exact(stdout_size + stderr_size, deadline)
+        except Exception as err:
+            raise HammerShellDesyncError(f'{err}', sent=True) from err
+        return Result(
+            status=status,
+            stdout=body[:stdout_size].decode(),
+            stderr=body[stdout_size:].decode(),
+        )
+
+
+_shells = {}
+_shells_lock = threading.Lock()
+
+
+def execute(hostname, args, output_format=None, timeout=None, read_only=False):
+    """Run hammer ``args`` through the persistent process of ``hostname``
+
+    Output is parsed like :func:`robottelo.ssh.command` does.
+
+    :param str hostname: the Satellite to run hammer on
+    :param list args: hammer arguments, without the ``hammer`` executable
+    :param str output_format: json, csv or None
+    :param int timeout: Time to wait for the command to finish, in milliseconds.
+    :param bool read_only: whether the command can be re-run after a desync
+    :return: a result object or None when the caller has to fall back to the one-shot path
+    :raises HammerShellDesyncError: when the process desynced after a command, that may have
+        changed data, was sent
+    """
+    with _shells_lock:
+        shell = _shells.setdefault(hostname, HammerShell(hostname))
+    # another thread is using the process, don't wait for it
+    if shell.disabled or not shell.lock.acquire(blocking=False):
+        return None
+    try:
+        if not shell.started:
+            try:
+                shell.start()
+            except Exception as err:
+                logger.warning(f'Persistent hammer disabled for {hostname}: {err}')
+                shell.close()
+                shell.disabled = True
+                return None
+        try:
+            result = shell.run(args, timeout=timeout)
+        except HammerShellDesyncError as err:
+            shell.close()
+            if err.sent and not read_only:
+                raise
+            logger.warning(f'Persistent hammer desync on {hostname}, using one-shot hammer: {err}')
+            return None
+    finally:
+        shell.lock.release()
+
+    if output_format and result.status == 0:
+        if output_format == 'csv':
+            result.stdout = hammer.parse_csv(result.stdout) if result.stdout else {}
+        if output_format == 'json':
+            result.stdout = hammer.parse_json(result.stdout) if result.stdout else None
+    return result
+
+
+def close_all():
+    """Stop all persistent hammer processes of this process"""
+    with _shells_lock:
+        for shell in _shells.values():
+            shell.close()
+        _shells.clear()
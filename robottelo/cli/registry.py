@@ -0,0 +1,108 @@
+"""Registry of the robottelo cli entity classes and their per-host namespaces.
+
+Every :class:`robottelo.cli.base.Base` subclass defined in a ``robottelo.cli`` module is
+collected once per process, the first time a namespace needs it. A :class:`CLINamespace` is what
+``Satellite.cli`` and ``Capsule.cli`` return: it binds the registered classes to one host by
+subclassing them with the host's attributes, only when an attribute is first looked up. The
+bound class is then stored on the namespace, so later lookups are plain attribute reads.
+"""
+
+import importlib
+from pathlib import Path
+import threading
+
+from robottelo.cli.base import Base
+
+CLI_PACKAGE_PATH = Path(__file__).parent
+
+_registry = {}
+_indexes = {}
+_registry_lock = threading.Lock()
+
+
+def normalize_name(name):
+    """Return the lookup key of a cli class or entity name, e.g. ``contentview`` for
+    ``ContentView`` and ``content_view``
+    """
+    return name.replace('_', '').lower()
+
+
+def get_cli_classes(prefix=''):
+    """Return the cli entity classes defined in the ``robottelo.cli`` modules
+
+    :param str prefix: only collect the modules whose name starts with it, e.g. ``sm_``
+    :return: a dict mapping class names to :class:`robottelo.cli.base.Base` subclasses
+    """
+    with _registry_lock:
+        if prefix not in _registry:
+            classes = {}
+            for file in sorted(CLI_PACKAGE_PATH.iterdir()):
+                if (
+                    file.suffix == '.py'
+                    and not file.name.startswith('_')
+                    and file.name.startswith(prefix)
+                ):
+                    cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
+                    for name, obj in cli_module.__dict__.items():
+                        if isinstance(obj, type) and issubclass(obj, Base):
+                            classes[name] = obj
+            _registry[prefix] = classes
+        return _registry[prefix]
+
+
+def get_cli_class_index(prefix=''):
+    """Return the names of the cli entity classes by normalized name, see :func:`normalize_name`
+
+    :param str prefix: see :func:`get_cli_classes`
+    :return: a dict mapping normalized names to class names
+    """
+    classes = get_cli_classes(prefix=prefix)
+    with _registry_lock:
+        if prefix not in _indexes:
+            index = {}
+            for name in classes:
+                index.setdefault(normalize_name(name), name)
+            _indexes[prefix] = index
+        return _indexes[prefix]
+
+
+class CLINamespace:
+    """Per-host namespace of cli entity classes
+
+    :param dict classes: class names mapped to the classes to bind, see :func:`get_cli_classes`
+    :param attrs: class attributes set on every bound class, e.g. ``hostname``
+    """
+
+    _configured = True
+
+    def __init__(self, classes, **attrs):
+        self._classes = classes
+        self._attrs = attrs
+
+    def __getattr__(self, name):
+        # only called when the class is not bound yet
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            cls = self._classes[name]
+        except KeyError:
+            raise AttributeError(f'{type(self).__name__} has no attribute {name!r}') from None
+        # create a copy of the class and set the host attributes as class attributes
+        bound_cls = type(name, (cls,), dict(self._attrs))
+        setattr(self, name, bound_cls)
+        return bound_cls
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._classes))
+
+    def __iter__(self):
+        """Iterate over the names of all the classes available in this namespace"""
+        return iter(self._classes)
+
+    def bind(self, **attrs):
+        """Update the host attributes of the classes, already bound ones included"""
+        self._attrs.update(attrs)
+        for name in self._classes:
+            if name in self.__dict__:
+                for attr, value in attrs.items():
+                    setattr(self.__dict__[name], attr, value)
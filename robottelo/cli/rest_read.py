@@ -0,0 +1,156 @@
+"""Serve read-only hammer calls from the Satellite API.
+
+With ``performance.rest_read.enabled``, :meth:`robottelo.cli.base.Base.list` of the entities
+listed in ``performance.rest_read.entities`` is answered by a GET on the API instead of starting
+hammer. The API response is translated to the shape ``hammer.parse_csv`` produces: only the columns
+hammer prints, with lower case and dash separated keys and string values.
+
+``info`` is always served by hammer: it prints the API objects in a layout of its own per entity,
+with labels, nested sections and collections that the API fields do not map to one to one.
+
+Entities are opted in one by one because hammer formats some fields on its own. Running with
+``performance.rest_read.validate`` calls both hammer and the API and logs every difference, the
+hammer result being returned, which is the way to check an entity before adding it.
+"""
+
+import re
+import threading
+
+import deepdiff
+import requests
+
+from robottelo.config import settings
+from robottelo.exceptions import CLIReturnCodeError
+from robottelo.logging import logger
+
+# hammer command base -> (API collection path, columns of ``hammer <base> list``)
+REST_READ_ENDPOINTS = {
+    'architecture': ('/api/architectures', ('id', 'name')),
+    'domain': ('/api/domains', ('id', 'name')),
+    'lifecycle-environment': ('/katello/api/environments', ('id', 'name', 'prior')),
+    'location': ('/api/locations', ('id', 'title', 'name', 'description')),
+    'medium': ('/api/media', ('id', 'name', 'path')),
+    'model': ('/api/models', ('id', 'name', 'vendor-class', 'hardware-model')),
+    'organization': (
+        '/katello/api/organizations',
+        ('id', 'title', 'name', 'description', 'label'),
+    ),
+}
+# hammer option -> API parameter, options not listed here are served by hammer
+LIST_OPTIONS = {
+    'search': 'search',
+    'order': 'order',
+    'page': 'page',
+    'per-page': 'per_page',
+    'organization-id': 'organization_id',
+    'location-id': 'location_id',
+}
+# HTTP status -> hammer exit code
+HAMMER_EXIT_CODES = {401: 77, 403: 77, 404: 65, 422: 65}
+# seconds to wait for the API, Base.list takes no timeout to derive it from
+REST_READ_TIMEOUT = 120
+
+_BASH_ESCAPE_REGEX = re.compile(r'\\([\\"$`])')
+
+_local = threading.local()
+
+
+def _session(hostname, user, password):
+    """Return the calling thread's HTTPS session for ``hostname`` and these credentials"""
+    sessions = _local.__dict__.setdefault('sessions', {})
+    key = (hostname, user, password)
+    if key not in sessions:
+        session = requests.Session()
+        session.auth = (user, password)
+        session.verify = settings.server.verify_ca
+        session.headers.update({'Accept': 'application/json'})
+        sessions[key] = session
+    return sessions[key]
+
+
+def _option_value(value):
+    """Return an option value as hammer receives it from bash, see ``Base._construct_command``"""
+    if isinstance(value, list):
+        value = ','.join(str(el) for el in value)
+    # values are double quoted on the hammer command line
+    return _BASH_ESCAPE_REGEX.sub(r'\1', str(value))
+
+
+def _to_hammer_value(value):
+    """Format an API value like the hammer output parsers return it"""
+    if isinstance(value, dict):
+        # references like "prior" or "organization" are printed by name
+        return _to_hammer_value(value.get('name', value.get('id')))
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if value is None:
+        return ''
+    return str(value)
+
+
+def _get(session, url, cli_cls, command_sub, params):
+    """GET ``url`` and raise like hammer does if the API answers with an error"""
+    response = session.get(url, params=params, timeout=REST_READ_TIMEOUT)
+    if not response.ok:
+        status = HAMMER_EXIT_CODES.get(response.status_code, 70)
+        raise CLIReturnCodeError(
+            status,
+            response.text,
+            f'Command "{cli_cls.command_base} {command_sub}" finished with status {status}\n'
+            f'stderr contains:\n{response.text}',
+        )
+    return response.json()
+
+
+def supports(cli_cls, command_sub, options):
+    """Whether ``hammer <cli_cls.command_base> <command_sub> options`` can be read from the API"""
+    rest_settings = settings.performance.rest_read
+    if not rest_settings.enabled or cli_cls.command_base not in rest_settings.entities:
+        return False
+    if command_sub != 'list' or cli_cls.command_base not in REST_READ_ENDPOINTS:
+        return False
+    if cli_cls.omitting_credentials:
+        return False
+    return all(key in LIST_OPTIONS for key, value in (options or {}).items() if value is not None)
+
+
+def read(cli_cls, command_sub, options):
+    """Read a list of entities from the API
+
+    :param cli_cls: the :class:`robottelo.cli.base.Base` subclass of the entity
+    :param str command_sub: ``list``
+    :param dict options: the hammer options, limited to ``LIST_OPTIONS``
+    :return: a list of dicts like ``hammer.parse_csv``
+    :raises robottelo.exceptions.CLIReturnCodeError: if the API answered with an error
+    """
+    options = {
+        key: _option_value(value) for key, value in (options or {}).items() if value is not None
+    }
+    path, columns = REST_READ_ENDPOINTS[cli_cls.command_base]
+    hostname = cli_cls.hostname or settings.server.hostname
+    session = _session(hostname, *cli_cls._get_username_password())
+    params = {LIST_OPTIONS[key]: value for key, value in options.items()}
+    data = _get(session, f'https://{hostname}{path}', cli_cls, command_sub, params)
+    return [
+        {column: _to_hammer_value(item.get(column.replace('-', '_'))) for column in columns}
+        for item in data['results']
+    ]
+
+
+def validate(cli_cls, command_sub, options, hammer_result):
+    """Compare ``hammer_result`` with the API result and log the differences
+
+    :return: True if both results are equal
+    """
+    try:
+        rest_result = read(cli_cls, command_sub, options)
+    except Exception as err:
+        logger.warning(f'REST read of {cli_cls.command_base} {command_sub} failed: {err}')
+        return False
+    if diff := deepdiff.DeepDiff(hammer_result, rest_result, ignore_order=True):
+        logger.warning(
+            f'REST read of {cli_cls.command_base} {command_sub} {options} differs from hammer: '
+            f'{diff}'
+        )
+        return False
+    return True
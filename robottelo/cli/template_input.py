@@ -40,7 +40,7 @@ class TemplateInput(Base):
         result = cls.execute(cls._construct_command(options), output_format='csv', timeout=timeout)
 
         # Extract new object ID if it was successfully created
-        if len(result) > 0 and 'id' in result[0]:
+        if cls.fetch_created and len(result) > 0 and 'id' in result[0]:
             obj_id = result[0]['id']
 
             # Fetch new object
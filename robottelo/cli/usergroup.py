@@ -155,7 +155,7 @@ class UserGroupExternal(Base):
         result = cls.execute(cls._construct_command(options), output_format='csv', timeout=timeout)
         # External user group can only be fetched by specifying both id and
         # user group id it is linked to
-        if len(result) > 0 and 'id' in result[0]:
+        if cls.fetch_created and len(result) > 0 and 'id' in result[0]:
             info_options = {'user-group-id': options.get('user-group-id'), 'id': result[0]['id']}
             result = cls.info(info_options)
         return result
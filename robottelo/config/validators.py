@@ -36,6 +36,10 @@ VALIDATORS = dict(
         Validator('server.ssh_password', default=None),
         Validator('server.verify_ca', default=False),
         Validator('server.is_ipv6', is_type_of=bool, default=False),
+        Validator('server.ssh_client.pool.enabled', is_type_of=bool, default=True),
+        Validator('server.ssh_client.pool.max_size', is_type_of=int, gt=0, default=32),
+        Validator('server.ssh_client.pool.idle_timeout', default=300),
+        Validator('server.ssh_client.pool.health_check_interval', default=60),
         # validate http_proxy_ipv6_url only if is_ipv6 is True
         Validator(
             'server.http_proxy_ipv6_url',
@@ -76,6 +80,8 @@ VALIDATORS = dict(
     bugzilla=[
         Validator('bugzilla.url', default='https://bugzilla.redhat.com'),
         Validator('bugzilla.api_key', must_exist=True),
+        Validator('bugzilla.cache_ttl.open', is_type_of=int, gte=0, default=14400),
+        Validator('bugzilla.cache_ttl.closed', is_type_of=int, gte=0, default=1814400),
     ],
     capsule=[
         Validator('capsule.version.release', must_exist=True),
@@ -184,6 +190,10 @@ VALIDATORS = dict(
         Validator('jira.comment_visibility', default="Red Hat Employee"),
         Validator('jira.enable_comment', default=False),
         Validator('jira.issue_status', default=["Review", "Release Pending"]),
+        Validator('jira.batch_size', is_type_of=int, gte=1, default=100),
+        Validator('jira.max_workers', is_type_of=int, gte=1, default=4),
+        Validator('jira.cache_ttl.open', is_type_of=int, gte=0, default=14400),
+        Validator('jira.cache_ttl.closed', is_type_of=int, gte=0, default=1814400),
     ],
     ldap=[
         Validator(
@@ -240,7 +250,19 @@ VALIDATORS = dict(
             must_exist=True,
         ),
     ],
-    performance=[Validator('performance.time_hammer', default=False)],
+    performance=[
+        Validator('performance.time_hammer', default=False),
+        Validator('performance.hammer_shell', is_type_of=bool, default=False),
+        Validator('performance.rest_read.enabled', is_type_of=bool, default=False),
+        Validator('performance.rest_read.validate', is_type_of=bool, default=False),
+        Validator('performance.rest_read.entities', is_type_of=list, default=[]),
+        Validator('performance.pagination.per_page', is_type_of=int, gte=1, default=10000),
+        Validator('performance.pagination.prefetch', is_type_of=bool, default=False),
+        Validator('performance.validate_hammer_options', is_type_of=bool, default=False),
+        Validator('performance.parallel_repository_sync', is_type_of=bool, default=False),
+        Validator('performance.lean_create.enabled', is_type_of=bool, default=False),
+        Validator('performance.lean_create.entities', is_type_of=list, default=[]),
+    ],
     report_portal=[
         Validator(
             'report_portal.portal_url',
@@ -325,9 +347,10 @@ VALIDATORS = dict(
         ),
     ],
     shared_function=[
-        Validator('shared_function.storage', is_in=('file', 'redis'), default='file'),
-        Validator('shared_function.share_timeout', lte=86400, default=86400),
+        Validator('shared_function.storage', is_in=('file', 'redis', 'sqlite'), default='file'),
+        Validator('shared_function.share_timeout', lte=604800, default=86400),
         Validator('shared_function.scope', default=None),
+        Validator('shared_function.server_fingerprint', is_type_of=bool, default=False),
         Validator('shared_function.enabled', default=False),
         Validator('shared_function.lock_timeout', default=7200),
         Validator('shared_function.redis_host', default='localhost'),
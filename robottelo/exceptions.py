@@ -34,6 +34,10 @@ class RepositoryAlreadyCreated(Exception):
     the create an other time"""
 
 
+class RepositorySyncError(Exception):
+    """Raised when repositories of a collection failed to synchronize"""
+
+
 class ReposContentSetupWasNotPerformed(Exception):
     """Raised when trying to setup a VM but the repositories content was not
     setup"""
@@ -67,6 +71,19 @@ class CLIError(Exception):
     """Indicates that a CLI command could not be run."""
 
 
+class HammerShellDesyncError(CLIError):
+    """Indicates that the persistent hammer process answered with an unexpected frame.
+
+    :param msg: explanation of the error
+    :param sent: whether the command was already sent to the hammer process
+
+    """
+
+    def __init__(self, msg, sent=False):
+        super().__init__(msg)
+        self.sent = sent
+
+
 class CapsuleHostError(Exception):
     """Indicates error in capsule configuration etc"""
 
@@ -109,6 +126,12 @@ class CLIReturnCodeError(CLIBaseError):
     """
 
 
+class CLIUnknownOptionError(CLIReturnCodeError):
+    """Error to be raised when a hammer command is passed options that hammer does not accept,
+    before running the command. See :mod:`robottelo.cli.command_tree`.
+    """
+
+
 class CLIDataBaseError(CLIBaseError):
     """Error to be raised when an error occurs due to some missing parameter
     which cause a data base error on hammer
@@ -0,0 +1,109 @@
+"""Namespaces of nailgun entity classes bound to a Satellite, used by ``Satellite.api``.
+
+An :class:`APINamespace` subclasses a nailgun entity with the server configuration injected in
+its ``__init__`` only when the entity is first looked up, and keeps the bound class as a plain
+attribute. Namespaces are shared by all the Satellite objects with an equal server configuration,
+so creating another object for the same Satellite does not bind the entities again.
+"""
+
+import functools
+import threading
+
+_entity_classes = None
+_namespaces = {}
+_lock = threading.RLock()
+
+
+def get_entity_classes():
+    """Return the nailgun entity classes, collected once per process
+
+    :return: a dict mapping class names to ``nailgun.entity_mixins.Entity`` subclasses
+    """
+    global _entity_classes
+    with _lock:
+        if _entity_classes is None:
+            from nailgun import entities as _entities  # use a private import
+            from nailgun.entity_mixins import Entity
+
+            _entity_classes = {
+                name: obj
+                for name, obj in _entities.__dict__.items()
+                if isinstance(obj, type) and issubclass(obj, Entity)
+            }
+        return _entity_classes
+
+
+def server_config_key(server_config):
+    """Return a hashable key of a nailgun ``ServerConfig``"""
+    auth = server_config.auth
+    return (
+        server_config.url,
+        tuple(auth) if isinstance(auth, list) else auth,
+        server_config.verify,
+        str(getattr(server_config, 'version', None)),
+    )
+
+
+class APINamespace:
+    """Namespace of nailgun entity classes bound to one server configuration
+
+    :param dict classes: class names mapped to the entity classes to bind
+    :param server_config: the ``nailgun.config.ServerConfig`` injected in the entities
+    """
+
+    _configured = True
+
+    def __init__(self, classes, server_config):
+        self._classes = classes
+        self.server_config = server_config
+
+    def __getattr__(self, name):
+        # only called when the entity is not bound yet
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            cls = self._classes[name]
+        except KeyError:
+            raise AttributeError(f'{type(self).__name__} has no attribute {name!r}') from None
+        with _lock:
+            if name not in self.__dict__:
+                # create a copy of the class and inject our server config into the __init__
+                bound_cls = type(
+                    name,
+                    (cls,),
+                    {
+                        '__init__': functools.partialmethod(
+                            cls.__init__, server_config=self.server_config
+                        )
+                    },
+                )
+                setattr(self, name, bound_cls)
+        return self.__dict__[name]
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._classes))
+
+    def __iter__(self):
+        """Iterate over the names of all the entities available in this namespace"""
+        return iter(self._classes)
+
+
+def get_api_namespace(server_config):
+    """Return the shared :class:`APINamespace` of ``server_config``
+
+    :param server_config: a ``nailgun.config.ServerConfig``, the first one passed for a given
+        url, credentials and verification setting is the one the entities are bound to
+    """
+    key = server_config_key(server_config)
+    with _lock:
+        if key not in _namespaces:
+            _namespaces[key] = APINamespace(get_entity_classes(), server_config)
+        return _namespaces[key]
+
+
+def clear_cache():
+    """Drop the collected entity classes and the namespaces, e.g. after nailgun was reloaded"""
+    global _entity_classes
+    with _lock:
+        _entity_classes = None
+        _namespaces.clear()
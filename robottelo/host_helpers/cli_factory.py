@@ -4,8 +4,9 @@ It is not meant to be used directly, but as part of a robottelo.hosts.Satellite
 example: my_satellite.cli_factory.make_org()
 """
 
+from concurrent.futures import ThreadPoolExecutor
 import datetime
-from functools import lru_cache, partial
+from functools import partial
 import inspect
 import os
 from os import chmod
@@ -28,11 +29,16 @@ from fauxfactory import (
 
 from robottelo import constants
 from robottelo.cli.proxy import CapsuleTunnelError
+from robottelo.cli.registry import get_cli_class_index, normalize_name
 from robottelo.config import settings
 from robottelo.exceptions import CLIFactoryError, CLIReturnCodeError
 from robottelo.host_helpers.repository_mixins import initiate_repo_helpers
+from robottelo.host_helpers.task_graph import TaskGraph
 from robottelo.utils.manifest import clone
 
+# default number of entities created at the same time by the make_<entity>_many methods
+MAKE_MANY_MAX_WORKERS = 8
+
 
 def create_object(cli_object, options, values=None, credentials=None, timeout=None):
     """
@@ -62,6 +68,9 @@ def create_object(cli_object, options, values=None, credentials=None, timeout=No
     # Sometimes we get a list with a dictionary and not a dictionary.
     if isinstance(result, list) and len(result) > 0:
         result = result[0]
+    # keep the entities of lean creates lazy
+    if isinstance(result, Box):
+        return result
     return Box(result)
 
 
@@ -70,7 +79,8 @@ The following dictionary is used to define the simple make methods in this facto
 Each key corresponds to the name of the entity (e.g. make_<entity_name>)
 The value of each entity key is a dictionary containing the following:
     <option_name>: <value population function> Functions will be evaluated at runtime
-    _setup: <setup function>  Use this when a little more complexity is needed (see below)
+    _setup: <setup function>  Use this when a little more complexity is needed (see below), its
+        result is passed to the value population functions having a `setup_res` argument
     _setup_args: [list of arguments for setup function]
     _setup_kwargs: {dict of keyword arguments for setup function}
     _redirect: 'name of make_<entity> function that should actually be ran'
@@ -167,8 +177,8 @@ ENTITY_FIELDS = {
         'auth-source-id': 1,
         'firstname': gen_alphanumeric,
         'lastname': gen_alphanumeric,
-        'login': lambda: ENTITY_FIELDS['user']['_setup_res'],
-        'mail': lambda: f"{ENTITY_FIELDS['user']['_setup_res']}@example.com",
+        'login': lambda setup_res: setup_res,
+        'mail': lambda setup_res: f"{setup_res}@example.com",
         'password': gen_alphanumeric,
     },
     'usergroup': {
@@ -258,52 +268,124 @@ class CLIFactory:
         The keys in the dictionary above correspond to potential make_<key> methods
         These are all basic cases where the make method just need some default values.
         For more complex make methods, we define them in methods below.
+        Each make_<key> method also has a make_<key>_many counterpart, see ``_make_many``.
         """
-        fields = ENTITY_FIELDS.get(name.replace('make_', ''))
-        if isinstance(fields, dict):
+        if name.startswith('make_') and name.endswith('_many'):
+            make_name = name.removesuffix('_many')
+            # the explicit make methods create their entities with the shared cli classes
+            if not hasattr(type(self), make_name) and isinstance(
+                ENTITY_FIELDS.get(make_name.replace('make_', '')), dict
+            ):
+                return partial(self._make_many, make_name)
+        if (entity := self._entity_fields(name.replace('make_', ''))) is not None:
             # someone is attempting to use a make_<entity> method
-            if setup := fields.get('_setup'):
-                # check for an evaluate _setup fields
-                fields['_setup_res'] = setup(
-                    *fields.get('_setup_args', []), **fields.get('_setup_kwargs', {})
-                )
-            # sometimes entity class names don't match the make_<entity> pattern
-            entity_cls = self._find_entity_class(
-                fields.get('_entity_cls', name.replace('make_', ''))
-            )
-            # some make_<entity> calls redirect to other methods
-            if redirect := fields.get('_redirect'):
-                return self.__getattr__(redirect)
-            # evaluate functions that provide default values
-            fields = self._evaluate_functions(fields)
-            return partial(create_object, entity_cls, fields)
+            return partial(create_object, *entity)
         raise AttributeError(f'unknown factory method name: {name}')
 
-    def _evaluate_function(self, function):
-        """Some functions may require an instance reference"""
-        if 'self' in inspect.signature(function).parameters:
-            return function(self)
-        return function()
+    def _entity_fields(self, entity_name):
+        """Return the cli class and the default values of an ENTITY_FIELDS entity, or None
 
-    def _evaluate_functions(self, iterable):
+        The default values are evaluated on every call, e.g. to get unique names.
+        """
+        fields = ENTITY_FIELDS.get(entity_name)
+        if not isinstance(fields, dict):
+            return None
+        # some make_<entity> calls redirect to other methods
+        if redirect := fields.get('_redirect'):
+            return self._entity_fields(redirect)
+        setup_res = None
+        if setup := fields.get('_setup'):
+            # evaluate the _setup field, its result is passed to the functions needing it
+            setup_res = setup(*fields.get('_setup_args', []), **fields.get('_setup_kwargs', {}))
+        # sometimes entity class names don't match the make_<entity> pattern
+        entity_cls = self._find_entity_class(fields.get('_entity_cls', entity_name))
+        # evaluate functions that provide default values
+        return entity_cls, self._evaluate_functions(fields, setup_res=setup_res)
+
+    def _make_many(
+        self,
+        make_name,
+        count,
+        options=None,
+        credentials=None,
+        timeout=None,
+        fetch=True,
+        max_workers=MAKE_MANY_MAX_WORKERS,
+    ):
+        """Create ``count`` entities at the same time with the ``make_name`` factory method
+
+        :param str make_name: the factory method, e.g. ``make_user``
+        :param int count: how many entities to create
+        :param dict options: custom values overriding the default ones of every entity
+        :param list|tuple credentials: username and password for non-default user
+        :param bool fetch: fetch every created entity with ``info``, when False the
+            parsed create output is returned instead, which holds at least the entity id
+        :param int max_workers: how many entities are created at the same time at most
+        :raise robottelo.exceptions.CLIFactoryError: once all the entities were processed, with
+            the errors of all the entities that could not be created
+        :return: the list of the created entities, in creation order
+        """
+
+        def create(entity_cls, fields):
+            # the cli classes keep the running subcommand as a class attribute, so every
+            # entity is created by its own subclass
+            entity_cls = type(entity_cls.__name__, (entity_cls,), {'fetch_created': fetch})
+            return create_object(entity_cls, fields, dict(options or {}), credentials, timeout)
+
+        # default values are evaluated for every entity in the calling thread, so that the
+        # creations do not share any state
+        entities = [self._entity_fields(make_name.replace('make_', '')) for _ in range(count)]
+        results = [None] * count
+        errors = []
+        with ThreadPoolExecutor(
+            max_workers=max(min(max_workers, count), 1), thread_name_prefix=make_name
+        ) as executor:
+            futures = [executor.submit(create, *entity) for entity in entities]
+            for index, future in enumerate(futures):
+                try:
+                    results[index] = future.result()
+                except CLIFactoryError as err:
+                    errors.append(f'[{index}] {err}')
+        if errors:
+            raise CLIFactoryError(
+                f'Failed to create {len(errors)} of {count} entities with {make_name}:\n'
+                + '\n'.join(errors)
+            )
+        return results
+
+    def _evaluate_function(self, function, setup_res=None):
+        """Some functions may require an instance reference or the _setup field result"""
+        parameters = inspect.signature(function).parameters
+        return function(
+            **{
+                name: value
+                for name, value in (('self', self), ('setup_res', setup_res))
+                if name in parameters
+            }
+        )
+
+    def _evaluate_functions(self, iterable, setup_res=None):
         """Run functions that are used to populate data in lists/dicts"""
         if isinstance(iterable, list):
-            return [self._evaluate_function(item) if callable(item) else item for item in iterable]
+            return [
+                self._evaluate_function(item, setup_res) if callable(item) else item
+                for item in iterable
+            ]
         if isinstance(iterable, dict):
             return {
-                key: (self._evaluate_function(item) if callable(item) else item)
+                key: (self._evaluate_function(item, setup_res) if callable(item) else item)
                 for key, item in iterable.items()
                 if not key.startswith('_')
             }
         return None
 
-    @lru_cache
     def _find_entity_class(self, entity_name):
-        entity_name = entity_name.replace('_', '').lower()
-        for name, class_obj in self._satellite.cli.__dict__.items():
-            if entity_name == name.lower():
-                return class_obj
-        return None
+        # bound classes are cached by the satellite cli namespace, so nothing here keeps the
+        # satellite alive
+        name = get_cli_class_index().get(normalize_name(entity_name))
+        if name is None:
+            return None
+        return getattr(self._satellite.cli, name)
 
     def make_content_credential(self, options=None):
         """Creates a content credential.
@@ -575,92 +657,73 @@ class CLIFactory:
                         f'Failed to add subscription to activation key\n{err.msg}'
                     ) from err
 
-    def setup_org_for_a_custom_repo(self, options=None):
-        """Sets up Org for the given custom repo by:
-
-        1. Checks if organization and lifecycle environment were given, otherwise
-            creates new ones.
-        2. Creates a new product with the custom repo. Synchronizes the repo.
-        3. Checks if content view was given, otherwise creates a new one and
-            - adds the RH repo
-            - publishes
-            - promotes to the lifecycle environment
-        4. Checks if activation key was given, otherwise creates a new one and
-            associates it with the content view.
-        5. Adds the custom repo subscription to the activation key
-        6. Override custom product to true ( turned off by default in 6.14 )
-
-        :return: A dictionary with the entity ids of Activation key, Content view,
-            Lifecycle Environment, Organization, Product and Repository
-
+    def _add_setup_org_steps(self, graph, inputs, options):
+        """Declare the organization, lifecycle environment and content view steps of the
+        setup_org_for helpers, adding the ones given in ``options`` to ``inputs``
         """
-        # Create new organization and lifecycle environment if needed
         if options.get('organization-id') is None:
-            org_id = self.make_org()['id']
+            graph.add('org_id', lambda: self.make_org()['id'])
         else:
-            org_id = options['organization-id']
+            inputs['org_id'] = options['organization-id']
         if options.get('lifecycle-environment-id') is None:
-            env_id = self.make_lifecycle_environment({'organization-id': org_id})['id']
+            graph.add(
+                'env_id',
+                lambda org_id: self.make_lifecycle_environment({'organization-id': org_id})['id'],
+                requires=['org_id'],
+            )
         else:
-            env_id = options['lifecycle-environment-id']
-        # Create custom product and repository
-        custom_product = self.make_product({'organization-id': org_id})
-        custom_repo = self.make_repository(
-            {'content-type': 'yum', 'product-id': custom_product['id'], 'url': options.get('url')}
-        )
-        # Synchronize custom repository
-        try:
-            self._satellite.cli.Repository.synchronize({'id': custom_repo['id']})
-        except CLIReturnCodeError as err:
-            raise CLIFactoryError(f'Failed to synchronize repository\n{err.msg}') from err
-        # Create CV if needed and associate repo with it
+            inputs['env_id'] = options['lifecycle-environment-id']
         if options.get('content-view-id') is None:
-            cv_id = self.make_content_view({'organization-id': org_id})['id']
-        else:
-            cv_id = options['content-view-id']
-        try:
-            self._satellite.cli.ContentView.add_repository(
-                {'id': cv_id, 'organization-id': org_id, 'repository-id': custom_repo['id']}
+            graph.add(
+                'cv_id',
+                lambda org_id: self.make_content_view({'organization-id': org_id})['id'],
+                requires=['org_id'],
             )
-        except CLIReturnCodeError as err:
-            raise CLIFactoryError(f'Failed to add repository to content view\n{err.msg}') from err
-        # Publish a new version of CV
-        try:
-            self._satellite.cli.ContentView.publish({'id': cv_id})
-        except CLIReturnCodeError as err:
-            raise CLIFactoryError(
-                f'Failed to publish new version of content view\n{err.msg}'
-            ) from err
-        # Get the version id
-        cv_info = self._satellite.cli.ContentView.info({'id': cv_id})
-        assert len(cv_info['versions']) > 0
-        cv_info['versions'].sort(key=lambda version: version['id'])
-        cvv = cv_info['versions'][-1]
-        lce_promoted = cv_info['lifecycle-environments']
-        # Promote version to next env
-        try:
-            if env_id not in [int(lce['id']) for lce in lce_promoted]:
-                self._satellite.cli.ContentView.version_promote(
-                    {
-                        'id': cvv['id'],
-                        'organization-id': org_id,
-                        'to-lifecycle-environment-id': env_id,
-                    }
+        else:
+            inputs['cv_id'] = options['content-view-id']
+        graph.add('sca', self._satellite.is_sca_mode_enabled, requires=['org_id'])
+
+    def _add_setup_content_view_steps(self, graph):
+        """Declare the steps adding the ``repo`` to the content view and publishing it once the
+        repository is synchronized
+        """
+
+        def add_repository(cv_id, org_id, repo):
+            try:
+                self._satellite.cli.ContentView.add_repository(
+                    {'id': cv_id, 'organization-id': org_id, 'repository-id': repo['id']}
                 )
-        except CLIReturnCodeError as err:
-            raise CLIFactoryError(
-                f'Failed to promote version to next environment\n{err.msg}'
-            ) from err
-        # Create activation key if needed and associate content view with it
-        if options.get('activationkey-id') is None:
-            activationkey_id = self.make_activation_key(
+            except CLIReturnCodeError as err:
+                raise CLIFactoryError(
+                    f'Failed to add repository to content view\n{err.msg}'
+                ) from err
+
+        def publish(cv_id):
+            try:
+                self._satellite.cli.ContentView.publish({'id': cv_id})
+            except CLIReturnCodeError as err:
+                raise CLIFactoryError(
+                    f'Failed to publish new version of content view\n{err.msg}'
+                ) from err
+
+        graph.add('cv_repo', add_repository, requires=['cv_id', 'org_id', 'repo'])
+        graph.add('published', publish, requires=['cv_id'], after=['cv_repo', 'synced'])
+
+    def _add_setup_activation_key_steps(self, graph, options):
+        """Declare the steps creating or updating the activation key once the content view is
+        ``promoted``, adding the ``subscription`` to it and overriding the ``repo_info`` content
+        """
+
+        def make_activation_key(cv_id, env_id, org_id):
+            return self.make_activation_key(
                 {
                     'content-view-id': cv_id,
                     'lifecycle-environment-id': env_id,
                     'organization-id': org_id,
                 }
             )['id']
-        else:
+
+        def update_activation_key(cv_id, org_id):
             activationkey_id = options['activationkey-id']
             # Given activation key may have no (or different) CV associated.
             # Associate activation key with CV just to be sure
@@ -672,28 +735,141 @@ class CLIFactory:
                 raise CLIFactoryError(
                     f'Failed to associate activation-key with CV\n{err.msg}'
                 ) from err
+            return activationkey_id
 
-        # Add custom_product subscription to activation-key, if SCA mode is disabled
-        if self._satellite.is_sca_mode_enabled(org_id) is False:
-            self.activationkey_add_subscription_to_repo(
+        def add_subscription(activationkey_id, org_id, sca, subscription):
+            # Add subscription to activation-key, if SCA mode is disabled
+            if sca is False:
+                self.activationkey_add_subscription_to_repo(
+                    {
+                        'activationkey-id': activationkey_id,
+                        'organization-id': org_id,
+                        'subscription': subscription,
+                    }
+                )
+
+        def override(activationkey_id, repo_info):
+            # Override the product to true ( turned off by default in 6.14 )
+            self._satellite.cli.ActivationKey.content_override(
                 {
-                    'activationkey-id': activationkey_id,
-                    'organization-id': org_id,
-                    'subscription': custom_product['name'],
+                    'id': activationkey_id,
+                    'content-label': repo_info['content-label'],
+                    'value': 'true',
                 }
             )
-        # Override custom product to true ( turned off by default in 6.14 )
-        custom_repo = self._satellite.cli.Repository.info({'id': custom_repo['id']})
-        self._satellite.cli.ActivationKey.content_override(
-            {'id': activationkey_id, 'content-label': custom_repo['content-label'], 'value': 'true'}
+
+        if options.get('activationkey-id') is None:
+            graph.add(
+                'activationkey_id',
+                make_activation_key,
+                requires=['cv_id', 'env_id', 'org_id'],
+                after=['promoted'],
+            )
+        else:
+            graph.add(
+                'activationkey_id',
+                update_activation_key,
+                requires=['cv_id', 'org_id'],
+                after=['promoted'],
+            )
+        graph.add(
+            'subscribed',
+            add_subscription,
+            requires=['activationkey_id', 'org_id', 'sca', 'subscription'],
+        )
+        graph.add(
+            'overridden',
+            override,
+            requires=['activationkey_id', 'repo_info'],
+            after=['subscribed'],
+        )
+
+    def setup_org_for_a_custom_repo(self, options=None):
+        """Sets up Org for the given custom repo by:
+
+        1. Checks if organization and lifecycle environment were given, otherwise
+            creates new ones.
+        2. Creates a new product with the custom repo. Synchronizes the repo.
+        3. Checks if content view was given, otherwise creates a new one and
+            - adds the RH repo
+            - publishes
+            - promotes to the lifecycle environment
+        4. Checks if activation key was given, otherwise creates a new one and
+            associates it with the content view.
+        5. Adds the custom repo subscription to the activation key
+        6. Override custom product to true ( turned off by default in 6.14 )
+
+        Steps not depending on each other, e.g. the lifecycle environment, product and content
+        view creations, run concurrently, see :class:`robottelo.host_helpers.task_graph.TaskGraph`.
+
+        :return: A dictionary with the entity ids of Activation key, Content view,
+            Lifecycle Environment, Organization, Product and Repository
+
+        """
+        graph = TaskGraph()
+        inputs = {}
+        self._add_setup_org_steps(graph, inputs, options)
+
+        def synchronize(repo):
+            try:
+                self._satellite.cli.Repository.synchronize({'id': repo['id']})
+            except CLIReturnCodeError as err:
+                raise CLIFactoryError(f'Failed to synchronize repository\n{err.msg}') from err
+
+        def promote(cv_id, env_id, org_id):
+            # Get the version id
+            cv_info = self._satellite.cli.ContentView.info({'id': cv_id})
+            assert len(cv_info['versions']) > 0
+            cv_info['versions'].sort(key=lambda version: version['id'])
+            cvv = cv_info['versions'][-1]
+            lce_promoted = cv_info['lifecycle-environments']
+            # Promote version to next env
+            try:
+                if env_id not in [int(lce['id']) for lce in lce_promoted]:
+                    self._satellite.cli.ContentView.version_promote(
+                        {
+                            'id': cvv['id'],
+                            'organization-id': org_id,
+                            'to-lifecycle-environment-id': env_id,
+                        }
+                    )
+            except CLIReturnCodeError as err:
+                raise CLIFactoryError(
+                    f'Failed to promote version to next environment\n{err.msg}'
+                ) from err
+
+        # Create custom product and repository
+        graph.add(
+            'product',
+            lambda org_id: self.make_product({'organization-id': org_id}),
+            requires=['org_id'],
+        )
+        graph.add('subscription', lambda product: product['name'], requires=['product'])
+        graph.add(
+            'repo',
+            lambda product: self.make_repository(
+                {'content-type': 'yum', 'product-id': product['id'], 'url': options.get('url')}
+            ),
+            requires=['product'],
         )
+        graph.add('synced', synchronize, requires=['repo'])
+        graph.add(
+            'repo_info',
+            lambda repo: self._satellite.cli.Repository.info({'id': repo['id']}),
+            requires=['repo'],
+            after=['synced'],
+        )
+        self._add_setup_content_view_steps(graph)
+        graph.add('promoted', promote, requires=['cv_id', 'env_id', 'org_id'], after=['published'])
+        self._add_setup_activation_key_steps(graph, options)
+        results = graph.run(**inputs)
         return {
-            'activationkey-id': activationkey_id,
-            'content-view-id': cv_id,
-            'lifecycle-environment-id': env_id,
-            'organization-id': org_id,
-            'product-id': custom_product['id'],
-            'repository-id': custom_repo['id'],
+            'activationkey-id': results['activationkey_id'],
+            'content-view-id': results['cv_id'],
+            'lifecycle-environment-id': results['env_id'],
+            'organization-id': results['org_id'],
+            'product-id': results['product']['id'],
+            'repository-id': results['repo_info']['id'],
         }
 
     def _setup_org_for_a_rh_repo(self, options=None, force=False):
@@ -711,6 +887,10 @@ class CLIFactory:
             associates it with the content view.
         6. Adds the RH repo subscription to the activation key
 
+        Steps not depending on each other, e.g. the lifecycle environment creation and the
+        manifest upload, run concurrently, see
+        :class:`robottelo.host_helpers.task_graph.TaskGraph`.
+
         Note that in most cases you should use ``setup_org_for_a_rh_repo`` instead
         as it's more flexible.
 
@@ -718,135 +898,90 @@ class CLIFactory:
             Lifecycle Environment, Organization and Repository
 
         """
-        # Create new organization and lifecycle environment if needed
-        if options.get('organization-id') is None:
-            org_id = self.make_org()['id']
-        else:
-            org_id = options['organization-id']
-        if options.get('lifecycle-environment-id') is None:
-            env_id = self.make_lifecycle_environment({'organization-id': org_id})['id']
-        else:
-            env_id = options['lifecycle-environment-id']
-        # If manifest does not exist, clone and upload it
-        if len(self._satellite.cli.Subscription.exists({'organization-id': org_id})) == 0:
-            with clone() as manifest:
-                self._satellite.upload_manifest(org_id, manifest.content)
-        # Enable repo from Repository Set
-        try:
-            self._satellite.cli.RepositorySet.enable(
-                {
-                    'basearch': 'x86_64',
-                    'name': options['repository-set'],
-                    'organization-id': org_id,
-                    'product': options['product'],
-                    'releasever': options.get('releasever'),
-                }
-            )
-        except CLIReturnCodeError as err:
-            raise CLIFactoryError(f'Failed to enable repository set\n{err.msg}') from err
-        # Fetch repository info
-        try:
-            rhel_repo = self._satellite.cli.Repository.info(
-                {
-                    'name': options['repository'],
-                    'organization-id': org_id,
-                    'product': options['product'],
-                }
-            )
-        except CLIReturnCodeError as err:
-            raise CLIFactoryError(f'Failed to fetch repository info\n{err.msg}') from err
-        # Synchronize the RH repository
-        try:
-            self._satellite.cli.Repository.synchronize(
-                {
-                    'name': options['repository'],
-                    'organization-id': org_id,
-                    'product': options['product'],
-                }
-            )
-        except CLIReturnCodeError as err:
-            raise CLIFactoryError(f'Failed to synchronize repository\n{err.msg}') from err
-        # Create CV if needed and associate repo with it
-        if options.get('content-view-id') is None:
-            cv_id = self.make_content_view({'organization-id': org_id})['id']
-        else:
-            cv_id = options['content-view-id']
-        try:
-            self._satellite.cli.ContentView.add_repository(
-                {'id': cv_id, 'organization-id': org_id, 'repository-id': rhel_repo['id']}
-            )
-        except CLIReturnCodeError as err:
-            raise CLIFactoryError(f'Failed to add repository to content view\n{err.msg}') from err
-        # Publish a new version of CV
-        try:
-            self._satellite.cli.ContentView.publish({'id': cv_id})
-        except CLIReturnCodeError as err:
-            raise CLIFactoryError(
-                f'Failed to publish new version of content view\n{err.msg}'
-            ) from err
-        # Get the version id
-        try:
-            cvv = self._satellite.cli.ContentView.info({'id': cv_id})['versions'][-1]
-        except CLIReturnCodeError as err:
-            raise CLIFactoryError(f'Failed to fetch content view info\n{err.msg}') from err
-        # Promote version1 to next env
-        try:
-            self._satellite.cli.ContentView.version_promote(
-                {
-                    'id': cvv['id'],
-                    'organization-id': org_id,
-                    'to-lifecycle-environment-id': env_id,
-                    'force': force,
-                }
-            )
-        except CLIReturnCodeError as err:
-            raise CLIFactoryError(
-                f'Failed to promote version to next environment\n{err.msg}'
-            ) from err
-        # Create activation key if needed and associate content view with it
-        if options.get('activationkey-id') is None:
-            activationkey_id = self.make_activation_key(
-                {
-                    'content-view-id': cv_id,
-                    'lifecycle-environment-id': env_id,
-                    'organization-id': org_id,
-                }
-            )['id']
-        else:
-            activationkey_id = options['activationkey-id']
-            # Given activation key may have no (or different) CV associated.
-            # Associate activation key with CV just to be sure
+        graph = TaskGraph()
+        inputs = {'subscription': options.get('subscription', constants.DEFAULT_SUBSCRIPTION_NAME)}
+        self._add_setup_org_steps(graph, inputs, options)
+        repo_options = {'name': options['repository'], 'product': options['product']}
+
+        def upload_manifest(org_id):
+            # If manifest does not exist, clone and upload it
+            if len(self._satellite.cli.Subscription.exists({'organization-id': org_id})) == 0:
+                with clone() as manifest:
+                    self._satellite.upload_manifest(org_id, manifest.content)
+
+        def enable(org_id):
+            # Enable repo from Repository Set
             try:
-                self._satellite.cli.ActivationKey.update(
-                    {'id': activationkey_id, 'organization-id': org_id, 'content-view-id': cv_id}
+                self._satellite.cli.RepositorySet.enable(
+                    {
+                        'basearch': 'x86_64',
+                        'name': options['repository-set'],
+                        'organization-id': org_id,
+                        'product': options['product'],
+                        'releasever': options.get('releasever'),
+                    }
+                )
+            except CLIReturnCodeError as err:
+                raise CLIFactoryError(f'Failed to enable repository set\n{err.msg}') from err
+
+        def fetch_repository(org_id):
+            try:
+                return self._satellite.cli.Repository.info(
+                    {**repo_options, 'organization-id': org_id}
+                )
+            except CLIReturnCodeError as err:
+                raise CLIFactoryError(f'Failed to fetch repository info\n{err.msg}') from err
+
+        def synchronize(org_id):
+            # Synchronize the RH repository
+            try:
+                self._satellite.cli.Repository.synchronize(
+                    {**repo_options, 'organization-id': org_id}
+                )
+            except CLIReturnCodeError as err:
+                raise CLIFactoryError(f'Failed to synchronize repository\n{err.msg}') from err
+
+        def promote(cv_id, env_id, org_id):
+            # Get the version id
+            try:
+                cvv = self._satellite.cli.ContentView.info({'id': cv_id})['versions'][-1]
+            except CLIReturnCodeError as err:
+                raise CLIFactoryError(f'Failed to fetch content view info\n{err.msg}') from err
+            # Promote version1 to next env
+            try:
+                self._satellite.cli.ContentView.version_promote(
+                    {
+                        'id': cvv['id'],
+                        'organization-id': org_id,
+                        'to-lifecycle-environment-id': env_id,
+                        'force': force,
+                    }
                 )
             except CLIReturnCodeError as err:
                 raise CLIFactoryError(
-                    f'Failed to associate activation-key with CV\n{err.msg}'
+                    f'Failed to promote version to next environment\n{err.msg}'
                 ) from err
 
-        # Add default subscription to activation-key, if SCA mode is disabled
-        if self._satellite.is_sca_mode_enabled(org_id) is False:
-            self.activationkey_add_subscription_to_repo(
-                {
-                    'organization-id': org_id,
-                    'activationkey-id': activationkey_id,
-                    'subscription': options.get(
-                        'subscription', constants.DEFAULT_SUBSCRIPTION_NAME
-                    ),
-                }
-            )
-        # Override RHST product to true ( turned off by default in 6.14 )
-        rhel_repo = self._satellite.cli.Repository.info({'id': rhel_repo['id']})
-        self._satellite.cli.ActivationKey.content_override(
-            {'id': activationkey_id, 'content-label': rhel_repo['content-label'], 'value': 'true'}
+        graph.add('manifest', upload_manifest, requires=['org_id'])
+        graph.add('enabled', enable, requires=['org_id'], after=['manifest'])
+        graph.add('repo', fetch_repository, requires=['org_id'], after=['enabled'])
+        graph.add('synced', synchronize, requires=['org_id'], after=['repo'])
+        graph.add(
+            'repo_info',
+            lambda repo: self._satellite.cli.Repository.info({'id': repo['id']}),
+            requires=['repo'],
+            after=['synced'],
         )
+        self._add_setup_content_view_steps(graph)
+        graph.add('promoted', promote, requires=['cv_id', 'env_id', 'org_id'], after=['published'])
+        self._add_setup_activation_key_steps(graph, options)
+        results = graph.run(**inputs)
         return {
-            'activationkey-id': activationkey_id,
-            'content-view-id': cv_id,
-            'lifecycle-environment-id': env_id,
-            'organization-id': org_id,
-            'repository-id': rhel_repo['id'],
+            'activationkey-id': results['activationkey_id'],
+            'content-view-id': results['cv_id'],
+            'lifecycle-environment-id': results['env_id'],
+            'organization-id': results['org_id'],
+            'repository-id': results['repo_info']['id'],
         }
 
     def setup_org_for_a_rh_repo(
@@ -5,16 +5,21 @@ The direct import of the repo classes in this module is prohibited !!!!!
 
 import inspect
 import sys
+import time
+
+from nailgun.entity_mixins import TaskFailedError, TaskTimedOutError
 
 from robottelo import constants
 from robottelo.config import settings
 from robottelo.exceptions import (
+    CLIReturnCodeError,
     DistroNotSupportedError,
     OnlyOneOSRepositoryAllowed,
     ReposContentSetupWasNotPerformed,
     RepositoryAlreadyCreated,
     RepositoryAlreadyDefinedError,
     RepositoryDataNotFound,
+    RepositorySyncError,
 )
 
 
@@ -107,6 +112,12 @@ class BaseRepository:
         """Synchronize the repository"""
         self.satellite.cli.Repository.synchronize({'id': self.repo_info['id']}, timeout=4800000)
 
+    def synchronize_async(self):
+        """Start the repository synchronization and return the id of its foreman task"""
+        return self.satellite.cli.Repository.synchronize(
+            {'id': self.repo_info['id'], 'async': True}
+        )[0]['id']
+
     def add_to_content_view(self, organization_id, content_view_id):
         """Associate repository content to content-view"""
         self.satellite.cli.ContentView.add_repository(
@@ -435,7 +446,12 @@ class GenericRHRepository(BaseRepository):
             if synchronize:
                 self.synchronize()
         else:
-            repo_info = super().create(organization_id, product_id, download_policy=download_policy)
+            repo_info = super().create(
+                organization_id,
+                product_id,
+                download_policy=download_policy,
+                synchronize=synchronize,
+            )
         return repo_info
 
 
@@ -611,14 +627,29 @@ class RepositoryCollection:
     def __iter__(self):
         yield from self._items
 
-    def setup(self, org_id, download_policy='on_demand', synchronize=True):
+    def setup(
+        self,
+        org_id,
+        download_policy='on_demand',
+        synchronize=True,
+        parallel_sync=None,
+        sync_timeout=4800,
+    ):
         """Setup the repositories on server.
 
         Recommended usage: repository only setup, for full content setup see
             setup_content.
+
+        :param parallel_sync: create all the repositories first, then synchronize them all at
+            once, ``settings.performance.parallel_repository_sync`` by default
+        :param sync_timeout: seconds the synchronization of a repository may take when
+            synchronized in parallel
+        :raises RepositorySyncError: if some repositories failed to synchronize in parallel
         """
         if self._repos_info:
             raise RepositoryAlreadyCreated('Repositories already created')
+        if parallel_sync is None:
+            parallel_sync = settings.performance.parallel_repository_sync
         custom_product = None
         repos_info = []
         if any(not repo.cdn for repo in self):
@@ -631,17 +662,52 @@ class RepositoryCollection:
                 org_id,
                 custom_product_id,
                 download_policy=download_policy,
-                synchronize=synchronize,
+                synchronize=synchronize and not parallel_sync,
             )
             repos_info.append(repo_info)
         self._custom_product_info = custom_product
         self._repos_info = repos_info
+        if synchronize and parallel_sync:
+            self.synchronize(timeout=sync_timeout)
         return custom_product, repos_info
 
-    def setup_content_view(self, org_id, lce_id=None):
+    def synchronize(self, timeout=4800):
+        """Start the synchronization of all the created repositories, then wait for all of them
+
+        :param timeout: seconds the synchronization of a repository may take
+        :raises RepositorySyncError: listing the repositories that failed to synchronize
+        """
+        tasks = {}
+        failures = {}
+        for repo in self:
+            try:
+                tasks[repo] = repo.synchronize_async()
+            except CLIReturnCodeError as err:
+                failures[repo] = err.msg
+        # the repositories are synchronized at the same time, so they share the same deadline
+        deadline = time.monotonic() + timeout
+        for repo, task_id in tasks.items():
+            try:
+                self.satellite.api.ForemanTask(id=task_id).poll(
+                    timeout=max(deadline - time.monotonic(), 1)
+                )
+            except (TaskFailedError, TaskTimedOutError) as err:
+                failures[repo] = str(err)
+        if failures:
+            raise RepositorySyncError(
+                'Failed to synchronize repositories:\n'
+                + '\n'.join(f'{repo}: {reason}' for repo, reason in failures.items())
+            )
+
+    def setup_content_view(self, org_id, lce_id=None, batch=None):
         """Setup organization content view by adding all the repositories, publishing and promoting
         to lce if needed.
+
+        :param batch: add all the repositories to the content view in one call,
+            ``settings.performance.parallel_repository_sync`` by default
         """
+        if batch is None:
+            batch = settings.performance.parallel_repository_sync
         if lce_id is None:
             lce = self.satellite.cli_factory.make_lifecycle_environment({'organization-id': org_id})
         else:
@@ -650,8 +716,18 @@ class RepositoryCollection:
             )
         content_view = self.satellite.cli_factory.make_content_view({'organization-id': org_id})
         # Add repositories to content view
-        for repo in self:
-            repo.add_to_content_view(org_id, content_view['id'])
+        if batch:
+            # the content view is new, so setting its repositories adds them all
+            self.satellite.cli.ContentView.update(
+                {
+                    'id': content_view['id'],
+                    'organization-id': org_id,
+                    'repository-ids': [repo.repo_info['id'] for repo in self],
+                }
+            )
+        else:
+            for repo in self:
+                repo.add_to_content_view(org_id, content_view['id'])
         # Publish the content view
         self.satellite.cli.ContentView.publish({'id': content_view['id']})
         if lce['name'] != constants.ENVIRONMENT:
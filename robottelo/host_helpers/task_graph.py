@@ -0,0 +1,80 @@
+"""Small task graph engine running the independent steps of an entity setup concurrently.
+
+Each step of a :class:`TaskGraph` declares the steps whose results it needs. A step is started
+on a bounded thread pool as soon as all of them are done, and is passed their results as keyword
+arguments, so steps not depending on each other run at the same time.
+
+The cli entity classes keep the running hammer subcommand as a class attribute, so steps that may
+run at the same time must not use the same cli class.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class TaskGraph:
+    """Graph of setup steps, run with :meth:`run`
+
+    :param int max_workers: how many steps run at the same time at most
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._steps = {}
+
+    def add(self, name, func, requires=(), after=()):
+        """Declare a step
+
+        :param str name: the name of the step and of its result
+        :param func: callable run with the results of the required steps as keyword arguments
+        :param requires: names of the steps, or of the inputs passed to :meth:`run`, whose results
+            ``func`` needs. Steps have to be declared after the steps they require.
+        :param after: names of other steps that have to be done first, their results are not
+            passed to ``func``
+        """
+        if name in self._steps:
+            raise ValueError(f'Step {name!r} is already declared')
+        self._steps[name] = (func, tuple(requires), tuple(after))
+
+    def run(self, **inputs):
+        """Run all the steps and return their results
+
+        When a step fails, no other step is started, the running ones are waited for and the
+        exception of the first failed step is raised.
+
+        :param inputs: results known beforehand, e.g. the ids of entities given by the caller
+        :return: a dict mapping the inputs and the step names to their results
+        """
+        steps = list(self._steps)
+        for index, (name, (_, requires, after)) in enumerate(self._steps.items()):
+            if name in inputs:
+                raise ValueError(f'Step {name!r} is also given as an input')
+            for required in (*requires, *after):
+                if required not in inputs and required not in steps[:index]:
+                    raise ValueError(f'Step {name!r} requires unknown step or input {required!r}')
+        results = dict(inputs)
+        pending = dict(self._steps)
+        running = {}
+        error = None
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='task-graph')
+        with executor:
+            while pending or running:
+                if error is None:
+                    for name, (func, requires, after) in list(pending.items()):
+                        if all(required in results for required in (*requires, *after)):
+                            del pending[name]
+                            kwargs = {required: results[required] for required in requires}
+                            running[executor.submit(func, **kwargs)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as err:
+                        error = error or err
+        if error is not None:
+            raise error
+        return results
@@ -2,8 +2,7 @@ from configparser import ConfigParser
 import contextlib
 from contextlib import contextmanager
 from datetime import datetime
-from functools import cached_property, lru_cache
-import importlib
+from functools import cached_property, lru_cache, partial
 import io
 import json
 from pathlib import Path, PurePath
@@ -28,7 +27,8 @@ from wrapanapi.entities.vm import VmState
 import yaml
 
 from robottelo import constants
-from robottelo.cli.base import Base
+from robottelo.cli.base import HammerBatch
+from robottelo.cli.registry import CLINamespace, get_cli_classes
 from robottelo.config import (
     configure_airgun,
     configure_nailgun,
@@ -48,7 +48,7 @@ from robottelo.constants import (
     SATELLITE_VERSION,
 )
 from robottelo.exceptions import CLIFactoryError, DownloadFileError, HostPingFailed
-from robottelo.host_helpers import CapsuleMixins, ContentHostMixins, SatelliteMixins
+from robottelo.host_helpers import CapsuleMixins, ContentHostMixins, SatelliteMixins, api_namespace
 from robottelo.logging import logger
 from robottelo.utils import validate_ssh_pub_key
 from robottelo.utils.datafactory import valid_emails_list
@@ -1661,28 +1661,9 @@ class Capsule(ContentHost, CapsuleMixins):
 
     @property
     def cli(self):
-        """Import only satellite-maintain robottelo cli entities and wrap them under self.cli"""
-        self._cli = type('cli', (), {'_configured': False})
-        if self._cli._configured:
-            return self._cli
-
-        for file in Path('robottelo/cli/').iterdir():
-            if (
-                file.suffix == '.py'
-                and not file.name.startswith('_')
-                and file.name.startswith('sm_')
-            ):
-                cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
-                for name, obj in cli_module.__dict__.items():
-                    try:
-                        if Base in obj.mro():
-                            # create a copy of the class and set our hostname as a class attribute
-                            new_cls = type(name, (obj,), {'hostname': self.hostname})
-                            setattr(self._cli, name, new_cls)
-                    except AttributeError:
-                        # not everything has an mro method, we don't care about them
-                        pass
-        self._cli._configured = True
+        """Wrap the satellite-maintain robottelo cli entities under self.cli"""
+        if getattr(self, '_cli', None) is None:
+            self._cli = CLINamespace(get_cli_classes(prefix='sm_'), hostname=self.hostname)
         return self._cli
 
     def enable_satellite_or_capsule_module_for_rhel8(self):
@@ -1718,9 +1699,9 @@ class Satellite(Capsule, SatelliteMixins):
         self.omitting_credentials = False
         self.port = kwargs.get('port', settings.server.port)
         super().__init__(hostname=hostname, **kwargs)
-        # create dummy classes for later population
-        self._api = type('api', (), {'_configured': False})
-        self._cli = type('cli', (), {'_configured': False})
+        # populated on first access
+        self._api = None
+        self._cli = None
         self._apidoc = None
         self.record_property = None
 
@@ -1732,9 +1713,10 @@ class Satellite(Capsule, SatelliteMixins):
 
         pip_main(['uninstall', '-y', 'nailgun'])
         pip_main(['install', f'https://github.com/SatelliteQE/nailgun/archive/{new_version}.zip'])
-        self._api = type('api', (), {'_configured': False})
+        self._api = None
         to_clear = [k for k in sys.modules if 'nailgun' in k]
         [sys.modules.pop(k) for k in to_clear]
+        api_namespace.clear_cache()
 
     def enable_ipv6_http_proxy(self):
         """Execute procedures for enabling IPv6 HTTP Proxy"""
@@ -1788,41 +1770,19 @@ class Satellite(Capsule, SatelliteMixins):
 
     @property
     def api(self):
-        """Import all nailgun entities and wrap them under self.api"""
-        if not self._api:
-            self._api = type('api', (), {'_configured': False})
-        if self._api._configured:
-            return self._api
-        from nailgun import entities as _entities  # use a private import
-        from nailgun.config import ServerConfig
-        from nailgun.entity_mixins import Entity
-
-        def inject_config(cls, server_config):
-            """inject a nailgun server config into the init of nailgun entity classes"""
-            import functools
-
-            class DecClass(cls):
-                __init__ = functools.partialmethod(cls.__init__, server_config=server_config)
-
-            return DecClass
-
-        # set the server configuration to point to this satellite
-        self.nailgun_cfg = ServerConfig(
-            auth=(settings.server.admin_username, settings.server.admin_password),
-            url=f'{self.url}',
-            verify=settings.server.verify_ca,
-        )
-        # add each nailgun entity to self.api, injecting our server config
-        for name, obj in _entities.__dict__.items():
-            try:
-                if Entity in obj.mro():
-                    #  create a copy of the class and inject our server config into the __init__
-                    new_cls = type(name, (obj,), {})
-                    setattr(self._api, name, inject_config(new_cls, self.nailgun_cfg))
-            except AttributeError:
-                # not everything has an mro method, we don't care about them
-                pass
-        self._api._configured = True
+        """Wrap all nailgun entities under self.api"""
+        if self._api is None:
+            from nailgun.config import ServerConfig
+
+            # set the server configuration to point to this satellite
+            server_config = ServerConfig(
+                auth=(settings.server.admin_username, settings.server.admin_password),
+                url=f'{self.url}',
+                verify=settings.server.verify_ca,
+            )
+            # the entities are bound once for all the objects of this satellite
+            self._api = api_namespace.get_api_namespace(server_config)
+            self.nailgun_cfg = self._api.server_config
         return self._api
 
     @property
@@ -1840,32 +1800,15 @@ class Satellite(Capsule, SatelliteMixins):
 
     @property
     def cli(self):
-        """Import all robottelo cli entities and wrap them under self.cli"""
-        if not self._cli:
-            self._cli = type('cli', (), {'_configured': False})
-        if self._cli._configured:
-            return self._cli
-
-        for file in Path('robottelo/cli/').iterdir():
-            if file.suffix == '.py' and not file.name.startswith('_'):
-                cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
-                for name, obj in cli_module.__dict__.items():
-                    try:
-                        if Base in obj.mro():
-                            # create a copy of the class and set our hostname as a class attribute
-                            new_cls = type(
-                                name,
-                                (obj,),
-                                {
-                                    'hostname': self.hostname,
-                                    'omitting_credentials': self.omitting_credentials,
-                                },
-                            )
-                            setattr(self._cli, name, new_cls)
-                    except AttributeError:
-                        # not everything has an mro method, we don't care about them
-                        pass
-        self._cli._configured = True
+        """Wrap all robottelo cli entities under self.cli"""
+        if self._cli is None:
+            self._cli = CLINamespace(
+                get_cli_classes(),
+                hostname=self.hostname,
+                omitting_credentials=self.omitting_credentials,
+            )
+            # queue hammer commands for this satellite, see HammerBatch
+            self._cli.batch = partial(HammerBatch, hostname=self.hostname)
         return self._cli
 
     @contextmanager
@@ -1874,23 +1817,13 @@ class Satellite(Capsule, SatelliteMixins):
         if change:
             self.omitting_credentials = True
             # if CLI is already created
-            if self._cli._configured:
-                for name, obj in self._cli.__dict__.items():
-                    with contextlib.suppress(
-                        AttributeError
-                    ):  # not everything has an mro method, we don't care about them
-                        if Base in obj.mro():
-                            getattr(self._cli, name).omitting_credentials = True
+            if self._cli is not None:
+                self._cli.bind(omitting_credentials=True)
         yield
         if change:
             self.omitting_credentials = False
-            if self._cli._configured:
-                for name, obj in self._cli.__dict__.items():
-                    with contextlib.suppress(
-                        AttributeError
-                    ):  # not everything has an mro method, we don't care about them
-                        if Base in obj.mro():
-                            getattr(self._cli, name).omitting_credentials = False
+            if self._cli is not None:
+                self._cli.bind(omitting_credentials=False)
 
     @contextmanager
     def ui_session(self, testname=None, user=None, password=None, url=None, login=True):
@@ -1,6 +1,7 @@
 """Utility module to handle the shared ssh connection."""
 
 from robottelo.cli import hammer
+from robottelo.utils import ssh as ssh_utils
 
 
 def get_client(
@@ -14,16 +15,15 @@ def get_client(
 
     Processes ssh credentials in the order: password, key_filename, ssh_key
     Config validation enforces one of the three must be set in settings.server
+
+    The host object comes from the pool in :mod:`robottelo.utils.ssh` when pooling is enabled.
     """
-    from robottelo.config import settings
-    from robottelo.hosts import ContentHost
-
-    return ContentHost(
-        hostname=hostname or settings.server.hostname,
-        username=username or settings.server.ssh_username,
-        password=password or settings.server.ssh_password,
-        port=port or settings.server.ssh_client.port,
-        ipv6=ipv6 or settings.server.is_ipv6,
+    return ssh_utils.get_client(
+        hostname=hostname,
+        username=username,
+        password=password,
+        port=port,
+        ipv6=ipv6,
     )
 
 
@@ -53,7 +53,15 @@ def command(
         port=port,
         ipv6=ipv6,
     )
-    result = client.execute(cmd, timeout=timeout)
+    try:
+        result = client.execute(cmd, timeout=timeout)
+    except Exception:
+        # never hand a broken channel out again
+        if pool := ssh_utils.get_ssh_pool():
+            pool.discard(
+                ssh_utils.get_client_key(hostname=hostname, username=username, port=port, ipv6=ipv6)
+            )
+        raise
 
     if output_format and result.status == 0:
         if output_format == 'csv':
@@ -61,3 +69,27 @@ def command(
         if output_format == 'json':
             result.stdout = hammer.parse_json(result.stdout) if result.stdout else None
     return result
+
+
+def stream_command(
+    cmd,
+    hostname=None,
+    username=None,
+    password=None,
+    timeout=None,
+    port=22,
+    ipv6=None,
+):
+    """Executes a SSH command on remote hostname and streams its output line by line.
+
+    See :func:`robottelo.utils.ssh.stream_command`.
+    """
+    return ssh_utils.stream_command(
+        cmd,
+        hostname=hostname,
+        username=username,
+        password=password,
+        timeout=timeout,
+        port=port,
+        ipv6=ipv6,
+    )
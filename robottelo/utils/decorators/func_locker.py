@@ -4,6 +4,7 @@ Usage::
 
 
     from robottelo.utils.decorators.func_locker import (
+        LOCK_SHARED,
         locking_function,
         lock_function,
      )
@@ -38,15 +39,36 @@ Usage::
        def test_that_conflict_with_test_to_lock(self)
             with locking_function(self.test_to_lock):
                 # do some operations that conflict with test_to_lock
+
+    # the tests only reading what an other test writes can run at the same
+    # time, but never while the writer runs
+    class SomeTestCase(TestCase):
+
+       @lock_function
+       def test_writing(self):
+          pass
+
+       def test_reading(self)
+            with locking_function(self.test_writing, mode=LOCK_SHARED):
+                # do some read operations
+
+    # at most 3 workers run the function at the same time
+    @lock_function(slots=3)
+    def sync_rh_repos():
+        pass
 """
 
 from contextlib import contextmanager
+import fcntl
 import functools
 import inspect
 import os
+import random
 import tempfile
+import time
 
 from pytest_services.locks import file_lock
+import zc.lockfile
 
 from robottelo.config import settings
 from robottelo.logging import logger
@@ -57,6 +79,8 @@ LOCK_DIR = None
 LOCK_DEFAULT_TIMEOUT = 1800  # 30 minutes
 LOCK_FILE_NAME_EXT = 'lock'
 LOCK_DEFAULT_SCOPE = None
+LOCK_EXCLUSIVE = 'exclusive'
+LOCK_SHARED = 'shared'
 
 _DEFAULT_CLASS_NAME_DEPTH = 3
 
@@ -188,12 +212,106 @@ def _write_content(handler, content):
     handler.flush()
 
 
+def _sleep_before_retry():
+    # as pytest_services file_lock does
+    time.sleep(random.random() * 0.1 + 0.05)
+
+
+@contextmanager
+def _shared_file_lock(lock_file_path, timeout):
+    """Hold a shared lock of the file, excluded by the exclusive locks of file_lock only"""
+    deadline = time.monotonic() + timeout
+    with open(lock_file_path, 'a') as handler:
+        while True:
+            try:
+                fcntl.flock(handler.fileno(), fcntl.LOCK_SH | fcntl.LOCK_NB)
+                break
+            except BlockingIOError as err:
+                if time.monotonic() >= deadline:
+                    raise FunctionLockerError(
+                        f'not able to acquire a shared lock of {lock_file_path} in {timeout}s'
+                    ) from err
+            _sleep_before_retry()
+        try:
+            yield handler
+        finally:
+            fcntl.flock(handler.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def _slot_file_lock(lock_file_path, slots, timeout):
+    """Hold the exclusive lock of the first free one of the slots of the lock file
+
+    The lock file itself is held shared meanwhile, so that the slot holders are
+    excluded by an exclusive lock of the file without slots.
+    """
+    root, ext = os.path.splitext(lock_file_path)
+    slot_paths = [f'{root}.{slot}{ext}' for slot in range(slots)]
+    deadline = time.monotonic() + timeout
+    with _shared_file_lock(lock_file_path, timeout):
+        lock_file = None
+        while lock_file is None:
+            for slot_path in slot_paths:
+                try:
+                    lock_file = zc.lockfile.SimpleLockFile(slot_path)
+                    break
+                except zc.lockfile.LockError:
+                    pass
+            else:
+                if time.monotonic() >= deadline:
+                    raise FunctionLockerError(
+                        f'not able to acquire one of the {slots} slots of {lock_file_path} in '
+                        f'{timeout}s'
+                    )
+                _sleep_before_retry()
+        try:
+            yield lock_file._fp
+        finally:
+            lock_file.close()
+
+
+@contextmanager
+def _lock(lock_file_path, mode=LOCK_EXCLUSIVE, slots=None, timeout=LOCK_DEFAULT_TIMEOUT):
+    """Lock the file in the given mode and yield its handler
+
+    The exclusive locks, including the ones of the slots, hold the id of the
+    locking process while locked.
+    """
+    if mode not in (LOCK_EXCLUSIVE, LOCK_SHARED):
+        raise FunctionLockerError(f'unknown lock mode: {mode}')
+    if mode == LOCK_SHARED:
+        if slots:
+            raise FunctionLockerError('slots are only supported by exclusive locks')
+        with _shared_file_lock(lock_file_path, timeout) as handler:
+            yield handler
+        return
+
+    process_id = str(os.getpid())
+    if slots:
+        lock_context = _slot_file_lock(lock_file_path, slots, timeout)
+    else:
+        # to prevent dead lock when recursively calling this function
+        # check if the same process is trying to acquire the lock
+        _check_deadlock(lock_file_path, process_id)
+        lock_context = file_lock(lock_file_path, remove=False, timeout=timeout)
+    with lock_context as handler:
+        # write the process id that locked this function
+        _write_content(handler, process_id)
+        try:
+            yield handler
+        finally:
+            # clear the file
+            _write_content(handler, None)
+
+
 def lock_function(
     function=None,
     scope=_get_default_scope,
     scope_context=None,
     scope_kwargs=None,
     timeout=LOCK_DEFAULT_TIMEOUT,
+    mode=LOCK_EXCLUSIVE,
+    slots=None,
 ):
     """Generic function locker, lock any decorated function. Any parallel
      pytest xdist worker will wait for this function to finish
@@ -203,6 +321,8 @@ def lock_function(
     :type scope_kwargs: dict
     :type scope_context: str
     :type timeout: int
+    :type mode: str
+    :type slots: int
 
     :param function: the function that is intended to be locked
     :param scope: this parameter will define the namespace of locking
@@ -210,6 +330,10 @@ def lock_function(
            lock in combination with scope and function.
     :param scope_kwargs: kwargs to be passed to scope if is a callable
     :param timeout: the time in seconds to wait for acquiring the lock
+    :param mode: LOCK_EXCLUSIVE, or LOCK_SHARED to let the other shared lock
+        holders run at the same time, but never the exclusive ones
+    :param slots: the number of workers allowed to run the function at the
+        same time, the function is locked exclusively by default
     """
     class_names = []
     class_name = None
@@ -226,6 +350,7 @@ def lock_function(
     def main_wrapper(func):
         func.__class_name__ = class_name
         func.__function_locked__ = True
+        func.__lock_slots__ = slots
 
         @functools.wraps(func)
         def function_wrapper(*args, **kwargs):
@@ -233,25 +358,13 @@ def lock_function(
             lock_file_path = _get_function_name_lock_path(
                 function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
             )
-            process_id = str(os.getpid())
-            # to prevent dead lock when recursively calling this function
-            # check if the same process is trying to acquire the lock
-            _check_deadlock(lock_file_path, process_id)
-
-            with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+            with _lock(lock_file_path, mode=mode, slots=slots, timeout=timeout):
                 logger.info(
-                    f'process id: {process_id} lock function using file path: {lock_file_path}'
+                    f'process id: {os.getpid()} {mode} lock function using file path: '
+                    f'{lock_file_path}'
                 )
-                # write the process id that locked this function
-                _write_content(handler, process_id)
                 # call the locked function
-                try:
-                    res = func(*args, **kwargs)
-                finally:
-                    # clear the file
-                    _write_content(handler, None)
-
-            return res
+                return func(*args, **kwargs)
 
         return function_wrapper
 
@@ -270,6 +383,8 @@ def locking_function(
     scope_context=None,
     scope_kwargs=None,
     timeout=LOCK_DEFAULT_TIMEOUT,
+    mode=LOCK_EXCLUSIVE,
+    slots=None,
 ):
     """Lock a function in combination with a scope and scope_context.
     Any parallel pytest xdist worker will wait for this function to finish.
@@ -279,6 +394,8 @@ def locking_function(
     :type scope_kwargs: dict
     :type scope_context: str
     :type timeout: int
+    :type mode: str
+    :type slots: int
 
     :param function: the function that is intended to be locked
     :param scope: this parameter will define the namespace of locking
@@ -286,6 +403,11 @@ def locking_function(
            lock in combination with scope and function.
     :param scope_kwargs: kwargs to be passed to scope if is a callable
     :param timeout: the time in seconds to wait for acquiring the lock
+    :param mode: LOCK_EXCLUSIVE, or LOCK_SHARED to let the other shared lock
+        holders run at the same time, but never the exclusive ones
+    :param slots: the number of workers allowed to hold the lock at the same
+        time, the slots the function was decorated with by default, 0 to lock
+        it exclusively from all its slot holders
     """
     if not getattr(function, '__function_locked__', False):
         raise FunctionLockerError('Cannot ensure locking when using a non locked function')
@@ -294,20 +416,14 @@ def locking_function(
     lock_file_path = _get_function_name_lock_path(
         function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
     )
-    process_id = str(os.getpid())
-    # to prevent dead lock when recursively calling this function
-    # check if the same process is trying to acquire the lock
-    _check_deadlock(lock_file_path, process_id)
+    if mode == LOCK_SHARED and getattr(function, '__lock_slots__', None):
+        raise FunctionLockerError('shared locks are not supported by functions locked with slots')
+    if slots is None and mode == LOCK_EXCLUSIVE:
+        slots = getattr(function, '__lock_slots__', None)
 
-    with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+    with _lock(lock_file_path, mode=mode, slots=slots, timeout=timeout) as handler:
         logger.info(
-            f'process id: {process_id} - lock function name:{function_name}  - using file path: {lock_file_path}'
+            f'process id: {os.getpid()} - {mode} lock function name:{function_name}  - using file path: {lock_file_path}'
         )
-        # write the process id that locked this function
-        _write_content(handler, process_id)
         # let the locked code run
-        try:
-            yield handler
-        finally:
-            # clear the file
-            _write_content(handler, None)
+        yield handler
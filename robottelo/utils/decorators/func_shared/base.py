@@ -1,4 +1,22 @@
 import json
+import os
+import time
+
+# seconds between two reads of a value by the handlers not notified of the writes
+POLL_INTERVAL = 0.5
+# seconds after which the handlers notified of the writes check the value anyway
+CHECK_INTERVAL = 5
+
+
+def is_process_alive(pid):
+    """Whether a process of this host is still running"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
 
 
 class BaseStorageHandler:
@@ -25,3 +43,22 @@ class BaseStorageHandler:
     def set(self, key, value):
         """Write the value of key to storage"""
         raise NotImplementedError
+
+    def wait(self, key, until, timeout=None):
+        """Wait, without locking, until the value of key satisfies a condition
+
+        The value is polled, the handlers notified of the writes should override this.
+
+        :type key: str
+        :param until: callable receiving the value of key, None if not set
+        :param timeout: the maximum time in seconds to wait, forever if None
+        :return: the last value read
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        value = self.get(key)
+        while not until(value):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(POLL_INTERVAL)
+            value = self.get(key)
+        return value
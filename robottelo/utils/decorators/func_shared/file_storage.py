@@ -1,10 +1,16 @@
 import os
 import tempfile
+import time
 
 from pytest_services.locks import file_lock
 
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
 from robottelo.config import settings
-from robottelo.utils.decorators.func_shared.base import BaseStorageHandler
+from robottelo.utils.decorators.func_shared.base import CHECK_INTERVAL, BaseStorageHandler
 
 TEMP_ROOT_DIR = 'robottelo'
 TEMP_FUNC_SHARED_DIR = 'shared_functions'
@@ -94,6 +100,40 @@ class FileStorageHandler(BaseStorageHandler):
         :type value: object
         """
         value = self.encode(value)
-        key_file_path = self.get_key_file_path(key)
-        with open(key_file_path, 'w') as file_handler:
+        # the value is written aside and moved in place, so that the readers not holding the lock
+        # never read a partially written value
+        with tempfile.NamedTemporaryFile(
+            'w', dir=self._root_dir, prefix=f'.{key}.', delete=False
+        ) as file_handler:
             file_handler.write(value)
+        os.replace(file_handler.name, self.get_key_file_path(key))
+
+    def wait(self, key, until, timeout=None):
+        """Wait, without locking, until the value of key satisfies a condition
+
+        The value is read again each time its file is replaced, as notified by inotify, the value
+        is polled when inotify_simple is not installed.
+
+        :type key: str
+        :param until: callable receiving the value of key, None if not set
+        :param timeout: the maximum time in seconds to wait, the lock timeout if None
+        :return: the last value read
+        """
+        if timeout is None:
+            timeout = self._lock_timeout
+        if inotify_simple is None:
+            return super().wait(key, until, timeout=timeout)
+
+        deadline = time.monotonic() + timeout
+        with inotify_simple.INotify() as inotify:
+            inotify.add_watch(self._root_dir, inotify_simple.flags.MOVED_TO)
+            # read after watching, to not miss a value written in between
+            value = self.get(key)
+            while not until(value):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                events = inotify.read(timeout=int(min(remaining, CHECK_INTERVAL) * 1000))
+                if not events or any(event.name == key for event in events):
+                    value = self.get(key)
+        return value
@@ -1,9 +1,11 @@
+import time
+
 try:
     import redis
 except ImportError:
     redis = None
 
-from robottelo.utils.decorators.func_shared.base import BaseStorageHandler
+from robottelo.utils.decorators.func_shared.base import CHECK_INTERVAL, BaseStorageHandler
 
 REDIS_HOST = 'localhost'
 REDIS_PORT = 6379
@@ -39,6 +41,11 @@ class RedisStorageHandler(BaseStorageHandler):
         # If acquired the lock will be acquired until release
         return self.client.lock(lock_key, timeout=None, blocking_timeout=timeout)
 
+    @staticmethod
+    def get_channel(key):
+        """Return the channel the writes of key are published to"""
+        return f'{key}.written'
+
     def when_lock_acquired(self, lock_object):
         # do nothing
         pass
@@ -60,4 +67,34 @@ class RedisStorageHandler(BaseStorageHandler):
         :type value: object
         """
         value = self.encode(value)
-        self.client.set(key, value)
+        with self.client.pipeline() as pipeline:
+            pipeline.set(key, value).publish(self.get_channel(key), '').execute()
+
+    def wait(self, key, until, timeout=None):
+        """Wait, without locking, until the value of key satisfies a condition
+
+        The value is read again each time a write of key is published.
+
+        :type key: str
+        :param until: callable receiving the value of key, None if not set
+        :param timeout: the maximum time in seconds to wait, the lock timeout if None
+        :return: the last value read
+        """
+        if timeout is None:
+            timeout = self._lock_timeout
+
+        deadline = time.monotonic() + timeout
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(self.get_channel(key))
+            # read after subscribing, to not miss a value written in between
+            value = self.get(key)
+            while not until(value):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                pubsub.get_message(timeout=min(remaining, CHECK_INTERVAL))
+                value = self.get(key)
+        finally:
+            pubsub.close()
+        return value
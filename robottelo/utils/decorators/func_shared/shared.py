@@ -85,30 +85,43 @@ Usage::
             return dict(org=cls.org, repo=cls.repo}
 """
 
+import copy
 import datetime
 import functools
 import hashlib
 from importlib import import_module
 import inspect
 import os
+import socket
+import ssl
 import sys
 import traceback
 import uuid
 
+from nailgun import entities
 from nailgun.entities import Entity
+import requests
 
-from robottelo.config import setting_is_set, settings
+from robottelo.config import get_credentials, get_url, setting_is_set, settings
 from robottelo.logging import logger
-from robottelo.utils.decorators.func_shared import file_storage, redis_storage
+from robottelo.utils.decorators.func_shared import file_storage, redis_storage, sqlite_storage
+from robottelo.utils.decorators.func_shared.base import is_process_alive
 from robottelo.utils.decorators.func_shared.file_storage import FileStorageHandler
 from robottelo.utils.decorators.func_shared.redis_storage import RedisStorageHandler
+from robottelo.utils.decorators.func_shared.sqlite_storage import SQLiteStorageHandler
 
-_storage_handlers = {'file': FileStorageHandler, 'redis': RedisStorageHandler}
+_storage_handlers = {
+    'file': FileStorageHandler,
+    'redis': RedisStorageHandler,
+    'sqlite': SQLiteStorageHandler,
+}
 
 DEFAULT_STORAGE_HANDLER = 'file'
 # by default using the shared data is disabled
 ENABLED = False
 NAMESPACE_SCOPE = None
+# whether the keys are scoped by the fingerprint of the configured Satellite
+SERVER_FINGERPRINT = False
 # after 24 hours the shared function data will became not valid
 SHARE_DEFAULT_TIMEOUT = 86400
 DEFAULT_CALL_RETRIES = 2
@@ -118,12 +131,18 @@ _configured = False
 _NAMESPACE_SCOPE_KEY_TYPE = 'shared_function'
 _DEFAULT_CLASS_NAME_DEPTH = 3
 
+_STATE_RUNNING = 'RUNNING'
 _STATE_READY = 'READY'
 _STATE_FAILED = 'FAILED'
 
 _DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
 
-_SERVER_CERT_MD5 = None
+_SERVER_FINGERPRINT = None
+# seconds to wait for each of the Satellite requests computing the server fingerprint
+_SERVER_FINGERPRINT_TIMEOUT = 10
+
+# the ready values already read by this process, by key, with their parsed creation datetime
+_memo = {}
 
 
 def _set_configured(value):
@@ -136,16 +155,19 @@ def _check_config():
     global DEFAULT_STORAGE_HANDLER
     global ENABLED
     global NAMESPACE_SCOPE
+    global SERVER_FINGERPRINT
     global SHARE_DEFAULT_TIMEOUT
     global DEFAULT_CALL_RETRIES
     if not _configured and setting_is_set('shared_function'):
         DEFAULT_STORAGE_HANDLER = settings.shared_function.storage
         ENABLED = settings.shared_function.enabled
         NAMESPACE_SCOPE = settings.shared_function.scope
+        SERVER_FINGERPRINT = settings.shared_function.server_fingerprint
         SHARE_DEFAULT_TIMEOUT = settings.shared_function.share_timeout
         DEFAULT_CALL_RETRIES = settings.shared_function.call_retries
         file_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
         redis_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
+        sqlite_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
         redis_storage.REDIS_HOST = settings.shared_function.redis_host
         redis_storage.REDIS_PORT = settings.shared_function.redis_port
         redis_storage.REDIS_DB = settings.shared_function.redis_db
@@ -169,6 +191,75 @@ def set_default_scope(value):
     NAMESPACE_SCOPE = value
 
 
+def clear_memo():
+    """Forget the shared values already read by this process"""
+    _memo.clear()
+
+
+def _get_server_fingerprint():
+    """Return an md5 hexdigest identifying the installation of the configured Satellite
+
+    It is computed once per process out of the server certificate, the Satellite version and the
+    installation UUID, so that the values shared for a Satellite are not used once it is
+    provisioned again. If it cannot be computed, the shared functions are disabled and an empty
+    string is returned.
+    """
+    global _SERVER_FINGERPRINT
+    if _SERVER_FINGERPRINT is None:
+        # robottelo.hosts imports the whole cli and api helpers, only needed here
+        from robottelo.hosts import get_sat_version
+
+        try:
+            certificate = ssl.get_server_certificate(
+                (settings.server.hostname, settings.server.port or 443),
+                timeout=_SERVER_FINGERPRINT_TIMEOUT,
+            )
+            response = requests.get(
+                f'{get_url()}/api/settings/instance_id',
+                auth=get_credentials(),
+                verify=settings.server.verify_ca,
+                timeout=_SERVER_FINGERPRINT_TIMEOUT,
+            )
+            response.raise_for_status()
+            identity = f'{certificate}{get_sat_version()}{response.json()["value"]}'
+            _SERVER_FINGERPRINT = hashlib.md5(identity.encode()).hexdigest()
+        except Exception as err:
+            logger.warning(
+                f'shared functions are disabled, the server fingerprint cannot be computed: {err}'
+            )
+            enable_shared_function(False)
+            _SERVER_FINGERPRINT = ''
+    return _SERVER_FINGERPRINT
+
+
+def entities_exist(**entity_names):
+    """Return a validator of the shared results checking that their entities still exist
+
+    Usage::
+
+        @shared(validate=entities_exist(org='Organization', repo='Repository'))
+        def shared_org_with_repo():
+            ...
+            return dict(org=org.id, repo=repo.to_json_dict())
+
+    :param entity_names: the nailgun entity names by result key, the entities of the results are
+        ids or json dicts
+    """
+
+    def validate(result):
+        for key, entity_name in entity_names.items():
+            entity_id = result[key]
+            if isinstance(entity_id, dict):
+                entity_id = entity_id['id']
+            response = getattr(entities, entity_name)(id=entity_id).read_raw()
+            if response.status_code != 200:
+                logger.info(f'shared {entity_name} {entity_id} does not exist anymore')
+                return False
+        return True
+
+    return validate
+
+
 def _get_default_scope():
     """Return the shared function default scope"""
 
@@ -213,6 +304,7 @@ class _SharedFunction:
         timeout=SHARE_DEFAULT_TIMEOUT,
         inject=False,
         injected_kw='_inject',
+        validate=None,
     ):
         if storage_handler is None:
             storage_handler = _get_default_storage_handler()
@@ -235,6 +327,7 @@ class _SharedFunction:
         self._max_retries = retries
         self._transaction = uuid.uuid4().hex
         self._share_timeout = timeout
+        self._validate = validate
 
     @property
     def storage(self):
@@ -287,69 +380,122 @@ class _SharedFunction:
         expire_datetime = creation_datetime + datetime.timedelta(seconds=self._share_timeout)
         return datetime.datetime.utcnow() >= expire_datetime
 
-    def __call__(self):
-        # this lock prevent any other process to run the function,
-        # and if an other process is running the function, I should wait it
-        # to finish
-        # note: when results are ready this lock has a very short time
-        with self.storage.lock(self.key) as data:
-            self.storage.when_lock_acquired(data)
-            # first must investigate, call the function or use the results
-            result = None
-            error = None
-            traceback_text = ''
-            error_class_name = None
-            exp = None
-            pid = None
-            value = self.storage.get(self.key)
-            if value is None:
-                call_function = True
-            else:
-                state = value['state']
-                result = value['result']
-                error = value['error']
-                traceback_text = value.get('traceback', '')
-                error_class_name = value.get('error_class_name')
-                pid = value['pid']
-                creation_datetime = datetime.datetime.strptime(
-                    value['creation_datetime'], _DATETIME_FORMAT
-                )
-
-                if state in [_STATE_READY, _STATE_FAILED] and not self._has_result_expired(
-                    creation_datetime
-                ):
-                    call_function = False
-                else:
-                    call_function = True
+    def _is_running(self, value):
+        """Whether the value is the marker of a process still running the function"""
+        if value is None or value['state'] != _STATE_RUNNING:
+            return False
+        if value.get('hostname') != socket.gethostname():
+            return True
+        # a marker of this process was left by a call that did not end, e.g. interrupted
+        return value['pid'] != os.getpid() and is_process_alive(value['pid'])
+
+    def _is_usable(self, value):
+        """Whether the value holds a result or an error that has not expired"""
+        return (
+            value is not None
+            and value['state'] in [_STATE_READY, _STATE_FAILED]
+            and not self._has_result_expired(
+                datetime.datetime.strptime(value['creation_datetime'], _DATETIME_FORMAT)
+            )
+        )
+
+    def _is_valid(self, value):
+        """Whether the stored result is still valid, as checked by the validate callable"""
+        if self._validate is None or value['state'] != _STATE_READY:
+            return True
+        try:
+            return bool(self._validate(value['result']))
+        except Exception as err:
+            logger.warning(f'not able to validate the shared function {self.key} result: {err}')
+            return False
+
+    def _get_stored_value(self):
+        """Return the usable stored value without locking the storage, None if there is none
+
+        If an other process is running the function, wait to be notified of its result.
+        """
+        if self.key in _memo:
+            creation_datetime, value = _memo[self.key]
+            if not self._has_result_expired(creation_datetime):
+                return copy.deepcopy(value)
+            del _memo[self.key]
+        value = self.storage.get(self.key)
+        if self._is_running(value):
+            value = self.storage.wait(self.key, until=lambda value: not self._is_running(value))
+        return value if self._is_usable(value) and self._is_valid(value) else None
 
-            if call_function is True:
-                result, exp, traceback_text = self._call_function()
-                creation_datetime = datetime.datetime.utcnow().strftime(_DATETIME_FORMAT)
-                if exp:
-                    error = str(exp) or 'error occurred'
-                    error_class_name = f'{exp.__class__.__module__}.{exp.__class__.__name__}'
-                    value = dict(
-                        state=_STATE_FAILED,
-                        id=self.transaction,
-                        result=None,
-                        error=error,
-                        error_class_name=error_class_name,
-                        traceback=traceback_text,
-                        pid=os.getpid(),
-                        creation_datetime=creation_datetime,
-                    )
-                else:
-                    error = None
-                    result = self._encode_result_kwargs(result)
-                    value = dict(
-                        state=_STATE_READY,
-                        id=self.transaction,
-                        result=result,
-                        error=error,
-                        pid=os.getpid(),
-                        creation_datetime=creation_datetime,
+    def __call__(self):
+        # the processes calling after the result is stored only read it, and the ones calling
+        # while an other process is running the function wait to be notified of its result
+        value = self._get_stored_value()
+        call_function = False
+        exp = None
+        if value is None:
+            # this lock prevent any other process to run the function,
+            # and if an other process is running the function, I should wait it
+            # to finish
+            with self.storage.lock(self.key) as data:
+                self.storage.when_lock_acquired(data)
+                # first must investigate, call the function or use the results
+                value = self.storage.get(self.key)
+                call_function = not (self._is_usable(value) and self._is_valid(value))
+                if call_function is True:
+                    self.storage.set(
+                        self.key,
+                        dict(
+                            state=_STATE_RUNNING,
+                            id=self.transaction,
+                            result=None,
+                            error=None,
+                            pid=os.getpid(),
+                            hostname=socket.gethostname(),
+                            creation_datetime=datetime.datetime.utcnow().strftime(_DATETIME_FORMAT),
+                        ),
                     )
-                self.storage.set(self.key, value)
+                    try:
+                        result, exp, traceback_text = self._call_function()
+                    except BaseException:
+                        # skipped, failed by pytest or interrupted: there is no result to share,
+                        # restore the former value so that the next caller runs the function
+                        self.storage.set(self.key, value)
+                        raise
+                    creation_datetime = datetime.datetime.utcnow().strftime(_DATETIME_FORMAT)
+                    if exp:
+                        error = str(exp) or 'error occurred'
+                        error_class_name = f'{exp.__class__.__module__}.{exp.__class__.__name__}'
+                        value = dict(
+                            state=_STATE_FAILED,
+                            id=self.transaction,
+                            result=None,
+                            error=error,
+                            error_class_name=error_class_name,
+                            traceback=traceback_text,
+                            pid=os.getpid(),
+                            creation_datetime=creation_datetime,
+                        )
+                    else:
+                        result = self._encode_result_kwargs(result)
+                        value = dict(
+                            state=_STATE_READY,
+                            id=self.transaction,
+                            result=result,
+                            error=None,
+                            pid=os.getpid(),
+                            creation_datetime=creation_datetime,
+                        )
+                    self.storage.set(self.key, value)
+
+        if value['state'] == _STATE_READY and self.key not in _memo:
+            creation_datetime = datetime.datetime.strptime(
+                value['creation_datetime'], _DATETIME_FORMAT
+            )
+            _memo[self.key] = (creation_datetime, copy.deepcopy(value))
+
+        result = value['result']
+        error = value['error']
+        traceback_text = value.get('traceback', '')
+        error_class_name = value.get('error_class_name')
+        pid = value['pid']
 
         if call_function and exp:
             # i'am in the first launched process
@@ -427,6 +573,11 @@ def _get_scope_name(scope=None, scope_kwargs=None, scope_context=None):
     if scope_name:
         scope_names.append(scope_name)
 
+    if SERVER_FINGERPRINT:
+        if not (fingerprint := _get_server_fingerprint()):
+            raise SharedFunctionError('the server fingerprint cannot be computed')
+        scope_names.append(fingerprint)
+
     scope_names.append(_NAMESPACE_SCOPE_KEY_TYPE)
 
     if scope_context:
@@ -473,6 +624,7 @@ def shared(
     function_kw=None,
     inject=False,
     injected_kw='_injected',
+    validate=None,
 ):
     r"""Generic function sharing, share the results of any decorated function.
     Any parallel pytest xdist worker will wait for this function to finish
@@ -486,6 +638,7 @@ def shared(
     :type function_kw: list
     :type inject: bool
     :type injected_kw: str
+    :type validate: callable
 
     :param function_: the function that is intended to be shared
     :param scope: this parameter will define the namespace of data sharing
@@ -503,6 +656,8 @@ def shared(
         \**kwargs
     :param injected_kw: the kw arg to set to True to inform the function that
         the kwargs was injected from a saved storage
+    :param validate: called with a stored result before using it for the first time in a process,
+        the function is called again if it returns False, see :func:`entities_exist`
     """
     _check_config()
     class_names = []
@@ -525,6 +680,9 @@ def shared(
             function_name = _get_function_name(
                 func, class_name=class_name, kwargs=function_kw_scope
             )
+            if ENABLED and SERVER_FINGERPRINT:
+                # disables the shared functions if the server cannot be fingerprinted
+                _get_server_fingerprint()
             if not ENABLED:
                 # if disabled call the function immediately
                 return func(*args, **kwargs)
@@ -541,6 +699,7 @@ def shared(
                 retries=retries,
                 inject=inject,
                 injected_kw=injected_kw,
+                validate=validate,
             )
 
             return shared_object()
@@ -0,0 +1,190 @@
+"""SQLite key value storage handler
+
+All the keys are stored in a single database in WAL mode, the values with their state and
+creation datetime, so that expired values can be collected with an index, and the locks as rows
+owned by a process, so that the locks of the terminated processes are taken over.
+"""
+
+import contextlib
+import datetime
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from robottelo.utils.decorators.func_shared.base import (
+    POLL_INTERVAL,
+    BaseStorageHandler,
+    is_process_alive,
+)
+from robottelo.utils.decorators.func_shared.file_storage import _get_root_dir
+
+DATABASE_NAME = 'shared_functions.sqlite'
+LOCK_TIMEOUT = 7200
+# seconds a connection waits for an other one to commit before failing
+BUSY_TIMEOUT = 60
+
+_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shared_values (
+    key TEXT PRIMARY KEY,
+    state TEXT,
+    creation_datetime TEXT,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS shared_values_creation_datetime
+    ON shared_values (creation_datetime);
+CREATE TABLE IF NOT EXISTS shared_locks (
+    key TEXT PRIMARY KEY,
+    pid INTEGER NOT NULL,
+    token TEXT NOT NULL
+);
+"""
+
+# a handler is created for each shared function call, the connections are kept by database,
+# process and thread
+_connections = {}
+
+
+def _get_connection(database):
+    connection_key = (database, os.getpid(), threading.get_ident())
+    if connection_key not in _connections:
+        connection = sqlite3.connect(
+            database, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+        )
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.executescript(_SCHEMA)
+        _connections[connection_key] = connection
+    return _connections[connection_key]
+
+
+class SQLiteStorageHandler(BaseStorageHandler):
+    """SQLite key value storage handler"""
+
+    def __init__(self, database=None, lock_timeout=None):
+        if database is None:
+            database = os.path.join(_get_root_dir(), DATABASE_NAME)
+        if lock_timeout is None:
+            lock_timeout = LOCK_TIMEOUT
+
+        self._lock_timeout = lock_timeout
+        self._database = database
+        self._connection = _get_connection(database)
+
+    @property
+    def database(self):
+        return self._database
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Run the statements in a transaction holding the database write lock"""
+        self._connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield self._connection
+        except BaseException:
+            self._connection.execute('ROLLBACK')
+            raise
+        self._connection.execute('COMMIT')
+
+    def _acquire(self, key, token):
+        with self._transaction() as connection:
+            row = connection.execute(
+                'SELECT pid FROM shared_locks WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None and is_process_alive(row[0]):
+                return False
+            connection.execute(
+                'INSERT OR REPLACE INTO shared_locks (key, pid, token) VALUES (?, ?, ?)',
+                (key, os.getpid(), token),
+            )
+        return True
+
+    @contextlib.contextmanager
+    def lock(self, key, timeout=None):
+        """Return the storage locker context manager
+
+        The lock of a terminated process is taken over.
+
+        :raises TimeoutError: if the lock is not acquired in time
+        """
+        if timeout is None:
+            timeout = self._lock_timeout
+
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        while not self._acquire(key, token):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f'Not able to acquire the lock of {key} in {timeout} seconds')
+            time.sleep(POLL_INTERVAL)
+        try:
+            yield token
+        finally:
+            self._connection.execute(
+                'DELETE FROM shared_locks WHERE key = ? AND token = ?', (key, token)
+            )
+
+    def when_lock_acquired(self, token):
+        # do nothing, the lock row already holds the process id
+        pass
+
+    def get(self, key):
+        """Return the key value
+
+        :type key: str
+        """
+        row = self._connection.execute(
+            'SELECT value FROM shared_values WHERE key = ?', (key,)
+        ).fetchone()
+        return None if row is None else self.decode(row[0])
+
+    def set(self, key, value):
+        """Write the value of key
+
+        :type key: str
+        :type value: object
+        """
+        state = creation_datetime = None
+        if isinstance(value, dict):
+            state = value.get('state')
+            creation_datetime = value.get('creation_datetime')
+        self._connection.execute(
+            'INSERT OR REPLACE INTO shared_values (key, state, creation_datetime, value) '
+            'VALUES (?, ?, ?, ?)',
+            (key, state, creation_datetime, self.encode(value)),
+        )
+
+    def wait(self, key, until, timeout=None):
+        """Wait, without locking, until the value of key satisfies a condition
+
+        :type key: str
+        :param until: callable receiving the value of key, None if not set
+        :param timeout: the maximum time in seconds to wait, the lock timeout if None
+        :return: the last value read
+        """
+        if timeout is None:
+            timeout = self._lock_timeout
+        return super().wait(key, until, timeout=timeout)
+
+    def collect_garbage(self, max_age):
+        """Delete the values older than max_age and the locks of terminated processes, then
+        vacuum the database
+
+        :param max_age: the age in seconds from which values are deleted
+        :return: the number of deleted values
+        """
+        oldest = datetime.datetime.utcnow() - datetime.timedelta(seconds=max_age)
+        with self._transaction() as connection:
+            deleted = connection.execute(
+                'DELETE FROM shared_values WHERE creation_datetime < ?',
+                (oldest.strftime(_DATETIME_FORMAT),),
+            ).rowcount
+            pids = [row[0] for row in connection.execute('SELECT DISTINCT pid FROM shared_locks')]
+            connection.executemany(
+                'DELETE FROM shared_locks WHERE pid = ?',
+                [(pid,) for pid in pids if not is_process_alive(pid)],
+            )
+        self._connection.execute('VACUUM')
+        return deleted
@@ -196,15 +196,22 @@ def get_data_bz(bz_numbers, cached_data=None):  # pragma: no cover
     if not bz_numbers:
         return []
 
-    cached_by_call = CACHED_RESPONSES['get_data'].get(str(sorted(bz_numbers)))
+    call_key = str(sorted(bz_numbers))
+    cached_by_call = CACHED_RESPONSES['get_data'].get(call_key)
     if cached_by_call:
         return cached_by_call
 
+    cached = []
     if cached_data:
-        logger.debug(f"Using cached data for {set(bz_numbers)}")
-        if not all([f'BZ:{number}' in cached_data for number in bz_numbers]):
-            logger.debug("There are BZs out of cache.")
-        return [item['data'] for _, item in cached_data.items() if 'data' in item]
+        cached_numbers = [
+            number for number in bz_numbers if cached_data.get(f'BZ:{number}', {}).get('data')
+        ]
+        logger.debug(f"Using cached data for {set(cached_numbers)}")
+        cached = [cached_data[f'BZ:{number}']['data'] for number in cached_numbers]
+        bz_numbers = [number for number in bz_numbers if number not in cached_numbers]
+        if not bz_numbers:
+            return cached
+        logger.debug("There are BZs out of cache.")
 
     # Ensure API key is set
     if not settings.bugzilla.api_key:
@@ -214,7 +221,7 @@ def get_data_bz(bz_numbers, cached_data=None):  # pragma: no cover
             "Provide api_key or a bz_cache.json."
         )
         # Provide default data for collected BZs
-        return [get_default_bz(number) for number in bz_numbers]
+        return cached + [get_default_bz(number) for number in bz_numbers]
 
     # No cached data so Call Bugzilla API
     logger.debug(f"Calling Bugzilla API for {set(bz_numbers)}")
@@ -247,8 +254,8 @@ def get_data_bz(bz_numbers, cached_data=None):  # pragma: no cover
         headers={"Authorization": f"Bearer {settings.bugzilla.api_key}"},
     )
     response.raise_for_status()
-    data = response.json().get('bugs')
-    CACHED_RESPONSES['get_data'][str(sorted(bz_numbers))] = data
+    data = cached + response.json().get('bugs')
+    CACHED_RESPONSES['get_data'][call_key] = data
     return data
 
 
@@ -0,0 +1,143 @@
+"""Per issue cache of the issue handlers data
+
+Each issue is cached with the time it was fetched at, and is reused until its time to live,
+which depends on whether the issue is closed, is over. The stale Jira issues are refreshed with a
+single query of the ones updated since they were fetched, so that only the changed issues are
+downloaded again. The cache is written atomically, merged with the issues written by the other
+processes in the meantime.
+"""
+
+from datetime import datetime, timedelta
+import json
+import math
+import os
+import tempfile
+
+from robottelo.config import settings
+from robottelo.constants import CLOSED_STATUSES, JIRA_CLOSED_STATUSES
+from robottelo.logging import logger
+from robottelo.utils.issue_handlers import jira
+from robottelo.utils.version import VersionEncoder, search_version_key
+
+# minutes added to the Jira updated window, in case of clock skew with the Jira server
+JIRA_SYNC_MARGIN = 5
+
+_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+# the fields computed for the current run are not cached
+_COMPUTED_FIELDS = ('is_open', 'is_deselected')
+
+
+def _ttl(issue_key, data):
+    """Return the time to live of an issue according to its handler and status"""
+    if issue_key.startswith('BZ:'):
+        ttl, closed = settings.bugzilla.cache_ttl, data.get('status') in CLOSED_STATUSES
+    else:
+        ttl, closed = settings.jira.cache_ttl, data.get('status') in JIRA_CLOSED_STATUSES
+    return timedelta(seconds=ttl.closed if closed else ttl.open)
+
+
+class IssueCache:
+    """Cache of the issue data indexed by <handler>:<number>, stored in a JSON file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.issues = self._read()
+        self.meta = self.issues.pop('_meta', {})
+
+    def _read(self):
+        try:
+            with open(self.path) as cache_file:
+                return {k: search_version_key(k, v) for k, v in json.load(cache_file).items()}
+        except FileNotFoundError:
+            return {}
+
+    def is_fresh(self, issue_key, now=None):
+        """Return whether the issue is cached and its time to live is not over"""
+        item = self.issues.get(issue_key)
+        if not item or not item.get('data') or 'fetched_at' not in item:
+            # missing or written by the former cache, without fetch time
+            return False
+        fetched_at = datetime.strptime(item['fetched_at'], _DATETIME_FORMAT)
+        return (now or datetime.utcnow()) < fetched_at + _ttl(issue_key, item['data'])
+
+    def refresh_jira(self, issue_keys, now=None):
+        """Refresh the cached stale Jira issues with the ones updated since they were fetched
+
+        The issues Jira does not report as updated are kept, and fetched again at `now`.
+        """
+        now = now or datetime.utcnow()
+        stale_keys = [
+            key
+            for key in issue_keys
+            if key.startswith('SAT-')
+            and 'fetched_at' in self.issues.get(key, {})
+            and not self.is_fresh(key, now)
+        ]
+        if not stale_keys or not settings.jira.api_key:
+            return
+        oldest = min(
+            datetime.strptime(self.issues[key]['fetched_at'], _DATETIME_FORMAT)
+            for key in stale_keys
+        )
+        minutes = math.ceil((now - oldest).total_seconds() / 60) + JIRA_SYNC_MARGIN
+        logger.debug(f'Refreshing the Jira issues updated in the last {minutes} minutes')
+        updated = {
+            data['key']: data
+            for data in jira.get_data_jira(stale_keys, updated_since=f'-{minutes}m')
+        }
+        for key in stale_keys:
+            if key in updated:
+                self.issues[key]['data'] = updated[key]
+            self.issues[key]['fetched_at'] = now.strftime(_DATETIME_FORMAT)
+
+    def get_cached_data(self, issue_keys, now=None):
+        """Return the fresh cached issues, as used by the handlers `cached_data`
+
+        The duplicates and clones of the collected issues are returned too.
+
+        :param issue_keys: the keys of the collected issues, the stale Jira ones are refreshed
+        """
+        now = now or datetime.utcnow()
+        self.refresh_jira(issue_keys, now)
+        cached_data = {}
+        for key, item in self.issues.items():
+            if self.is_fresh(key, now):
+                cached_data[key] = {**item, 'data': dict(item['data'])}
+        return cached_data
+
+    def update(self, collected_data, cached_data, meta=None, now=None):
+        """Cache the issues of the collected data, the ones of cached_data keep their fetch time
+
+        The issues with an error, i.e. the default data used when an API is not reachable, are
+        not cached.
+        """
+        fetched_at = (now or datetime.utcnow()).strftime(_DATETIME_FORMAT)
+        for key, item in collected_data.items():
+            data = item.get('data')
+            if key == '_meta' or not data or data.get('error'):
+                continue
+            self.issues[key] = {
+                **item,
+                'data': {k: v for k, v in data.items() if k not in _COMPUTED_FIELDS},
+                'fetched_at': cached_data.get(key, {}).get('fetched_at', fetched_at),
+            }
+        if meta:
+            self.meta.update(meta)
+
+    def save(self):
+        """Write the cache atomically, merged with the issues cached by other processes
+
+        The most recently fetched data of an issue is kept.
+        """
+        issues = self._read()
+        issues.pop('_meta', None)
+        for key, item in self.issues.items():
+            if item.get('fetched_at', '') >= issues.get(key, {}).get('fetched_at', ''):
+                issues[key] = item
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile(
+            'w', dir=directory, prefix=f'.{os.path.basename(self.path)}.', delete=False
+        ) as cache_file:
+            json.dump({'_meta': self.meta, **issues}, cache_file, indent=4, cls=VersionEncoder)
+        os.replace(cache_file.name, self.path)
+        self.issues = issues
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import re
 
 from packaging.version import Version
@@ -22,15 +23,30 @@ VERSION_RE = re.compile(r'(?:sat-)*?(?P<version>\d\.\d)\.\w*')
 
 common_jira_fields = ['key', 'summary', 'status', 'labels', 'resolution', 'fixVersions']
 
+
+def _field(*path, transform=None):
+    """Return an extractor of the value at path in a Jira issue, optionally transformed"""
+
+    def extract(issue):
+        value = issue
+        for key in path:
+            value = value[key]
+        return value if transform is None else transform(value)
+
+    return extract
+
+
 mapped_response_fields = {
-    'key': "{obj_name}['key']",
-    'summary': "{obj_name}['fields']['summary']",
-    'status': "{obj_name}['fields']['status']['name']",
-    'labels': "{obj_name}['fields']['labels']",
-    'resolution': "{obj_name}['fields']['resolution']['name'] if {obj_name}['fields']['resolution'] else ''",
-    'fixVersions': "[ver['name'] for ver in {obj_name}['fields']['fixVersions']] if {obj_name}['fields']['fixVersions'] else []",
+    'key': _field('key'),
+    'summary': _field('fields', 'summary'),
+    'status': _field('fields', 'status', 'name'),
+    'labels': _field('fields', 'labels'),
+    'resolution': _field('fields', 'resolution', transform=lambda res: res['name'] if res else ''),
+    'fixVersions': _field(
+        'fields', 'fixVersions', transform=lambda vers: [ver['name'] for ver in vers or []]
+    ),
     # Custom Field - SFDC Cases Counter
-    'customfield_12313440': "{obj_name}['fields']['customfield_12313440']",
+    'customfield_12313440': _field('fields', 'customfield_12313440'),
 }
 
 
@@ -41,9 +57,7 @@ def sanitized_issue_data(issue, out_fields):
         issue {dict} -- The json data for a jira issue
         out_fields {list} -- The list of fields for which data to be retrieved from jira issue
     """
-    return {
-        field: eval(mapped_response_fields[field].format(obj_name=issue)) for field in out_fields
-    }
+    return {field: mapped_response_fields[field](issue) for field in out_fields}
 
 
 def is_open_jira(issue_id, data=None):
@@ -160,27 +174,32 @@ def collect_data_jira(collected_data, cached_data):  # pragma: no cover
         )
         or []
     )
+    # If Jira is CLOSED/DUPLICATE collect the duplicate
+    collect_dupes(jira_data, collected_data, cached_data=cached_data)
     for data in jira_data:
-        # If Jira is CLOSED/DUPLICATE collect the duplicate
-        collect_dupes(data, collected_data, cached_data=cached_data)
-
         jira_key = f"{data['key']}"
         data["is_open"] = is_open_jira(jira_key, data)
         collected_data[jira_key]['data'] = data
 
 
-def collect_dupes(jira, collected_data, cached_data=None):  # pragma: no cover
-    """Recursively find for duplicates"""
+def collect_dupes(jiras, collected_data, cached_data=None):  # pragma: no cover
+    """Find the duplicates breadth-first, fetching each level of duplicates in a single batch"""
     cached_data = cached_data or {}
-    if jira.get('resolution') == 'Duplicate':
-        # Collect duplicates
-        jira['dupe_data'] = get_single_jira(jira.get('dupe_of'), cached_data=cached_data)
-        dupe_key = f"{jira['dupe_of']}"
-        # Store Duplicate also in the main collection for caching
-        if dupe_key not in collected_data:
-            collected_data[dupe_key]['data'] = jira['dupe_data']
-            collected_data[dupe_key]['is_dupe'] = True
-            collect_dupes(jira['dupe_data'], collected_data, cached_data)
+    jiras = [jira for jira in jiras if jira.get('resolution') == 'Duplicate']
+    while jiras:
+        prefetch_jiras({jira.get('dupe_of') for jira in jiras}, cached_data=cached_data)
+        next_jiras = []
+        for jira in jiras:
+            # Collect duplicates
+            jira['dupe_data'] = get_single_jira(jira.get('dupe_of'), cached_data=cached_data)
+            dupe_key = f"{jira['dupe_of']}"
+            # Store Duplicate also in the main collection for caching
+            if dupe_key not in collected_data:
+                collected_data[dupe_key]['data'] = jira['dupe_data']
+                collected_data[dupe_key]['is_dupe'] = True
+                if jira['dupe_data'].get('resolution') == 'Duplicate':
+                    next_jiras.append(jira['dupe_data'])
+        jiras = next_jiras
 
 
 # --- API Calls ---
@@ -193,34 +212,59 @@ CACHED_RESPONSES = defaultdict(dict)
     stop=stop_after_attempt(4),  # Retry 3 times before raising
     wait=wait_fixed(20),  # Wait seconds between retries
 )
-def get_jira(jql, fields=None):
+def get_jira(jql, fields=None, start_at=0, max_results=None):
     """Accepts the jql to retrieve the data from Jira for the given fields
 
     Arguments:
         jql {str} -- The query for retrieving the issue(s) details from jira
         fields {list} -- The custom fields in query to retrieve the data for
+        start_at {int} -- The index of the first issue of the page to retrieve
+        max_results {int} -- The maximum number of issues of the page, Jira default if None
 
     Returns: Jira object of response after status check
     """
-    params = {"jql": jql}
+    # the search is posted so that the url length does not depend on the query
+    payload = {"jql": jql, "startAt": start_at}
     if fields:
-        params.update({"fields": ",".join(fields)})
-    response = requests.get(
-        f"{settings.jira.url}/rest/api/latest/search/",
-        params=params,
+        payload["fields"] = list(fields)
+    if max_results:
+        payload["maxResults"] = max_results
+    response = requests.post(
+        f"{settings.jira.url}/rest/api/latest/search",
+        json=payload,
         headers={"Authorization": f"Bearer {settings.jira.api_key}"},
     )
     response.raise_for_status()
     return response
 
 
-def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no cover
+def search_jira(jql, fields=None, page_size=None):
+    """Return all the issues matching the jql, following the pages of the search
+
+    Arguments:
+        jql {str} -- The query for retrieving the issue(s) details from jira
+        fields {list} -- The custom fields in query to retrieve the data for
+        page_size {int} -- The maximum number of issues by page, Jira default if None
+    """
+    issues = []
+    while True:
+        page = get_jira(jql, fields, start_at=len(issues), max_results=page_size).json()
+        page_issues = page.get('issues') or []
+        issues.extend(page_issues)
+        if not page_issues or len(issues) >= page.get('total', 0):
+            return issues
+
+
+def get_data_jira(
+    issue_ids, cached_data=None, jira_fields=None, updated_since=None
+):  # pragma: no cover
     """Get a list of marked Jira data and query Jira REST API.
 
     Arguments:
         issue_ids {list of str} -- ['SAT-12345', ...]
         cached_data {dict} -- Cached data previous loaded from API
         jira_fields {list of str} -- List of fields to be retrieved by a jira issue GET request
+        updated_since {str} -- Only retrieve the issues updated since then, e.g: -90m
 
     Returns:
         [list of dicts] -- [{'id':..., 'status':..., 'resolution': ...}]
@@ -231,15 +275,24 @@ def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no
     if not issue_ids:
         return []
 
-    cached_by_call = CACHED_RESPONSES['get_data'].get(str(sorted(issue_ids)))
+    if isinstance(issue_ids, str):
+        issue_ids = [issue_id.strip() for issue_id in issue_ids.split(',')]
+    call_key = str(sorted(issue_ids))
+    cached_by_call = None if updated_since else CACHED_RESPONSES['get_data'].get(call_key)
     if cached_by_call:
         return cached_by_call
 
+    cached = []
     if cached_data:
-        logger.debug(f"Using cached data for {set(issue_ids)}")
-        if not all([f'{number}' in cached_data for number in issue_ids]):
-            logger.debug("There are Jira's out of cache.")
-        return [item['data'] for _, item in cached_data.items() if 'data' in item]
+        cached_ids = [
+            issue_id for issue_id in issue_ids if cached_data.get(f'{issue_id}', {}).get('data')
+        ]
+        logger.debug(f"Using cached data for {set(cached_ids)}")
+        cached = [cached_data[f'{issue_id}']['data'] for issue_id in cached_ids]
+        issue_ids = [issue_id for issue_id in issue_ids if issue_id not in cached_ids]
+        if not issue_ids:
+            return cached
+        logger.debug("There are Jira's out of cache.")
 
     # Ensure API key is set
     if not settings.jira.api_key:
@@ -249,7 +302,7 @@ def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no
             "Provide api_key or a jira_cache.json."
         )
         # Provide default data for collected Jira's.
-        return [get_default_jira(issue_id) for issue_id in issue_ids]
+        return cached + [get_default_jira(issue_id) for issue_id in issue_ids]
 
     # No cached data so Call Jira API
     logger.debug(f"Calling Jira API for {set(issue_ids)}")
@@ -257,15 +310,25 @@ def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no
     for field in ('is_open', 'version'):
         assert field not in jira_fields
 
-    # Generate jql
-    if isinstance(issue_ids, str):
-        issue_ids = [issue_id.strip() for issue_id in issue_ids.split(',')]
-    jql = ' OR '.join([f"id = {issue_id}" for issue_id in issue_ids])
-    response = get_jira(jql, jira_fields)
-    data = response.json().get('issues')
+    # Generate a jql by chunk of issues, the chunks are searched concurrently
+    batch_size = settings.jira.batch_size
+    jqls = [
+        ' OR '.join([f"id = {issue_id}" for issue_id in issue_ids[index : index + batch_size]])
+        for index in range(0, len(issue_ids), batch_size)
+    ]
+    if updated_since:
+        jqls = [f"({jql}) AND updated >= {updated_since}" for jql in jqls]
+    with ThreadPoolExecutor(
+        max_workers=min(settings.jira.max_workers, len(jqls)), thread_name_prefix='jira-search'
+    ) as executor:
+        pages = executor.map(lambda jql: search_jira(jql, jira_fields, page_size=batch_size), jqls)
+        data = [issue for page in pages for issue in page]
     # Clean the data, only keep the required info.
-    data = [sanitized_issue_data(issue, jira_fields) for issue in data if issue is not None]
-    CACHED_RESPONSES['get_data'][str(sorted(issue_ids))] = data
+    data = cached + [
+        sanitized_issue_data(issue, jira_fields) for issue in data if issue is not None
+    ]
+    if not updated_since:
+        CACHED_RESPONSES['get_data'][call_key] = data
     return data
 
 
@@ -283,6 +346,24 @@ def get_single_jira(issue_id, cached_data=None):  # pragma: no cover
     return jira_data or get_default_jira(issue_id)
 
 
+def prefetch_jiras(issue_ids, cached_data=None):  # pragma: no cover
+    """Fetch in a single batch the Jiras get_single_jira would call Jira API for"""
+    cached_data = cached_data or {}
+    missing_ids = sorted(
+        str(issue_id)
+        for issue_id in issue_ids
+        if not CACHED_RESPONSES['get_single'].get(issue_id)
+        and 'data' not in cached_data.get(f"{issue_id}", {})
+    )
+    if not missing_ids:
+        return
+    fetched = {jira['key']: jira for jira in get_data_jira(missing_ids)}
+    for issue_id in missing_ids:
+        CACHED_RESPONSES['get_single'][issue_id] = fetched.get(issue_id) or get_default_jira(
+            issue_id
+        )
+
+
 def get_default_jira(issue_id):  # pragma: no cover
     """This is the default Jira data when it is not possible to reach Jira api"""
     return {
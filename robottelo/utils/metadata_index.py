@@ -0,0 +1,201 @@
+# Index of the testimony tokens and issue workarounds found in the test modules
+import hashlib
+import inspect
+import json
+import os
+import re
+import tempfile
+
+from robottelo.config import robottelo_tmp_dir
+from robottelo.logging import collection_logger as logger
+
+INDEX_FILE_NAME = 'metadata_index.json'
+# bump when the parsed data changes, so that the stale indexes are ignored
+INDEX_VERSION = 1
+
+MODULE_QUALNAME = '<module>'
+
+COMPONENT = re.compile(
+    # To match :CaseComponent: FooBar
+    r'\s*:CaseComponent:\s*(?P<component>\S*)',
+    re.IGNORECASE,
+)
+
+IMPORTANCE = re.compile(
+    # To match :CaseImportance: Critical
+    r'\s*:CaseImportance:\s*(?P<importance>\S*)',
+    re.IGNORECASE,
+)
+
+TEAM = re.compile(
+    # To match :Team: Rocket
+    r'\s*:Team:\s*(?P<team>\S*)',
+    re.IGNORECASE,
+)
+
+BLOCKED_BY = re.compile(
+    # To match :BlockedBy: SAT-32932
+    r'\s*:BlockedBy:\s*(?P<blocked_by>.*\S*)',
+    re.IGNORECASE,
+)
+
+VERIFIES = re.compile(
+    # To match :Verifies: SAT-32932
+    r'\s*:Verifies:\s*(?P<verifies>.*\S*)',
+    re.IGNORECASE,
+)
+
+BZ = re.compile(
+    # To match :BZ: 123456, 456789
+    r'\s*:BZ:\s*(?P<bz>.*\S*)',
+    re.IGNORECASE,
+)
+
+IS_OPEN = re.compile(
+    # To match `if is_open('BZ:123456'):`
+    r"\s*if\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"
+)
+
+NOT_IS_OPEN = re.compile(
+    # To match `if not is_open('BZ:123456'):`
+    r"\s*if\snot\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"
+)
+
+
+def _first(regex, text):
+    matches = regex.findall(text)
+    return matches[0] if matches else None
+
+
+def _last_list(regex, text):
+    matches = regex.findall(text)
+    return [str(match.strip()) for match in matches[-1].split(',')] if matches else None
+
+
+def parse_docstring(docstring):
+    """Return the testimony tokens of a docstring
+
+    The single value tokens keep their first match, the list tokens their last one.
+    """
+    if docstring is None:
+        return None
+    return {
+        'component': _first(COMPONENT, docstring),
+        'importance': _first(IMPORTANCE, docstring),
+        'team': _first(TEAM, docstring),
+        'verifies': _last_list(VERIFIES, docstring),
+        'blocked_by': _last_list(BLOCKED_BY, docstring),
+        'bz': _last_list(BZ, docstring),
+    }
+
+
+def parse_source(source):
+    """Return the `is_open` workarounds and the first component token of a source"""
+    return {
+        'component': _first(COMPONENT, source),
+        'is_open': [list(match) for match in IS_OPEN.findall(source)],
+        'not_is_open': [list(match) for match in NOT_IS_OPEN.findall(source)],
+    }
+
+
+def _hash_file(path):
+    with open(path, 'rb') as source_file:
+        return hashlib.sha1(source_file.read()).hexdigest()
+
+
+class MetadataIndex:
+    """Docstring tokens and source workarounds of the test objects, persisted by file
+
+    Each file entry is identified by the file path and checked against the file mtime and,
+    when the mtime changed, the file content hash, so that repeated collections of unchanged
+    modules neither parse the docstrings nor read the sources again. A file is checked once per
+    process, and its objects are looked up by qualified name.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._files = {}
+        self._checked = set()
+        self._modified = False
+        if path is not None:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as index_file:
+                data = json.load(index_file)
+        except FileNotFoundError:
+            return
+        except ValueError:
+            logger.warning(f'Ignoring the corrupted metadata index {self.path}')
+            return
+        if data.get('version') == INDEX_VERSION:
+            self._files = data['files']
+
+    def save(self):
+        """Write the index atomically, if anything was parsed since it was loaded"""
+        if self.path is None or not self._modified:
+            return
+        directory = os.path.dirname(self.path) or '.'
+        with tempfile.NamedTemporaryFile(
+            'w', dir=directory, prefix=f'.{INDEX_FILE_NAME}.', delete=False
+        ) as index_file:
+            json.dump({'version': INDEX_VERSION, 'files': self._files}, index_file)
+        os.replace(index_file.name, self.path)
+        self._modified = False
+
+    def _file_objects(self, path):
+        """Return the objects of a file entry, reset if the file changed"""
+        entry = self._files.get(path)
+        if path not in self._checked:
+            self._checked.add(path)
+            stat = os.stat(path)
+            if entry is None or entry['mtime'] != stat.st_mtime or entry['size'] != stat.st_size:
+                sha1 = _hash_file(path)
+                if entry is None or entry['sha1'] != sha1:
+                    entry = {'objects': {}}
+                entry.update(mtime=stat.st_mtime, size=stat.st_size, sha1=sha1)
+                self._files[path] = entry
+                self._modified = True
+        return entry['objects']
+
+    def _lookup(self, obj, kind, parse):
+        unwrapped = inspect.unwrap(obj)
+        try:
+            path = os.path.abspath(inspect.getfile(unwrapped))
+        except TypeError:
+            # built-in objects do not come from a file, do not index them
+            return parse(obj)
+        qualname = MODULE_QUALNAME if inspect.ismodule(unwrapped) else unwrapped.__qualname__
+        entry = self._file_objects(path).setdefault(qualname, {})
+        if kind not in entry:
+            entry[kind] = parse(obj)
+            self._modified = True
+        return entry[kind]
+
+    def docstring_tokens(self, obj):
+        """Return the testimony tokens of the obj docstring, None if it has no docstring
+
+        :param obj: a test module, class or function, or None
+        """
+        if obj is None:
+            return None
+        return self._lookup(obj, 'doc', lambda target: parse_docstring(inspect.getdoc(target)))
+
+    def source_workarounds(self, obj):
+        """Return the `is_open` workarounds and the first component token of the obj source
+
+        :param obj: a test module or function
+        """
+        return self._lookup(obj, 'source', lambda target: parse_source(inspect.getsource(target)))
+
+
+_index = None
+
+
+def get_metadata_index():
+    """Return the index of the process, loaded from the robottelo tmp dir"""
+    global _index
+    if _index is None:
+        _index = MetadataIndex(os.path.join(robottelo_tmp_dir, INDEX_FILE_NAME))
+    return _index
@@ -23,16 +23,33 @@ Example:
 """
 
 import json
+import os
 from pathlib import Path
 import time
 from uuid import uuid4
 
-from broker.helpers import FileLock
+from pytest_services.locks import file_lock
+
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+# seconds to wait for the lock of the resource file
+LOCK_TIMEOUT = 60
+# the waits between two reads of the resource file grow exponentially between these, in seconds
+MIN_WAIT_INTERVAL = 0.01
+MAX_WAIT_INTERVAL = 5
 
 
 class SharedResource:
     """A class representing a shared resource.
 
+    The resource file is an append-only log, each line being a json entry: a watcher registering,
+    a watcher status or a main status update. Each instance reads only the entries appended since
+    its last read, and is woken up by inotify when an entry is appended (if inotify_simple is
+    installed, else the file is polled with an exponential backoff).
+
     Attributes:
         action (function): The function to be executed when the resource is ready.
         action_args (tuple): The arguments to be passed to the action function.
@@ -54,13 +71,82 @@ class SharedResource:
             action_kwargs (dict): The keyword arguments to be passed to the action function.
         """
         self.resource_file = Path(f"/tmp/{resource_name}.shared")
-        self.lock_file = FileLock(self.resource_file)
+        self.lock_file = Path(f"{self.resource_file}.lock")
         self.id = str(uuid4().fields[-1])
         self.action = action
         self.action_is_recoverable = action_kwargs.pop("action_is_recoverable", False)
         self.action_args = action_args
         self.action_kwargs = action_kwargs
         self.is_recovering = False
+        self._state = None
+        self._offset = 0
+        self._inotify = None
+
+    def _lock(self):
+        """Returns the context manager locking the resource file."""
+        return file_lock(str(self.lock_file), remove=False, timeout=LOCK_TIMEOUT)
+
+    def _append(self, **entry):
+        """Appends an entry to the resource file.
+
+        The entry is written with a single write to the file opened in append mode, so the
+        concurrent entries are never interleaved.
+
+        Args:
+            entry (dict): The entry to append.
+        """
+        line = f"{json.dumps(entry)}\n".encode()
+        fd = os.open(self.resource_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def _read_state(self):
+        """Reads the entries appended since the last read and returns the resulting state.
+
+        Returns:
+            dict: The watchers, their statuses, the main watcher and the main status.
+        """
+        if self._state is None:
+            self._state = {
+                "watchers": [],
+                "statuses": {},
+                "main_watcher": None,
+                "main_status": None,
+            }
+            self._offset = 0
+        with self.resource_file.open("rb") as resource:
+            resource.seek(self._offset)
+            data = resource.read()
+        # a line is complete once its newline is written
+        data = data[: data.rfind(b"\n") + 1]
+        self._offset += len(data)
+        for line in data.splitlines():
+            entry = json.loads(line)
+            if entry["event"] == "register":
+                self._state["watchers"].append(entry["id"])
+                self._state["statuses"][entry["id"]] = "pending"
+            elif entry["event"] == "status":
+                self._state["statuses"][entry["id"]] = entry["status"]
+            else:
+                self._state["main_status"] = entry["status"]
+                self._state["main_watcher"] = entry["main_watcher"]
+        return self._state
+
+    def _wait_until(self, condition):
+        """Waits until the state of the shared resource satisfies a condition.
+
+        Args:
+            condition (function): Called with the state, returns whether to stop waiting.
+        """
+        interval = MIN_WAIT_INTERVAL
+        while not condition(self._read_state()):
+            if self._inotify is not None:
+                self._inotify.read(timeout=int(interval * 1000))
+            else:
+                time.sleep(interval)
+            interval = min(interval * 2, MAX_WAIT_INTERVAL)
 
     def _update_status(self, status):
         """Updates the status of the shared resource.
@@ -68,10 +154,7 @@ class SharedResource:
         Args:
             status (str): The new status of the shared resource.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            curr_data["statuses"][self.id] = status
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        self._append(event="status", id=self.id, status=status)
 
     def _update_main_status(self, status):
         """Updates the main status of the shared resource.
@@ -79,13 +162,12 @@ class SharedResource:
         Args:
             status (str): The new main status of the shared resource.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            curr_data["main_status"] = status
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        self._append(
+            event="main_status", status=status, main_watcher=self._read_state()["main_watcher"]
+        )
 
     def _check_all_status(self, status):
-        """Checks if all watchers have the specified status.
+        """Checks if all watchers have the specified status, the failed ones being ignored.
 
         Args:
             status (str): The status to check for.
@@ -93,12 +175,11 @@ class SharedResource:
         Returns:
             bool: True if all watchers have the specified status, False otherwise.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            for watcher_id in curr_data["watchers"]:
-                if curr_data["statuses"].get(watcher_id) != status:
-                    return False
-            return True
+        curr_data = self._read_state()
+        return all(
+            curr_data["statuses"].get(watcher_id) in (status, "error")
+            for watcher_id in curr_data["watchers"]
+        )
 
     def _wait_for_status(self, status):
         """Waits until all watchers have the specified status.
@@ -106,51 +187,39 @@ class SharedResource:
         Args:
             status (str): The status to wait for.
         """
-        while not self._check_all_status(status):
-            time.sleep(1)
+        self._wait_until(lambda curr_data: self._check_all_status(status))
 
     def _wait_for_main_watcher(self):
         """Waits for the main watcher to finish."""
-        while True:
-            curr_data = json.loads(self.resource_file.read_text())
-            if curr_data["main_status"] != "done":
-                time.sleep(60)
-            elif curr_data["main_status"] == "action_error":
-                self._try_take_over()
-            elif curr_data["main_status"] == "error":
-                raise Exception(f"Error in main watcher: {curr_data['main_watcher']}")
-            else:
-                break
+        self._wait_until(
+            lambda curr_data: curr_data["main_status"] in ("done", "action_error", "error")
+        )
+        curr_data = self._read_state()
+        if curr_data["main_status"] == "action_error":
+            self._try_take_over()
+        elif curr_data["main_status"] == "error":
+            raise Exception(f"Error in main watcher: {curr_data['main_watcher']}")
 
     def _try_take_over(self):
         """Tries to take over as the main watcher."""
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            if curr_data["main_status"] in ("action_error", "error"):
-                curr_data["main_status"] = "recovering"
-                curr_data["main_watcher"] = self.id
-                self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        with self._lock():
+            if self._read_state()["main_status"] in ("action_error", "error"):
+                self._append(event="main_status", status="recovering", main_watcher=self.id)
                 self.is_main = True
                 self.is_recovering = True
         self.wait()
 
     def register(self):
         """Registers the current process as a watcher."""
-        with self.lock_file:
-            if self.resource_file.exists():
-                curr_data = json.loads(self.resource_file.read_text())
-                self.is_main = False
-            else:  # First watcher to register, becomes the main watcher, and creates the file
-                curr_data = {
-                    "watchers": [],
-                    "statuses": {},
-                    "main_watcher": self.id,
-                    "main_status": "waiting",
-                }
-                self.is_main = True
-            curr_data["watchers"].append(self.id)
-            curr_data["statuses"][self.id] = "pending"
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        with self._lock():
+            # First watcher to register, becomes the main watcher, and creates the file
+            self.is_main = not self.resource_file.exists()
+            self._append(event="register", id=self.id)
+            if self.is_main:
+                self._append(event="main_status", status="waiting", main_watcher=self.id)
+        if inotify_simple is not None:
+            self._inotify = inotify_simple.INotify()
+            self._inotify.add_watch(self.resource_file, inotify_simple.flags.MODIFY)
 
     def ready(self):
         """Marks the current process as ready to perform the action."""
@@ -166,7 +235,8 @@ class SharedResource:
         try:
             self.action(*self.action_args, **self.action_kwargs)
         except Exception as err:
-            self._update_main_status("error")
+            # another watcher takes over a recoverable action
+            self._update_main_status("action_error" if self.action_is_recoverable else "error")
             raise err
 
     def wait(self):
@@ -179,6 +249,12 @@ class SharedResource:
         else:
             self._wait_for_main_watcher()
 
+    def _close(self):
+        """Stops watching the resource file."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
     def __enter__(self):
         """Registers the current process as a watcher and returns the instance."""
         self.register()
@@ -186,15 +262,24 @@ class SharedResource:
 
     def __exit__(self, exc_type, exc_value, traceback):
         """Marks the current process as done and updates the main watcher if needed."""
-        if exc_type is FileNotFoundError:
-            raise exc_value
-        if exc_type is None:
-            self.done()
-            if self.is_main:
-                self._wait_for_status("done")
-                self.resource_file.unlink()
-        else:
-            self._update_status("error")
-            if self.is_main:
-                self._update_main_status("error")
-            raise exc_value
+        try:
+            if exc_type is FileNotFoundError:
+                raise exc_value
+            if exc_type is None:
+                self.done()
+                if self.is_main:
+                    self._wait_for_status("done")
+                    self.resource_file.unlink()
+                    self.lock_file.unlink(missing_ok=True)
+            else:
+                self._update_status("error")
+                curr_data = self._read_state()
+                # a recoverable action error lets another watcher take over
+                if (
+                    curr_data["main_watcher"] == self.id
+                    and curr_data["main_status"] != "action_error"
+                ):
+                    self._update_main_status("error")
+                raise exc_value
+        finally:
+            self._close()
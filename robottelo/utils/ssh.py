@@ -1,6 +1,156 @@
 """Utility module to handle the shared ssh connection."""
 
+import codecs
+from collections import OrderedDict
+import threading
+import time
+
+from broker.helpers import Result, translate_timeout
+
 from robottelo.cli import hammer
+from robottelo.logging import logger
+
+
+class SSHSessionPool:
+    """Process wide pool of authenticated ssh clients
+
+    Clients are keyed by ``(hostname, port, username, ipv6)`` and by the calling thread, so a
+    thread always gets its own channel and clients never have to be checked in or out
+    explicitly. Idle clients are evicted after ``idle_timeout`` seconds, a client idle for more
+    than ``health_check_interval`` seconds is probed before being handed out again, and at most
+    ``max_size`` clients are kept open, the least recently used one being closed first.
+    """
+
+    def __init__(self, max_size=32, idle_timeout=300, health_check_interval=60):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self._clients = OrderedDict()  # (key, thread_id) -> [client, last_used]
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _is_healthy(client):
+        """Probe a pooled client with a no-op command"""
+        try:
+            return client.execute('true', timeout=10000).status == 0
+        except Exception as err:
+            logger.debug(f'Pooled ssh client for {client.hostname} failed health check: {err}')
+            return False
+
+    @staticmethod
+    def _close_client(client):
+        try:
+            client.close()
+        except Exception as err:
+            logger.debug(f'Failed to close pooled ssh client for {client.hostname}: {err}')
+
+    def _close(self, pool_key):
+        """Drop a client from the pool and close its session"""
+        client, _ = self._clients.pop(pool_key)
+        self.evictions += 1
+        self._close_client(client)
+
+    def _evict_stale(self, now):
+        """Close clients that are idle for too long or whose thread has finished"""
+        alive_threads = {thread.ident for thread in threading.enumerate()}
+        for pool_key, (_, last_used) in list(self._clients.items()):
+            if now - last_used > self.idle_timeout or pool_key[1] not in alive_threads:
+                self._close(pool_key)
+
+    def get(self, key, factory):
+        """Return the pooled client for ``key``, creating it with ``factory`` on a miss
+
+        :param tuple key: ``(hostname, port, username, ipv6)``
+        :param factory: callable without arguments returning a new client
+        """
+        pool_key = (key, threading.get_ident())
+        with self._lock:
+            now = time.monotonic()
+            self._evict_stale(now)
+            # the entry of the calling thread is taken out of the pool, so that it is probed, or
+            # a new client connected, without blocking the other threads
+            entry = self._clients.pop(pool_key, None)
+        if entry is not None:
+            client, last_used = entry
+            if now - last_used <= self.health_check_interval or self._is_healthy(client):
+                with self._lock:
+                    self.hits += 1
+                    self._add(pool_key, client)
+                return client
+            with self._lock:
+                self.evictions += 1
+            self._close_client(client)
+        client = factory()
+        with self._lock:
+            self.misses += 1
+            self._add(pool_key, client)
+        return client
+
+    def _add(self, pool_key, client):
+        """Put a client in the pool as the most recently used one, within the size limit"""
+        self._clients[pool_key] = [client, time.monotonic()]
+        while len(self._clients) > self.max_size:
+            self._close(next(iter(self._clients)))
+
+    def discard(self, key):
+        """Close the calling thread's client for ``key``, e.g. after a broken channel"""
+        pool_key = (key, threading.get_ident())
+        with self._lock:
+            if pool_key in self._clients:
+                self._close(pool_key)
+
+    def clear(self):
+        """Close all pooled clients"""
+        with self._lock:
+            for pool_key in list(self._clients):
+                self._close(pool_key)
+
+    def stats(self):
+        """Return usage counters of the pool"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'size': len(self._clients),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / requests if requests else 0.0,
+            }
+
+
+_ssh_pool = None
+
+
+def get_ssh_pool():
+    """Return the process wide :class:`SSHSessionPool`, or None when pooling is disabled"""
+    global _ssh_pool
+    from robottelo.config import settings
+
+    pool_settings = settings.server.ssh_client.pool
+    if not pool_settings.enabled:
+        return None
+    if _ssh_pool is None:
+        _ssh_pool = SSHSessionPool(
+            max_size=pool_settings.max_size,
+            idle_timeout=pool_settings.idle_timeout,
+            health_check_interval=pool_settings.health_check_interval,
+        )
+    return _ssh_pool
+
+
+def get_client_key(hostname=None, username=None, port=22, ipv6=None):
+    """Resolve the connection defaults from settings and return the pool key"""
+    from robottelo.config import settings
+
+    return (
+        hostname or settings.server.hostname,
+        port or settings.server.ssh_client.port,
+        username or settings.server.ssh_username,
+        ipv6 or settings.server.is_ipv6,
+    )
 
 
 def get_client(
@@ -8,21 +158,37 @@ def get_client(
     username=None,
     password=None,
     port=22,
+    ipv6=None,
+    pooled=True,
 ):
     """Returns a host object that provides an ssh connection
 
     Processes ssh credentials in the order: password, key_filename, ssh_key
     Config validation enforces one of the three must be set in settings.server
+
+    When ``server.ssh_client.pool.enabled`` is set, the host object is taken from the
+    process wide :class:`SSHSessionPool` so its authenticated session is reused, unless
+    ``pooled`` is False.
     """
     from robottelo.config import settings
     from robottelo.hosts import ContentHost
 
-    return ContentHost(
-        hostname=hostname or settings.server.hostname,
-        username=username or settings.server.ssh_username,
-        password=password or settings.server.ssh_password,
-        port=port or settings.server.ssh_client.port,
-    )
+    key = get_client_key(hostname=hostname, username=username, port=port, ipv6=ipv6)
+    hostname, port, username, ipv6 = key
+
+    def factory():
+        return ContentHost(
+            hostname=hostname,
+            username=username,
+            password=password or settings.server.ssh_password,
+            port=port,
+            ipv6=ipv6,
+        )
+
+    pool = get_ssh_pool()
+    if pool is None or not pooled:
+        return factory()
+    return pool.get(key, factory)
 
 
 def command(
@@ -33,6 +199,7 @@ def command(
     password=None,
     timeout=None,
     port=22,
+    ipv6=None,
 ):
     """Executes SSH command(s) on remote hostname.
 
@@ -48,8 +215,15 @@ def command(
         username=username,
         password=password,
         port=port,
+        ipv6=ipv6,
     )
-    result = client.execute(cmd, timeout=timeout)
+    try:
+        result = client.execute(cmd, timeout=timeout)
+    except Exception:
+        # never hand a broken channel out again
+        if pool := get_ssh_pool():
+            pool.discard(get_client_key(hostname=hostname, username=username, port=port, ipv6=ipv6))
+        raise
 
     if output_format and result.status == 0:
         if output_format == 'csv':
@@ -57,3 +231,78 @@ def command(
         if output_format == 'json':
             result.stdout = hammer.parse_json(result.stdout) if result.stdout else None
     return result
+
+
+def _stream_lines(client, cmd, timeout, result):
+    """Yield the stdout lines of ``cmd`` as they are read and fill ``result`` once done"""
+    from robottelo.config import settings
+
+    session = getattr(client.session, 'session', None)
+    channel = None
+    try:
+        if not hasattr(session, 'open_session'):
+            # the broker ssh backend only returns the complete output
+            response = client.execute(cmd, timeout=timeout)
+            result.status, result.stderr = response.status, response.stderr
+            yield from response.stdout.splitlines()
+            return
+        session.set_timeout(
+            translate_timeout(timeout or settings.server.ssh_client.command_timeout)
+        )
+        channel = session.open_session()
+        channel.execute(cmd)
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        pending = ''
+        size, data = channel.read()
+        while size > 0:
+            *lines, pending = (pending + decoder.decode(data)).split('\n')
+            yield from lines
+            size, data = channel.read()
+        if pending := pending + decoder.decode(b'', final=True):
+            yield pending
+        stderr = b''
+        size, data = channel.read_stderr()
+        while size > 0:
+            stderr += data
+            size, data = channel.read_stderr()
+        channel.wait_eof()
+        result.stderr = stderr.decode(errors='replace')
+        result.status = channel.get_exit_status()
+    finally:
+        # also reached when the caller stops iterating early
+        if channel is not None:
+            channel.close()
+        client.close()
+
+
+def stream_command(
+    cmd,
+    hostname=None,
+    username=None,
+    password=None,
+    timeout=None,
+    port=22,
+    ipv6=None,
+):
+    """Executes a SSH command on remote hostname and streams its output.
+
+    The command runs on its own connection, so other commands can be run while the output is
+    consumed. Incremental reads require the ``ssh2-python`` broker ssh backend, with any other
+    backend the whole output is read before the first line is returned.
+
+    :param str cmd: The command to run
+    :param int timeout: Time to wait for the ssh command to finish.
+    :return: a result object whose ``stdout`` is a generator of output lines, ``status`` and
+        ``stderr`` are only set once ``stdout`` is exhausted
+    """
+    client = get_client(
+        hostname=hostname,
+        username=username,
+        password=password,
+        port=port,
+        ipv6=ipv6,
+        pooled=False,
+    )
+    result = Result(status=None, stdout=None, stderr='')
+    result.stdout = _stream_lines(client, cmd, timeout, result)
+    return result
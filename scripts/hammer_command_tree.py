@@ -5,17 +5,18 @@ help.
 
 import json
 
-from robottelo import ssh
-from robottelo.cli import hammer
+from robottelo.cli import command_tree, hammer
 from robottelo.config import settings
 
+# Read the help of all the commands of a level in parallel
+helps = command_tree.read_help(hostname=settings.server.hostnames[0])
+
 
 def generate_command_tree(command):
     """Recursively walk trhough the hammer commands and subcommands and fetch
     their help. Return a dictionary with the contents.
     """
-    output = ssh.command(f'{command} --help', hostname=settings.server.hostnames[0]).stdout
-    contents = hammer.parse_help(output)
+    contents = hammer.parse_help(helps[command])
     if len(contents['subcommands']) > 0:
         for subcommand in contents['subcommands']:
             subcommand.update(generate_command_tree('{} {}'.format(command, subcommand['name'])))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""Maintain and benchmark the storages of the shared function decorator."""
+
+from concurrent.futures import ProcessPoolExecutor
+import datetime
+import os
+import tempfile
+import time
+
+import click
+
+from robottelo.utils.decorators.func_shared import shared
+from robottelo.utils.decorators.func_shared.file_storage import FileStorageHandler
+from robottelo.utils.decorators.func_shared.sqlite_storage import SQLiteStorageHandler
+
+
+@click.group()
+def main():
+    pass
+
+
+@main.command()
+@click.option('--database', help='The database path, the one of the tmp dir by default')
+@click.option('--max-age', type=int, help='Age in seconds of the values to delete')
+def gc(database, max_age):
+    """Delete the expired values of the sqlite storage and vacuum it"""
+    shared._check_config()
+    if max_age is None:
+        max_age = shared.SHARE_DEFAULT_TIMEOUT
+    deleted = SQLiteStorageHandler(database=database).collect_garbage(max_age)
+    click.echo(f'Deleted {deleted} values')
+
+
+def _get_handler(storage, directory):
+    if storage == 'file':
+        return FileStorageHandler(root_dir=directory)
+    return SQLiteStorageHandler(database=os.path.join(directory, 'benchmark.sqlite'))
+
+
+def _share(storage, directory, keys):
+    """Share values the way the shared decorator does, return the elapsed time"""
+    start = time.perf_counter()
+    for key in keys:
+        handler = _get_handler(storage, directory)
+        if handler.get(key) is None:
+            with handler.lock(key) as data:
+                handler.when_lock_acquired(data)
+                if handler.get(key) is None:
+                    handler.set(
+                        key,
+                        dict(
+                            state='READY',
+                            result=key,
+                            creation_datetime=datetime.datetime.utcnow().strftime(
+                                '%Y-%m-%dT%H:%M:%S'
+                            ),
+                        ),
+                    )
+    return time.perf_counter() - start
+
+
+@main.command()
+@click.option('--workers', default=16, show_default=True, help='Concurrent processes')
+@click.option('--keys', default=2000, show_default=True, help='Keys shared by all processes')
+def benchmark(workers, keys):
+    """Compare the file and sqlite storages, each process sharing the same keys"""
+    for storage in ('file', 'sqlite'):
+        with tempfile.TemporaryDirectory() as directory:
+            _get_handler(storage, directory)
+            # each process goes through the keys in a different order
+            key_lists = [
+                [f'key{(index * 7919 + worker) % keys}' for index in range(keys)]
+                for worker in range(workers)
+            ]
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                times = list(
+                    executor.map(_share, [storage] * workers, [directory] * workers, key_lists)
+                )
+            elapsed = time.perf_counter() - start
+            files = len(os.listdir(directory))
+        click.echo(
+            f'{storage}: {elapsed:.2f}s, slowest process {max(times):.2f}s, '
+            f'{keys / elapsed * workers:.0f} calls/s, {files} files'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Tests for module ``robottelo.host_helpers.api_namespace``."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from robottelo.host_helpers import api_namespace
+
+
+class Entity:
+    def __init__(self, server_config=None, **kwargs):
+        self._server_config = server_config
+        self.kwargs = kwargs
+
+
+class Organization(Entity):
+    pass
+
+
+def server_config(url='https://sat.example.com', auth=('admin', 'changeme')):
+    return SimpleNamespace(url=url, auth=auth, verify=False)
+
+
+@pytest.fixture(autouse=True)
+def entity_classes(monkeypatch):
+    monkeypatch.setattr(api_namespace, '_namespaces', {})
+    monkeypatch.setattr(
+        api_namespace, '_entity_classes', {'Entity': Entity, 'Organization': Organization}
+    )
+
+
+def test_namespace_binds_on_first_access():
+    config = server_config()
+    api = api_namespace.APINamespace(api_namespace.get_entity_classes(), config)
+    assert 'Organization' not in vars(api)
+    org = api.Organization(name='org')
+    assert 'Organization' in vars(api)
+    assert api.Organization is type(org)
+    assert issubclass(api.Organization, Organization)
+    assert org._server_config is config
+    assert org.kwargs == {'name': 'org'}
+    assert sorted(api) == ['Entity', 'Organization']
+    with pytest.raises(AttributeError):
+        api.Missing  # noqa: B018
+
+
+def test_namespace_is_shared_per_server_config():
+    api = api_namespace.get_api_namespace(server_config())
+    assert api_namespace.get_api_namespace(server_config(auth=['admin', 'changeme'])) is api
+    assert api_namespace.get_api_namespace(server_config(url='https://other')) is not api
+    assert api_namespace.get_api_namespace(server_config(auth=('user', 'pass'))) is not api
+
+
+def test_clear_cache():
+    api = api_namespace.get_api_namespace(server_config())
+    api_namespace.clear_cache()
+    assert api_namespace._entity_classes is None
+    assert not api_namespace._namespaces
+    api_namespace._entity_classes = {'Organization': Organization}
+    assert api_namespace.get_api_namespace(server_config()) is not api
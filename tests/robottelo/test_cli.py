@@ -1,10 +1,11 @@
+import base64
 from functools import partial
 import unittest
 from unittest import mock
 
 import pytest
 
-from robottelo.cli.base import Base
+from robottelo.cli.base import Base, HammerBatch
 from robottelo.exceptions import (
     CLIBaseError,
     CLIDataBaseError,
@@ -38,6 +39,21 @@ class BaseCliTestCase(unittest.TestCase):
         assert '--flag-two' not in command_parts
         assert len(command_parts) == 4
 
+    @mock.patch('robottelo.cli.base.command_tree.validate_options')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_construct_command_validates_options(self, settings, validate_options):
+        """_construct_command checks the options against the hammer command tree"""
+        settings.performance.validate_hammer_options = False
+        options = {'argument': 'value'}
+        CLIClass.command_sub = 'subcommand'
+        CLIClass._construct_command(options)
+        validate_options.assert_not_called()
+        settings.performance.validate_hammer_options = True
+        validate_options.side_effect = CLIReturnCodeError(64, 'Unrecognised option', 'msg')
+        with pytest.raises(CLIReturnCodeError):
+            CLIClass._construct_command(options)
+        validate_options.assert_called_once_with(CLIClass.command_base, 'subcommand', options)
+
     def test_username_password_parameters_lookup(self):
         """Username and password returned are the parameters"""
         username, password = CLIClass._get_username_password('auser', 'apass')
@@ -218,6 +234,44 @@ class BaseCliTestCase(unittest.TestCase):
         construct.assert_called_once_with({})
         execute.assert_called_once_with(construct.return_value, output_format='csv', timeout=None)
 
+    @mock.patch('robottelo.cli.base.Base.info')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_add_create_without_fetch(self, construct, execute, info):
+        """Check command create returns its output when created entities are not fetched"""
+        execute.return_value = [{'id': 'foo', 'bar': 'bas'}]
+        cli_cls = type('CLIClass', (CLIClass,), {'fetch_created': False})
+        assert execute.return_value == cli_cls.create({'organization-id': 'org-id'})
+        assert cli_cls.command_sub == 'create'
+        execute.assert_called_once_with(construct.return_value, output_format='csv', timeout=None)
+        assert not info.called
+
+    @mock.patch('robottelo.cli.base.settings')
+    @mock.patch('robottelo.cli.base.Base.info')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_add_create_lean(self, construct, execute, info, settings):
+        """Check lean create defers fetching the entity until a field other than the id is used"""
+        settings.performance.validate_hammer_options = False
+        settings.performance.lean_create.enabled = True
+        settings.performance.lean_create.entities = ['lean']
+        execute.return_value = [{'message': 'Created.', 'id': 'foo', 'name': 'bar'}]
+        info.return_value = {'id': 'foo', 'name': 'bar', 'content-label': 'label'}
+        cli_cls = type('CLIClass', (CLIClass,), {'command_base': 'lean'})
+        entity = cli_cls.create({'organization-id': 'org-id'})
+        assert entity == {'id': 'foo'}
+        assert entity.id == 'foo'
+        assert not info.called
+        assert entity.content_label == 'label'
+        assert entity['name'] == 'bar'
+        assert entity.get('missing') is None
+        info.assert_called_once_with({'id': 'foo'})
+        cli_cls.fetch_created = False
+        assert cli_cls.create() == execute.return_value
+        cli_cls.fetch_created = True
+        settings.performance.lean_create.entities = []
+        assert cli_cls.create() == info.return_value
+
     def assert_cmd_execution(
         self, construct, execute, base_method, cmd_sub, ignore_stderr=False, **base_method_kwargs
     ):
@@ -253,6 +307,7 @@ class BaseCliTestCase(unittest.TestCase):
         """Check executed build ssh method and returns raw response"""
         settings.robottelo.locale = 'en_US'
         settings.performance.time_hammer = False
+        settings.performance.hammer_shell = False
         settings.server.admin_username = 'admin'
         settings.server.admin_password = 'password'
         response = Base.execute('some_cmd', return_raw_response=True)
@@ -272,6 +327,7 @@ class BaseCliTestCase(unittest.TestCase):
         """Check executed build ssh method and delegate response handling"""
         settings.robottelo.locale = 'en_US'
         settings.performance.timer_hammer = True
+        settings.performance.hammer_shell = False
         settings.server.admin_username = 'admin'
         settings.server.admin_password = 'password'
         response = Base.execute('some_cmd', hostname=None, output_format='json')
@@ -285,23 +341,33 @@ class BaseCliTestCase(unittest.TestCase):
         handle_resp.assert_called_once_with(command.return_value, ignore_stderr=None)
         assert response is handle_resp.return_value
 
-    @mock.patch('robottelo.cli.base.Base.list')
-    def test_exists_without_option_and_empty_return(self, lst_method):
+    @mock.patch('robottelo.cli.base.Base.paginate')
+    def test_exists_without_option_and_empty_return(self, paginate):
         """Check exists method without options and empty return"""
-        lst_method.return_value = []
+        paginate.return_value = iter([])
         response = Base.exists(search=['id', 1])
-        lst_method.assert_called_once_with({'search': 'id=\\"1\\"'})
+        paginate.assert_called_once_with({'search': 'id=\\"1\\"'}, per_page=1, prefetch=False)
         assert response == []
 
-    @mock.patch('robottelo.cli.base.Base.list')
-    def test_exists_with_option_and_no_empty_return(self, lst_method):
+    @mock.patch('robottelo.cli.base.Base.paginate')
+    def test_exists_with_option_and_no_empty_return(self, paginate):
         """Check exists method with options and no empty return"""
-        lst_method.return_value = [1, 2]
+        paginate.return_value = iter([1, 2])
         my_options = {'search': 'foo=bar'}
         response = Base.exists(my_options, search=['id', 1])
-        lst_method.assert_called_once_with(my_options)
+        paginate.assert_called_once_with(my_options, per_page=1, prefetch=False)
         assert response == 1
 
+    def test_exists_with_custom_list(self):
+        """Check exists uses the list method of classes customizing it"""
+
+        class CustomList(Base):
+            list = mock.Mock(return_value=[1, 2])
+
+        CustomList.list.__func__ = None
+        assert CustomList.exists(search=['id', 1]) == 1
+        CustomList.list.assert_called_once_with({'search': 'id=\\"1\\"'})
+
     @mock.patch('robottelo.cli.base.Base.command_requires_org')
     def test_info_requires_organization_id(self, _):  # noqa: PT019 - not a fixture
         """Check info raises CLIError with organization-id is not present in
@@ -387,6 +453,71 @@ class BaseCliTestCase(unittest.TestCase):
             options={'organization-id': 1},
         )
 
+    @mock.patch('robottelo.cli.base.settings')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_list_pages(self, execute, settings):
+        """list reads every page of the default page size"""
+        settings.performance.validate_hammer_options = False
+        settings.performance.pagination.per_page = 2
+        settings.performance.rest_read.enabled = False
+        execute.side_effect = [[1, 2], [3, 4], [5]]
+        assert Base.list({'organization-id': 1}) == [1, 2, 3, 4, 5]
+        commands = [call.args[0] for call in execute.call_args_list]
+        assert '--page' not in commands[0]
+        assert '--per-page="2" --page="3"' in commands[2]
+        execute.side_effect = [[1, 2], [3, 4]]
+        assert Base.list({'per-page': 2}) == [1, 2]
+
+    @mock.patch('robottelo.cli.base.settings')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_paginate_stops_early(self, execute, settings):
+        """paginate only requests the pages that are consumed"""
+        settings.performance.validate_hammer_options = False
+        execute.side_effect = [[1, 2], [3, 4], [5]]
+        rows = Base.paginate(per_page=2, prefetch=False)
+        assert [next(rows) for _ in range(3)] == [1, 2, 3]
+        rows.close()
+        assert execute.call_count == 2
+
+    @mock.patch('robottelo.cli.base._get_prefetch_executor')
+    @mock.patch('robottelo.cli.base.settings')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_paginate_prefetch(self, execute, settings, get_executor):
+        """paginate requests the next page before the current one is consumed"""
+        settings.performance.validate_hammer_options = False
+        execute.side_effect = [[1, 2], [3, 4], [5]]
+        submit = get_executor.return_value.submit
+        submit.side_effect = lambda func, *args, **kwargs: mock.Mock(
+            result=mock.Mock(return_value=func(*args, **kwargs))
+        )
+        rows = Base.paginate(per_page=2, prefetch=True)
+        assert next(rows) == 1
+        assert submit.call_args.args[1].endswith('--page="2" ')
+        assert list(rows) == [2, 3, 4, 5]
+        assert execute.call_count == submit.call_count + 1 == 3
+
+    @mock.patch('robottelo.cli.base.settings')
+    @mock.patch('robottelo.cli.base.ssh.stream_command')
+    def test_iter_list(self, stream_command, settings):
+        """iter_list yields parsed rows and raises once hammer failed"""
+        settings.performance.validate_hammer_options = False
+        settings.robottelo.locale = 'en_US.UTF-8'
+        settings.performance.pagination.per_page = 10000
+        stream_command.return_value = mock.Mock(
+            status=0, stderr='', stdout=iter(['Id,Name', '1,org', '2,other'])
+        )
+        rows = CLIClass.iter_list({'organization-id': 1})
+        assert next(rows) == {'id': '1', 'name': 'org'}
+        assert list(rows) == [{'id': '2', 'name': 'other'}]
+        command = stream_command.call_args.args[0]
+        assert '--output=csv' in command
+        assert 'list --organization-id="1" --per-page="10000"' in command
+        stream_command.return_value = mock.Mock(
+            status=65, stderr='Error: forbidden', stdout=iter([])
+        )
+        with pytest.raises(CLIReturnCodeError):
+            list(CLIClass.iter_list())
+
     @mock.patch('robottelo.cli.base.Base.execute')
     @mock.patch('robottelo.cli.base.Base._construct_command')
     def test_puppet_classes(self, construct, execute):
@@ -453,6 +584,79 @@ class BaseCliTestCase(unittest.TestCase):
         )
 
 
+class HammerBatchTestCase(unittest.TestCase):
+    """Tests for the HammerBatch class"""
+
+    @staticmethod
+    def batch_output(script, frames):
+        """Build the output of the batch script from (status, stdout, stderr) frames"""
+        sentinel = script.split('echo "')[1].split(' ')[0]
+        return '\n'.join(
+            f'{sentinel} {index} {status}\n'
+            f'{base64.b64encode(stdout.encode()).decode()}\n'
+            f'{base64.b64encode(stderr.encode()).decode()}'
+            for index, (status, stdout, stderr) in enumerate(frames)
+        )
+
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_batch(self, settings, command):
+        """All queued commands run in one ssh call and are parsed like Base methods"""
+        settings.performance.validate_hammer_options = False
+        settings.robottelo.locale = 'en_US'
+
+        def run_script(script, **kwargs):
+            assert script.count('hammer -v') == 3
+            return mock.Mock(
+                status=0,
+                stderr='',
+                stdout=self.batch_output(
+                    script,
+                    [(0, 'Id,Name\n1,org\n', ''), (0, 'Id: 1\nName: org\n', ''), (0, 'ok', '')],
+                ),
+            )
+
+        command.side_effect = run_script
+        with CLIClass.batch(hostname='sat.example.com') as batch:
+            listed = batch.add(CLIClass, 'list')
+            info = batch.add(CLIClass, 'info', {'id': 1}, output_format=None)
+            deleted = batch.add(CLIClass, 'delete', {'id': 1}, output_format=None)
+        command.assert_called_once_with(mock.ANY, hostname='sat.example.com', timeout=None)
+        assert listed.result == [{'id': '1', 'name': 'org'}]
+        assert info.result == {'id': '1', 'name': 'org'}
+        assert deleted.result == 'ok'
+
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_batch_error(self, settings, command):
+        """The first failed command raises when the batch has run"""
+        settings.performance.validate_hammer_options = False
+        settings.robottelo.locale = 'en_US'
+        command.side_effect = lambda script, **kwargs: mock.Mock(
+            status=0,
+            stderr='',
+            stdout=self.batch_output(script, [(0, 'Id: 1', ''), (65, '', 'Could not find org')]),
+        )
+        batch = HammerBatch(hostname='sat.example.com')
+        first = batch.add(CLIClass, 'info', {'id': 1}, output_format=None)
+        second = batch.add(CLIClass, 'info', {'id': 2}, output_format=None)
+        with pytest.raises(CLIReturnCodeError, match='Could not find org'):
+            batch.run()
+        assert first.error is None
+        assert second.error.status == 65
+
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_batch_incomplete(self, settings, command):
+        """A batch script which did not return all results raises"""
+        settings.robottelo.locale = 'en_US'
+        command.return_value = mock.Mock(status=1, stderr='mktemp failed', stdout='')
+        batch = HammerBatch()
+        batch.add(CLIClass, 'list')
+        with pytest.raises(CLIReturnCodeError, match='returned 0 of 1 results'):
+            batch.run()
+
+
 class CLIErrorTests(unittest.TestCase):
     """Tests for the CLIError cli class"""
 
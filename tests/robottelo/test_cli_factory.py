@@ -0,0 +1,105 @@
+"""Tests for module ``robottelo.host_helpers.cli_factory``."""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from unittest import mock
+
+from box import Box
+import pytest
+
+from robottelo.exceptions import CLIFactoryError
+from robottelo.host_helpers import cli_factory
+from robottelo.host_helpers.cli_factory import CLIFactory
+
+
+class FakeCLI:
+    """Satellite cli namespace returning a class for any entity"""
+
+    def __getattr__(self, name):
+        return type(name, (), {'fetch_created': True})
+
+
+@pytest.fixture
+def factory():
+    return CLIFactory(mock.Mock(cli=FakeCLI()))
+
+
+@pytest.fixture
+def created(mocker):
+    """Record the cli class and options of the created entities instead of running hammer"""
+    created = []
+    lock = threading.Lock()
+
+    def create_object(cli_object, options, values=None, credentials=None, timeout=None):
+        options.update(values or {})
+        # give the other creations the opportunity to run meanwhile
+        time.sleep(0.001)
+        with lock:
+            created.append((cli_object, options))
+        return Box(options)
+
+    mocker.patch.object(cli_factory, 'create_object', side_effect=create_object)
+    return created
+
+
+def test_make_user(factory, created):
+    user = factory.make_user({'admin': 'true'})
+    assert user.mail == f'{user.login}@example.com'
+    assert user.admin == 'true'
+    assert '_setup_res' not in cli_factory.ENTITY_FIELDS['user']
+
+
+def test_make_user_many_concurrent(factory, created, mocker):
+    """The default values of every entity are their own, even with concurrent calls"""
+    # evaluated between the login setup and the login, give the other calls time to run
+    mocker.patch.dict(
+        cli_factory.ENTITY_FIELDS['user'], {'firstname': lambda: time.sleep(0.001) or 'first'}
+    )
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = [
+            user
+            for users in executor.map(lambda _: factory.make_user_many(50), range(4))
+            for user in users
+        ]
+    assert len(results) == 200
+    assert len({user.login for user in results}) == 200
+    assert all(user.mail == f'{user.login}@example.com' for user in results)
+
+
+def test_make_many_fetch(factory, created):
+    users = factory.make_user_many(3, {'admin': 'true'}, fetch=False)
+    assert all(user.admin == 'true' for user in users)
+    # every entity is created by its own subclass, which does not fetch the created entity
+    cli_classes = [cli_object for cli_object, _ in created]
+    assert len(set(cli_classes)) == 3
+    assert not any(cli_object.fetch_created for cli_object in cli_classes)
+
+
+def test_make_many_explicit_make_method(factory):
+    """The make methods defined explicitly have no make_<entity>_many counterpart"""
+    assert callable(factory.make_partition_table)
+    with pytest.raises(AttributeError, match='make_partition_table_many'):
+        factory.make_partition_table_many  # noqa: B018
+
+
+def test_make_many_failures(factory, mocker):
+    """All the entities are processed, then the failures are raised together"""
+    calls = []
+
+    def create_object(cli_object, options, values=None, credentials=None, timeout=None):
+        calls.append(options['name'])
+        if options['name'].startswith('fail'):
+            raise CLIFactoryError(f'Failed to create {options["name"]}')
+        return Box(options)
+
+    mocker.patch.object(cli_factory, 'create_object', side_effect=create_object)
+    names = iter(['ok0', 'fail1', 'ok2', 'fail3', 'ok4'])
+    mocker.patch.dict(cli_factory.ENTITY_FIELDS['architecture'], {'name': lambda: next(names)})
+    with pytest.raises(CLIFactoryError) as err:
+        factory.make_architecture_many(5, max_workers=2)
+    assert len(calls) == 5
+    message = str(err.value)
+    assert 'Failed to create 2 of 5 entities with make_architecture' in message
+    assert '[1] Failed to create fail1' in message
+    assert '[3] Failed to create fail3' in message
@@ -0,0 +1,78 @@
+"""Tests for module ``robottelo.cli.registry``."""
+
+from unittest import mock
+
+import pytest
+
+from robottelo.cli import registry
+from robottelo.cli.base import Base
+
+
+def make_classes(count):
+    return {f'Entity{i}': type(f'Entity{i}', (Base,), {}) for i in range(count)}
+
+
+@pytest.fixture
+def empty_registry(monkeypatch):
+    monkeypatch.setattr(registry, '_registry', {})
+    monkeypatch.setattr(registry, '_indexes', {})
+
+
+def test_get_cli_classes(empty_registry):
+    with mock.patch.object(
+        registry.importlib, 'import_module', wraps=registry.importlib.import_module
+    ) as import_module:
+        classes = registry.get_cli_classes(prefix='sm_')
+        assert registry.get_cli_classes(prefix='sm_') is classes
+    assert 'Backup' in classes
+    assert all(issubclass(cls, Base) for cls in classes.values())
+    # modules are imported the first time only, whatever the current working directory is
+    assert import_module.call_count == len(list(registry.CLI_PACKAGE_PATH.glob('sm_*.py')))
+
+
+def test_get_cli_class_index(empty_registry):
+    index = registry.get_cli_class_index(prefix='sm_')
+    assert registry.get_cli_class_index(prefix='sm_') is index
+    assert index[registry.normalize_name('maintenance_mode')] == 'MaintenanceMode'
+    assert index[registry.normalize_name('AdvancedByTag')] == 'AdvancedByTag'
+    assert sorted(index.values()) == sorted(registry.get_cli_classes(prefix='sm_'))
+
+
+def test_namespace_binds_on_first_access():
+    classes = make_classes(3)
+    cli = registry.CLINamespace(classes, hostname='sat.example.com')
+    assert 'Entity0' not in vars(cli)
+    entity = cli.Entity0
+    assert entity is cli.Entity0
+    assert issubclass(entity, classes['Entity0'])
+    assert entity.hostname == 'sat.example.com'
+    assert classes['Entity0'].hostname is None
+    assert list(vars(cli)) == ['_classes', '_attrs', 'Entity0']
+    assert sorted(cli) == ['Entity0', 'Entity1', 'Entity2']
+    assert 'Entity2' in dir(cli)
+    with pytest.raises(AttributeError):
+        cli.Missing  # noqa: B018
+
+
+def test_namespace_bind():
+    cli = registry.CLINamespace(make_classes(2), hostname='sat.example.com')
+    assert not cli.Entity0.omitting_credentials
+    cli.bind(omitting_credentials=True)
+    assert cli.Entity0.omitting_credentials
+    assert cli.Entity1.omitting_credentials
+    cli.bind(omitting_credentials=False)
+    assert not cli.Entity0.omitting_credentials
+
+
+def test_namespace_access_bound_attribute():
+    """Bound classes are plain attributes: the namespace is not searched anymore"""
+    cli = registry.CLINamespace(make_classes(1000), hostname='sat.example.com')
+    entity = cli.Entity0
+    cli._classes = mock.MagicMock(wraps=cli._classes)
+    with mock.patch.object(
+        registry.CLINamespace, '__getattr__', create=True, side_effect=AssertionError
+    ) as getattr_:
+        for _ in range(100):
+            assert cli.Entity0 is entity
+    getattr_.assert_not_called()
+    cli._classes.__getitem__.assert_not_called()
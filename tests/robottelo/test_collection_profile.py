@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from pytest_plugins import collection_profile
+
+
+class Deselector:
+    """Plugin keeping the first collected item only"""
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items):
+        items[:] = items[:1]
+
+    def pytest_collection_finish(self, session):
+        hookimpls = session.config.hook.pytest_collection_modifyitems.get_hookimpls()
+        self.functions = [hookimpl.function.__name__ for hookimpl in hookimpls]
+
+
+@pytest.fixture
+def run_collection(tmp_path):
+    """Collect two dummy tests with the collection profile plugin and the given options"""
+    (tmp_path / 'pytest.ini').write_text('[pytest]\n')
+    (tmp_path / 'test_dummy.py').write_text(
+        'def test_one():\n    pass\n\n\ndef test_two():\n    pass\n'
+    )
+
+    def run(*args):
+        deselector = Deselector()
+        pytest.main(
+            [
+                '-c',
+                str(tmp_path / 'pytest.ini'),
+                '-p',
+                'pytest_plugins.collection_profile',
+                '-p',
+                'no:cacheprovider',
+                '--collect-only',
+                *args,
+                str(tmp_path),
+            ],
+            plugins=[deselector],
+        )
+        return deselector
+
+    return run
+
+
+def test_collection_profile_export(run_collection, tmp_path, capsys):
+    report = tmp_path / 'profile.json'
+    deselector = run_collection(f'--collection-profile={report}')
+
+    profile = json.loads(report.read_text())
+    assert profile['worker'] == 'master'
+    assert profile['items'] == 1
+    records = {record['function']: record for record in profile['hooks']}
+    record = records['Deselector.pytest_collection_modifyitems']
+    assert record['items_in'] == 2
+    assert record['items_out'] == 1
+    assert record['duration'] >= 0
+    assert {'allocated', 'peak', 'plugin'} <= set(record)
+    assert 'collection profile' in capsys.readouterr().out
+    # the hook implementations are restored
+    assert 'profiled' not in deselector.functions
+
+
+def test_collection_profile_disabled(run_collection, capsys, mocker):
+    profiled = mocker.spy(collection_profile, '_profiled')
+    run_collection()
+    assert not profiled.called
+    assert 'collection profile' not in capsys.readouterr().out
@@ -0,0 +1,134 @@
+"""Tests for module ``robottelo.cli.command_tree``."""
+
+from unittest import mock
+
+import pytest
+
+from robottelo.cli import command_tree
+from robottelo.exceptions import CLIReturnCodeError, CLIUnknownOptionError
+
+HELPS = {
+    'hammer': '\n'.join(
+        [
+            'Usage:',
+            '    hammer [OPTIONS] SUBCOMMAND [ARG] ...',
+            '',
+            'Subcommands:',
+            ' organization                  Manipulate organizations',
+            'Options:',
+            ' --output ADAPTER              Set output format',
+            ' -v, --[no-]verbose            Be verbose (or not). True by default',
+        ]
+    ),
+    'hammer organization': '\n'.join(
+        [
+            'Subcommands:',
+            ' create                        Create an organization',
+            ' list, index                   List all organizations',
+        ]
+    ),
+    'hammer organization create': '\n'.join(
+        [
+            'Options:',
+            ' --name, --deprecation-name NAME  Name',
+            ' --location[s|-ids|-titles] VALUE REPLACE locations with given Names/Titles/Ids',
+            '                               Comma separated list of values, --not-an-option',
+            ' --lifecycle-environment[-id]  Set the current environment context',
+            '',
+            'Search / Order fields:',
+            ' --not-an-option-either        string',
+        ]
+    ),
+    'hammer organization list': '\n'.join(['Options:', ' --search VALUE  Filter results']),
+}
+
+
+def test_parse_option_names():
+    assert command_tree.parse_option_names(HELPS['hammer organization create']) == [
+        'deprecation-name',
+        'lifecycle-environment',
+        'lifecycle-environment-id',
+        'location-ids',
+        'location-titles',
+        'locations',
+        'name',
+    ]
+    assert command_tree.parse_option_names(HELPS['hammer']) == ['no-verbose', 'output', 'verbose']
+
+
+def test_read_help():
+    with mock.patch.object(
+        command_tree, '_read_help', side_effect=lambda command, hostname: HELPS[command]
+    ) as read_help:
+        assert command_tree.read_help(hostname='sat.example.com', max_workers=2) == HELPS
+    assert read_help.call_count == len(HELPS)
+
+
+def test_build_command_tree():
+    tree = command_tree.build_command_tree(HELPS)
+    assert tree['options'] == ['no-verbose', 'output', 'verbose']
+    organization = tree['subcommands']['organization']
+    assert organization['options'] == []
+    assert sorted(organization['subcommands']) == ['create', 'list']
+    assert organization['subcommands']['list'] == {'options': ['search'], 'subcommands': {}}
+
+
+def test_load_command_tree(tmp_path):
+    with (
+        mock.patch.object(command_tree, 'robottelo_tmp_dir', tmp_path),
+        mock.patch.object(command_tree, 'read_help', return_value=HELPS) as read_help,
+    ):
+        tree = command_tree.load_command_tree('6.16.0')
+        assert command_tree.load_command_tree('6.16.0') == tree
+        assert read_help.call_count == 1
+        assert [path.name for path in tmp_path.glob('*.json')] == [
+            'hammer_command_tree_6.16.0.json'
+        ]
+        command_tree.load_command_tree('6.17.0')
+        assert read_help.call_count == 2
+
+
+def test_get_command_tree_failure(monkeypatch):
+    monkeypatch.setattr(command_tree, '_tree', None)
+    with (
+        mock.patch.dict('sys.modules', {'robottelo.hosts': mock.Mock()}),
+        mock.patch.object(command_tree, 'load_command_tree', side_effect=OSError) as load,
+    ):
+        assert command_tree.get_command_tree() == {}
+        assert command_tree.get_command_tree() == {}
+    assert load.call_count == 1
+    command_tree.clear_cache()
+    assert command_tree._tree is None
+
+
+@pytest.mark.parametrize(
+    ('command_base', 'command_sub', 'options'),
+    [
+        ('organization', 'create', {'name': 'org', 'locations': ['loc'], 'output': 'csv'}),
+        ('organization', 'create', {'name': 'org', 'typo': None, 'other': False}),
+        ('organization', 'list', {'search': 'name=org', 'verbose': True}),
+        ('organization', 'update', {'typo': 'value'}),
+        ('organization', None, {'typo': 'value'}),
+        ('content-view filter', 'create', {'typo': 'value'}),
+    ],
+)
+def test_validate_options(command_base, command_sub, options):
+    tree = command_tree.build_command_tree(HELPS)
+    command_tree.validate_options(command_base, command_sub, options, tree=tree)
+
+
+def test_validate_options_unknown():
+    tree = command_tree.build_command_tree(HELPS)
+    with pytest.raises(CLIUnknownOptionError) as context:
+        command_tree.validate_options(
+            'organization', 'create', {'name': 'org', 'nmae': 'org', 'typo': True}, tree=tree
+        )
+    assert isinstance(context.value, CLIReturnCodeError)
+    assert context.value.status == command_tree.UNKNOWN_OPTION_STATUS
+    assert "Unrecognised option '--nmae'" in context.value.stderr
+    assert "Unrecognised option '--typo'" in context.value.stderr
+    assert 'hammer organization create --help' in context.value.stderr
+
+
+def test_validate_options_without_tree():
+    command_tree.validate_options('organization', 'create', {'typo': 'value'}, tree={})
@@ -5,6 +5,7 @@ import tempfile
 import time
 
 import pytest
+import zc.lockfile
 
 from robottelo.utils.decorators import func_locker
 
@@ -187,6 +188,32 @@ def simple_scoped_locking_function():
     return
 
 
+@func_locker.lock_function(mode=func_locker.LOCK_SHARED)
+def simple_shared_lock_function(index=None):
+    """Return the time interval the function was running"""
+    start = time.monotonic()
+    time.sleep(0.5)
+    return start, time.monotonic()
+
+
+@func_locker.lock_function(slots=2)
+def simple_slots_lock_function(index=None):
+    """Return the time interval the function was running"""
+    start = time.monotonic()
+    time.sleep(0.5)
+    return start, time.monotonic()
+
+
+def _max_overlap(intervals):
+    """Return the maximum number of intervals overlapping each other"""
+    events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+    running = overlap = 0
+    for _, delta in events:
+        running += delta
+        overlap = max(overlap, running)
+    return overlap
+
+
 def simple_function_not_locked():
     """This function do nothing, when called with locking, exception must be
     raised that this function is not locked
@@ -420,3 +447,81 @@ class TestFuncLocker:
             func_locker.locking_function(simple_function_not_locked),
         ):
             pass
+
+    def test_shared_lock_in_multiprocess(self, count_and_pool):
+        """Ensure that the shared lock holders run at the same time"""
+        results = count_and_pool.map(simple_shared_lock_function, range(4))
+        assert _max_overlap(results) > 1
+
+    def test_shared_lock_excluded_by_exclusive_lock(self):
+        """Ensure that a shared lock is not acquired while the function is
+        exclusively locked, and the reverse"""
+        with (
+            func_locker.locking_function(simple_shared_lock_function),
+            pytest.raises(func_locker.FunctionLockerError, match=r'.*shared lock.*'),
+            func_locker.locking_function(
+                simple_shared_lock_function, mode=func_locker.LOCK_SHARED, timeout=0.2
+            ),
+        ):
+            pass
+        with (
+            func_locker.locking_function(simple_shared_lock_function, mode=func_locker.LOCK_SHARED),
+            func_locker.locking_function(simple_shared_lock_function, mode=func_locker.LOCK_SHARED),
+        ):
+            # shared locks of the same process do not conflict
+            pass
+
+    def test_slots_lock_in_multiprocess(self, count_and_pool):
+        """Ensure that the function runs in as many processes at the same time
+        as it has slots"""
+        results = count_and_pool.map(simple_slots_lock_function, range(4))
+        assert _max_overlap(results) == 2
+
+    def test_slots_locking(self):
+        """Ensure that locking a function uses the slots it was decorated
+        with"""
+        with (
+            func_locker.locking_function(simple_slots_lock_function),
+            func_locker.locking_function(simple_slots_lock_function),
+            pytest.raises(func_locker.FunctionLockerError, match=r'.*2 slots.*'),
+            func_locker.locking_function(simple_slots_lock_function, timeout=0.2),
+        ):
+            pass
+
+    def test_slots_excluded_by_exclusive_lock(self):
+        """Ensure that the slot holders and an exclusive lock of the function
+        without slots exclude each other"""
+        with (
+            func_locker.locking_function(simple_slots_lock_function),
+            pytest.raises(zc.lockfile.LockError),
+            func_locker.locking_function(simple_slots_lock_function, slots=0, timeout=0.2),
+        ):
+            pass
+        with (
+            func_locker.locking_function(simple_slots_lock_function, slots=0),
+            pytest.raises(func_locker.FunctionLockerError, match=r'.*shared lock.*'),
+            func_locker.locking_function(simple_slots_lock_function, timeout=0.2),
+        ):
+            pass
+
+    def test_negative_shared_lock_slotted_function(self):
+        """Ensure that a slotted writer is not read under a shared lock"""
+        with (
+            func_locker.locking_function(simple_slots_lock_function),
+            pytest.raises(
+                func_locker.FunctionLockerError, match=r'.*functions locked with slots.*'
+            ),
+            func_locker.locking_function(simple_slots_lock_function, mode=func_locker.LOCK_SHARED),
+        ):
+            pass
+
+    def test_negative_shared_lock_slots(self):
+        with (
+            pytest.raises(
+                func_locker.FunctionLockerError, match=r'.*only supported by exclusive.*'
+            ),
+            func_locker.locking_function(
+                simple_shared_lock_function, mode=func_locker.LOCK_SHARED, slots=2
+            ),
+        ):
+            pass
@@ -1,6 +1,12 @@
+import datetime
+from importlib import import_module
 import multiprocessing
 import os
+import socket
+import sys
+import threading
 import time
+from unittest import mock
 
 from fauxfactory import gen_integer, gen_string
 import pytest
@@ -8,21 +14,34 @@ import pytest
 from robottelo.utils.decorators.func_shared.file_storage import (
     TEMP_FUNC_SHARED_DIR,
     TEMP_ROOT_DIR,
+    FileStorageHandler,
     get_temp_dir,
 )
 from robottelo.utils.decorators.func_shared.shared import (
+    _DATETIME_FORMAT,
     _NAMESPACE_SCOPE_KEY_TYPE,
+    _STATE_READY,
+    _STATE_RUNNING,
+    SharedFunctionError,
     SharedFunctionException,
+    _get_scope_name,
+    _get_server_fingerprint,
     _set_configured,
+    _SharedFunction,
+    clear_memo,
     enable_shared_function,
+    entities_exist,
     set_default_scope,
     shared,
 )
+from robottelo.utils.decorators.func_shared.sqlite_storage import SQLiteStorageHandler
 
 DEFAULT_POOL_SIZE = 8
 SIMPLE_TIMEOUT_VALUE = 3
 
 _this_module_name = 'tests.robottelo.test_func_shared'
+# the package exports the shared decorator under the name of its module
+shared_module = import_module('robottelo.utils.decorators.func_shared.shared')
 _set_configured(True)
 
 
@@ -143,6 +162,33 @@ def basic_shared_counter_string(prefix='', suffix='', counter=0, increment_by=1)
     return f'{prefix}_{counter + increment_by}_{suffix}'
 
 
+@shared
+def simple_shared_counter_memo(index=0):
+    """a simple shared function returning a mutable result"""
+    return {'index': index + 1}
+
+
+def _stored_value(state, result=None, pid=None, age=0):
+    """Return a value as stored by a shared function"""
+    creation_datetime = datetime.datetime.utcnow() - datetime.timedelta(seconds=age)
+    return dict(
+        state=state,
+        id=gen_string('alpha', 10),
+        result=result,
+        error=None,
+        pid=pid or os.getpid(),
+        hostname=socket.gethostname(),
+        creation_datetime=creation_datetime.strftime(_DATETIME_FORMAT),
+    )
+
+
+def _terminated_process_pid():
+    process = multiprocessing.Process(target=int)
+    process.start()
+    process.join()
+    return process.pid
+
+
 class NotRestorableException(Exception):
     """this exception is not restorable as need mote args"""
 
@@ -554,3 +600,177 @@ class TestFuncShared:
                 suffix=suffix, prefix=prefix, counter=counter_value
             )
             assert inc_string == inc_string_2
+
+    def test_shared_memo(self, scope):
+        """Once read, the shared result is returned without using the storage"""
+        result = simple_shared_counter_memo(index=1)
+        assert result == {'index': 2}
+        result['index'] = 100
+        with (
+            mock.patch.object(FileStorageHandler, 'lock') as lock,
+            mock.patch.object(FileStorageHandler, 'get') as get,
+        ):
+            assert simple_shared_counter_memo(index=5) == {'index': 2}
+        lock.assert_not_called()
+        get.assert_not_called()
+        clear_memo()
+        assert simple_shared_counter_memo(index=5) == {'index': 2}
+
+    def test_wait_for_running_function(self, tmp_path):
+        """The result of the process running the function is waited for without locking"""
+        storage = FileStorageHandler(root_dir=str(tmp_path))
+        key = gen_string('alpha', 10)
+        storage.set(key, _stored_value(_STATE_RUNNING, pid=os.getppid()))
+        timer = threading.Timer(
+            1, storage.set, args=(key, _stored_value(_STATE_READY, result={'index': 2}))
+        )
+        function = mock.Mock(return_value={'index': 1})
+        timer.start()
+        with mock.patch.object(storage, 'lock') as lock:
+            assert _SharedFunction(key, function, storage_handler=storage)() == {'index': 2}
+        timer.join()
+        lock.assert_not_called()
+        function.assert_not_called()
+
+    def test_running_function_process_terminated(self, tmp_path):
+        """The function is called if the process that was running it is gone"""
+        storage = FileStorageHandler(root_dir=str(tmp_path))
+        key = gen_string('alpha', 10)
+        storage.set(key, _stored_value(_STATE_RUNNING, pid=_terminated_process_pid()))
+        function = mock.Mock(return_value={'index': 1})
+        assert _SharedFunction(key, function, storage_handler=storage)() == {'index': 1}
+        function.assert_called_once_with()
+        assert storage.get(key)['state'] == _STATE_READY
+
+    def test_running_function_skipped(self, tmp_path):
+        """A skip in the function does not leave the value running, the next call runs it"""
+        storage = FileStorageHandler(root_dir=str(tmp_path))
+        key = gen_string('alpha', 10)
+        function = mock.Mock(side_effect=[pytest.skip.Exception('skipped'), {'index': 1}])
+        with pytest.raises(pytest.skip.Exception):
+            _SharedFunction(key, function, storage_handler=storage)()
+        assert storage.get(key) is None
+        with mock.patch.object(storage, 'wait', side_effect=AssertionError):
+            assert _SharedFunction(key, function, storage_handler=storage)() == {'index': 1}
+        assert storage.get(key)['state'] == _STATE_READY
+
+    def test_running_function_of_current_process(self, tmp_path):
+        """A running value left by the current process is not waited for"""
+        storage = FileStorageHandler(root_dir=str(tmp_path))
+        key = gen_string('alpha', 10)
+        storage.set(key, _stored_value(_STATE_RUNNING))
+        function = mock.Mock(return_value={'index': 1})
+        with mock.patch.object(storage, 'wait', side_effect=AssertionError):
+            assert _SharedFunction(key, function, storage_handler=storage)() == {'index': 1}
+
+    def test_file_storage_wait_timeout(self, tmp_path):
+        """The last value read is returned when the condition is not satisfied in time"""
+        storage = FileStorageHandler(root_dir=str(tmp_path))
+        assert storage.wait('key', until=lambda value: value is not None, timeout=0.1) is None
+
+    def test_sqlite_storage(self, tmp_path):
+        """The shared function results are stored in the sqlite database"""
+        storage = SQLiteStorageHandler(database=str(tmp_path / 'shared.sqlite'))
+        key = gen_string('alpha', 10)
+        function = mock.Mock(return_value={'index': 1})
+        assert _SharedFunction(key, function, storage_handler=storage)() == {'index': 1}
+        clear_memo()
+        assert _SharedFunction(key, function, storage_handler=storage)() == {'index': 1}
+        function.assert_called_once_with()
+        assert storage.get(key)['state'] == _STATE_READY
+        assert not list(tmp_path.glob('*.lock'))
+
+    def test_sqlite_storage_lock(self, tmp_path):
+        """The sqlite storage lock is exclusive, unless its process is terminated"""
+        database = str(tmp_path / 'shared.sqlite')
+        storage = SQLiteStorageHandler(database=database, lock_timeout=0.1)
+        with (
+            storage.lock('key'),
+            pytest.raises(TimeoutError),
+            SQLiteStorageHandler(database=database).lock('key', timeout=0.1),
+        ):
+            pass
+        storage._connection.execute(
+            "INSERT INTO shared_locks (key, pid, token) VALUES ('key', ?, 'token')",
+            (_terminated_process_pid(),),
+        )
+        with storage.lock('key'):
+            pass
+
+    def test_sqlite_storage_collect_garbage(self, tmp_path):
+        """The expired values are deleted"""
+        storage = SQLiteStorageHandler(database=str(tmp_path / 'shared.sqlite'))
+        storage.set('old', _stored_value(_STATE_READY, age=100))
+        storage.set('new', _stored_value(_STATE_READY))
+        assert storage.collect_garbage(50) == 1
+        assert storage.get('old') is None
+        assert storage.get('new') is not None
+
+    def test_validate(self, tmp_path):
+        """A stored result is not used when not valid anymore"""
+        storage = FileStorageHandler(root_dir=str(tmp_path))
+        key = gen_string('alpha', 10)
+        storage.set(key, _stored_value(_STATE_READY, result={'index': 2}))
+        function = mock.Mock(return_value={'index': 1})
+        validate = mock.Mock(return_value=True)
+        shared_function = _SharedFunction(key, function, storage_handler=storage, validate=validate)
+        assert shared_function() == {'index': 2}
+        function.assert_not_called()
+        validate.assert_called_once_with({'index': 2})
+        clear_memo()
+        validate.return_value = False
+        assert shared_function() == {'index': 1}
+        function.assert_called_once_with()
+        assert storage.get(key)['result'] == {'index': 1}
+
+    def test_entities_exist(self):
+        """The entities of a shared result are read to check they still exist"""
+        validate = entities_exist(org='Organization', repo='Repository')
+        with mock.patch.object(shared_module, 'entities') as entities:
+            entities.Organization.return_value.read_raw.return_value.status_code = 200
+            entities.Repository.return_value.read_raw.return_value.status_code = 404
+            assert not validate({'org': 1, 'repo': {'id': 2, 'name': 'repo'}})
+        entities.Organization.assert_called_once_with(id=1)
+        entities.Repository.assert_called_once_with(id=2)
+
+    def test_server_fingerprint(self, monkeypatch):
+        """The keys are scoped by the fingerprint of the Satellite when enabled"""
+        monkeypatch.setattr(shared_module, '_SERVER_FINGERPRINT', None)
+        monkeypatch.setitem(sys.modules, 'robottelo.hosts', mock.Mock())
+        sys.modules['robottelo.hosts'].get_sat_version.return_value = '6.16.0'
+        with (
+            mock.patch('ssl.get_server_certificate', return_value='cert') as get_certificate,
+            mock.patch('requests.get') as get,
+        ):
+            get.return_value.json.return_value = {'value': 'uuid'}
+            fingerprint = _get_server_fingerprint()
+            assert get_certificate.call_args.kwargs['timeout'] == 10
+            assert get.call_args.kwargs['timeout'] == 10
+            get.side_effect = OSError
+            assert _get_server_fingerprint() == fingerprint
+        assert len(fingerprint) == 32
+        assert _get_scope_name(lambda: 'scope') == f'scope.{_NAMESPACE_SCOPE_KEY_TYPE}'
+        monkeypatch.setattr(shared_module, 'SERVER_FINGERPRINT', True)
+        assert (
+            _get_scope_name(lambda: 'scope') == f'scope.{fingerprint}.{_NAMESPACE_SCOPE_KEY_TYPE}'
+        )
+
+    def test_server_fingerprint_failure(self, monkeypatch):
+        """The functions are not shared when the fingerprint of the Satellite cannot be computed"""
+        monkeypatch.setattr(shared_module, '_SERVER_FINGERPRINT', None)
+        monkeypatch.setattr(shared_module, 'SERVER_FINGERPRINT', True)
+        monkeypatch.setattr(shared_module, 'ENABLED', True)
+        monkeypatch.setitem(sys.modules, 'robottelo.hosts', mock.Mock())
+        function = mock.Mock(return_value={'index': 1}, __name__='function')
+        shared_function = shared(function_=function)
+        with (
+            mock.patch('ssl.get_server_certificate', side_effect=OSError),
+            mock.patch.object(shared_module, '_SharedFunction') as shared_object,
+        ):
+            assert shared_function() == {'index': 1}
+            assert shared_function() == {'index': 1}
+        shared_object.assert_not_called()
+        assert function.call_count == 2
+        assert not shared_module.ENABLED
+        with pytest.raises(SharedFunctionError, match='fingerprint'):
+            _get_scope_name(lambda: 'scope')
@@ -1,6 +1,31 @@
 """Tests for Robottelo's hammer helpers"""
 
+import json
+from pathlib import Path
+import subprocess
+import sys
+from unittest import mock
+
+import pytest
+
+from robottelo.cli import hammer
+
+INFO_CORPUS_DIR = Path(__file__).parent / 'data' / 'hammer_info'
+
+RSS_SCRIPT = """
+import resource
+import sys
 from robottelo.cli import hammer
+rows = 100000
+if sys.argv[1] == 'stream':
+    with open(sys.argv[2]) as output:
+        rows = sum(1 for _ in hammer.iter_csv(output))
+elif sys.argv[1] == 'parse':
+    with open(sys.argv[2]) as output:
+        rows = len(hammer.parse_csv(output.read()))
+assert rows == 100000, rows
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
 
 
 class TestParseCSV:
@@ -23,6 +48,44 @@ class TestParseCSV:
             {'header': 'unicode', 'header-2': 'chårs'},
         ]
 
+    def test_iter_csv(self):
+        consumed = []
+
+        def lines():
+            for line in ['Id,Name', '1,"multi', 'line"', '', '2,other']:
+                consumed.append(line)
+                yield line
+
+        rows = hammer.iter_csv(lines())
+        assert next(rows) == {'id': '1', 'name': 'multiline'}
+        assert len(consumed) == 3
+        assert list(rows) == [{'id': '2', 'name': 'other'}]
+        assert list(hammer.iter_csv([])) == []
+
+    def test_iter_csv_peak_rss(self, tmp_path):
+        """Streaming 100k rows takes less memory than parsing the complete output"""
+        output = tmp_path / 'hosts.csv'
+        with output.open('w') as csv_file:
+            csv_file.write('Id,Name,Operating System,Host Group,IP,MAC,Global Status\n')
+            for i in range(100000):
+                csv_file.write(
+                    f'{i},host{i}.example.com,RHEL 9.4,hostgroup{i % 10},'
+                    f'10.0.{i // 256 % 256}.{i % 256},00:1a:4a:00:{i // 256 % 256:02x}:'
+                    f'{i % 256:02x},OK\n'
+                )
+        peak_rss = {
+            mode: int(
+                subprocess.check_output(
+                    [sys.executable, '-c', RSS_SCRIPT, mode, str(output)], text=True
+                )
+            )
+            for mode in ('import', 'parse', 'stream')
+        }
+        # compare the memory used on top of the interpreter and imports
+        streaming = peak_rss['stream'] - peak_rss['import']
+        parsing = peak_rss['parse'] - peak_rss['import']
+        assert streaming * 4 < parsing
+
 
 class TestParseJSON:
     """Tests for parsing JSON hammer output"""
@@ -278,8 +341,7 @@ class TestParseHelp:
                     'shortname': None,
                     'value': None,
                     'help': (
-                        'Set the current environment context for the request.'
-                        ' Name/Id can be used'
+                        'Set the current environment context for the request. Name/Id can be used'
                     ),
                 },
                 {
@@ -287,8 +349,7 @@ class TestParseHelp:
                     'shortname': None,
                     'value': None,
                     'help': (
-                        'Set the current environment context for the request.'
-                        ' Name/Id can be used'
+                        'Set the current environment context for the request. Name/Id can be used'
                     ),
                 },
             ],
@@ -537,6 +598,28 @@ class TestParseInfo:
             'host-collections': {},
         }
 
+    @pytest.mark.parametrize(
+        'output_file', sorted(INFO_CORPUS_DIR.glob('*.txt')), ids=lambda path: path.stem
+    )
+    def test_parse_golden_corpus(self, output_file):
+        """Parses the recorded hammer info outputs as expected"""
+        expected = json.loads(output_file.with_suffix('.json').read_text())
+        assert hammer.parse_info(output_file.read_text()) == expected
+
+    def test_parse_info_second_level_lists(self):
+        """Each line of many second level lists is parsed once"""
+        lines = ['Subscription Information:']
+        for i in range(2000):
+            lines += [f'    Activation Keys {i}:', '     1) ak1', '     2) ak2']
+        with mock.patch.object(
+            hammer, '_get_indentation_level', wraps=hammer._get_indentation_level
+        ) as get_indentation_level:
+            result = hammer.parse_info('\n'.join(lines))
+        assert get_indentation_level.call_count == len(lines)
+        section = result['subscription-information']
+        assert len(section) == 2000
+        assert section['activation-keys-1999'] == ['ak1', 'ak2']
+
     def test_parse_json_list(self):
         """Can parse a list in json"""
         assert hammer.parse_json('["item1", "item2"]') == ['item1', 'item2']
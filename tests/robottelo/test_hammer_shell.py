@@ -0,0 +1,159 @@
+"""Tests for module ``robottelo.cli.hammer_shell``."""
+
+import json
+from unittest import mock
+
+import pytest
+
+from robottelo.cli import hammer_shell
+from robottelo.exceptions import HammerShellDesyncError
+
+
+class FakeChannel:
+    """An ssh2 like shell channel returning canned chunks of output."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.sent = []
+
+    def send(self, cmd):
+        self.sent.append(cmd)
+
+    def read(self, size):
+        if not self.chunks:
+            return 0, b''
+        data = self.chunks.pop(0)
+        if isinstance(data, int):
+            # an ssh2 error code
+            return data, b''
+        return len(data), data
+
+    def eof(self):
+        return not self.chunks
+
+    def close(self):
+        self.chunks = []
+
+
+def frame(sentinel, status, stdout, stderr=''):
+    stdout, stderr = stdout.encode(), stderr.encode()
+    return f'{sentinel} {status} {len(stdout)} {len(stderr)}\n'.encode() + stdout + stderr
+
+
+@pytest.fixture
+def shell():
+    shell = hammer_shell.HammerShell('sat.example.com')
+    shell._shell = FakeChannel([])
+    shell._session = mock.Mock()
+    return shell
+
+
+@pytest.mark.parametrize(
+    ('command', 'expected'),
+    [
+        ('organization list  ', ['organization', 'list']),
+        (
+            'organization create --name="my org" --label="my_org" ',
+            ['organization', 'create', '--name=my org', '--label=my_org'],
+        ),
+        (
+            'host list --search="name ~ foo; bar|baz"',
+            ['host', 'list', '--search=name ~ foo; bar|baz'],
+        ),
+        ('user list --search=\'login = "admin"\'', ['user', 'list', '--search=login = "admin"']),
+        ('repository info --id="1" | head -n1', None),
+        ('organization list > /tmp/orgs', None),
+        ('user create --password="pa$$word"', None),
+        ('user list --search="$(whoami)"', None),
+        ('organization info --name="unbalanced', None),
+    ],
+)
+def test_split_command(command, expected):
+    assert hammer_shell.split_command(command) == expected
+
+
+def test_run(shell):
+    shell._shell.chunks = [
+        frame(shell.sentinel, 0, 'Id,Name\n1,org\n', 'warning')[:10],
+        frame(shell.sentinel, 0, 'Id,Name\n1,org\n', 'warning')[10:],
+    ]
+    result = shell.run(['organization', 'list'])
+    assert shell._shell.sent == [json.dumps(['organization', 'list'])]
+    assert result.status == 0
+    assert result.stdout == 'Id,Name\n1,org\n'
+    assert result.stderr == 'warning'
+
+
+def test_run_keeps_next_frame(shell):
+    shell._shell.chunks = [
+        frame(shell.sentinel, 0, 'first') + frame(shell.sentinel, 64, '', 'Error: no such org')
+    ]
+    assert shell.run(['organization', 'list']).stdout == 'first'
+    result = shell.run(['organization', 'info', '--id=1'])
+    assert result.status == 64
+    assert result.stderr == 'Error: no such org'
+
+
+@pytest.mark.parametrize(
+    'chunks',
+    [
+        [b'unexpected output\n'],
+        [b'__other_sentinel__ 0 0 0\n'],
+        [],
+    ],
+    ids=['junk', 'sentinel', 'eof'],
+)
+def test_run_desync(shell, chunks):
+    shell._shell.chunks = chunks
+    with pytest.raises(HammerShellDesyncError) as err:
+        shell.run(['organization', 'list'])
+    assert err.value.sent
+
+
+def test_run_read_error(shell):
+    """A failed channel read is a desync, even if the answer could be read afterwards"""
+    shell._shell.chunks = [-9, frame(shell.sentinel, 0, 'org')]
+    with pytest.raises(HammerShellDesyncError, match='ssh2 error -9') as err:
+        shell.run(['organization', 'list'])
+    assert err.value.sent
+
+
+def test_run_read_timeout(shell):
+    """Every channel read is bounded by the time left, would-block reads are retried"""
+    shell._shell.chunks = [hammer_shell.LIBSSH2_ERROR_EAGAIN, frame(shell.sentinel, 0, 'org')]
+    assert shell.run(['organization', 'list'], timeout=5000).stdout == 'org'
+    timeouts = [call.args[0] for call in shell._session.set_timeout.call_args_list]
+    assert len(timeouts) == 2
+    assert all(0 < timeout <= 5000 for timeout in timeouts)
+    shell._session.set_timeout.reset_mock()
+    shell._shell.chunks = [b'org']
+    shell._fill(float('inf'))
+    shell._session.set_timeout.assert_called_once_with(0)
+
+
+@pytest.mark.parametrize(('read_only', 'raises'), [(True, False), (False, True)])
+def test_execute_desync_fallback(monkeypatch, shell, read_only, raises):
+    monkeypatch.setattr(hammer_shell, '_shells', {shell.hostname: shell})
+    shell._shell.chunks = [b'unexpected output\n']
+    if raises:
+        with pytest.raises(HammerShellDesyncError):
+            hammer_shell.execute(shell.hostname, ['organization', 'create'], read_only=read_only)
+    else:
+        assert (
+            hammer_shell.execute(shell.hostname, ['organization', 'list'], read_only=read_only)
+            is None
+        )
+    assert not shell.started
+
+
+def test_execute_parses_output(monkeypatch, shell):
+    monkeypatch.setattr(hammer_shell, '_shells', {shell.hostname: shell})
+    shell._shell.chunks = [frame(shell.sentinel, 0, 'Id,Name\n1,org\n')]
+    result = hammer_shell.execute(shell.hostname, ['organization', 'list'], output_format='csv')
+    assert result.stdout == [{'id': '1', 'name': 'org'}]
+
+
+def test_execute_busy_shell(monkeypatch, shell):
+    monkeypatch.setattr(hammer_shell, '_shells', {shell.hostname: shell})
+    with shell.lock:
+        assert hammer_shell.execute(shell.hostname, ['organization', 'list']) is None
@@ -1,14 +1,22 @@
 from collections import defaultdict
+from datetime import datetime, timedelta
+import json
 import os
+from pathlib import Path
+import re
 import subprocess
 import sys
+from unittest import mock
 
 from packaging.version import Version
 import pytest
 
-from pytest_plugins.issue_handlers import DEFAULT_BZ_CACHE_FILE
+from pytest_plugins.issue_handlers import DEFAULT_BZ_CACHE_FILE, generate_issue_collection
 from robottelo.constants import CLOSED_STATUSES, OPEN_STATUSES, WONTFIX_RESOLUTIONS
-from robottelo.utils.issue_handlers import add_workaround, is_open, should_deselect
+from robottelo.utils.issue_handlers import add_workaround, is_open, jira, should_deselect
+from robottelo.utils.issue_handlers.cache import IssueCache
+
+JIRA_DATA_DIR = Path(__file__).parent / 'data' / 'jira'
 
 
 class TestBugzillaIssueHandler:
@@ -399,6 +407,207 @@ class TestBugzillaIssueHandler:
         assert os.path.exists(DEFAULT_BZ_CACHE_FILE)
 
 
+class TestJiraIssueHandler:
+    @pytest.fixture(autouse=True)
+    def jira_settings(self, mocker):
+        """Use small batches and clear the responses cached by previous tests"""
+        settings = mocker.patch.object(jira, 'settings')
+        settings.jira.api_key = 'api-key'
+        settings.jira.batch_size = 3
+        settings.jira.max_workers = 2
+        mocker.patch.dict(jira.CACHED_RESPONSES, clear=True)
+
+    @staticmethod
+    def search_response(url, json, headers):
+        """Return a page of at most 2 issues among the ones of the jql"""
+        keys = re.findall(r'id = (\S+)', json['jql'])
+        issues = [
+            {
+                'key': key,
+                'fields': {
+                    'summary': key,
+                    'status': {'name': 'New'},
+                    'labels': [],
+                    'resolution': None,
+                    'fixVersions': [],
+                },
+            }
+            for key in keys[json['startAt'] : json['startAt'] + 2]
+        ]
+        return mock.Mock(**{'json.return_value': {'issues': issues, 'total': len(keys)}})
+
+    def test_get_data_jira_chunks_and_pages(self, mocker):
+        """Assert issues are searched by chunks of batch_size, following the pages"""
+        post = mocker.patch('requests.post', side_effect=self.search_response)
+        issue_ids = [f'SAT-{number}' for number in range(7)]
+
+        data = jira.get_data_jira(issue_ids)
+
+        assert sorted(issue['key'] for issue in data) == sorted(issue_ids)
+        # chunks of 3, 3 and 1 issues, pages of 2 issues
+        assert post.call_count == 5
+        assert all(len(call.kwargs['json']['jql']) < 60 for call in post.call_args_list)
+
+    def test_sanitized_issue_data(self):
+        """Assert the recorded search issues are sanitized as expected"""
+        issues = json.loads((JIRA_DATA_DIR / 'search.json').read_text())['issues']
+        expected = json.loads((JIRA_DATA_DIR / 'search_sanitized.json').read_text())
+        fields = list(jira.mapped_response_fields)
+        assert [jira.sanitized_issue_data(issue, fields) for issue in issues] == expected
+
+    def test_sanitized_issue_data_reads_mapped_fields(self):
+        """Sanitize only reads the issue fields retrieved, without eval nor repr of the issue"""
+
+        class Fields(dict):
+            read = []
+
+            def __getitem__(self, key):
+                self.read.append(key)
+                return super().__getitem__(key)
+
+        issue = json.loads((JIRA_DATA_DIR / 'search.json').read_text())['issues'][1]
+        expected = jira.sanitized_issue_data(issue, list(jira.mapped_response_fields))
+        issue['fields'] = Fields(issue['fields'], description='x' * 100000, comment=[])
+        fields = list(jira.mapped_response_fields)
+        with (
+            mock.patch('builtins.eval', side_effect=AssertionError) as eval_,
+            mock.patch('builtins.repr', side_effect=AssertionError) as repr_,
+        ):
+            result = jira.sanitized_issue_data(issue, fields)
+        assert result == expected
+        eval_.assert_not_called()
+        repr_.assert_not_called()
+        assert sorted(Fields.read) == sorted(
+            ['summary', 'status', 'labels', 'resolution', 'fixVersions', 'customfield_12313440']
+        )
+
+    def test_collect_dupes_by_level(self, mocker):
+        """Assert the duplicates of a level are fetched in a single batch"""
+
+        def get_data_jira(issue_ids, cached_data=None, jira_fields=None):
+            return [
+                {
+                    'key': issue_id,
+                    'status': 'Closed',
+                    'resolution': 'Duplicate' if issue_id == 'SAT-10' else 'Done',
+                    'dupe_of': 'SAT-20',
+                }
+                for issue_id in issue_ids
+            ]
+
+        get_data = mocker.patch.object(jira, 'get_data_jira', side_effect=get_data_jira)
+        collected_data = defaultdict(lambda: {"data": {}, "used_in": []})
+        jiras = [
+            {'key': 'SAT-1', 'resolution': 'Duplicate', 'dupe_of': 'SAT-10'},
+            {'key': 'SAT-2', 'resolution': 'Duplicate', 'dupe_of': 'SAT-11'},
+            {'key': 'SAT-3', 'resolution': 'Duplicate', 'dupe_of': 'SAT-10'},
+        ]
+
+        jira.collect_dupes(jiras, collected_data)
+
+        assert [call.args[0] for call in get_data.call_args_list] == [
+            ['SAT-10', 'SAT-11'],
+            ['SAT-20'],
+        ]
+        assert jiras[2]['dupe_data']['dupe_data']['key'] == 'SAT-20'
+        assert all(collected_data[key]['is_dupe'] for key in ('SAT-10', 'SAT-11', 'SAT-20'))
+
+
+@pytest.mark.parametrize('bz_cache', [False, True])
+def test_collection_fetches_jira_with_cache_only(mocker, tmp_path, monkeypatch, bz_cache):
+    """Assert the Jira issues are only collected to be cached"""
+    monkeypatch.chdir(tmp_path)
+    mocker.patch('pytest_plugins.issue_handlers.bugzilla.collect_data_bz')
+    collect_data_jira = mocker.patch('pytest_plugins.issue_handlers.jira.collect_data_jira')
+    mocker.patch('pytest_plugins.issue_handlers.IssueCache')
+    config = mock.Mock(
+        getoption=lambda name, default=None: bz_cache if name == 'bz_cache' else default
+    )
+    generate_issue_collection([], config)
+    assert collect_data_jira.called is bz_cache
+
+
+class TestIssueCache:
+    @pytest.fixture(autouse=True)
+    def cache_settings(self, mocker):
+        """Cache the open issues for an hour and the closed ones for a day"""
+        settings = mocker.patch('robottelo.utils.issue_handlers.cache.settings')
+        settings.jira.api_key = 'api-key'
+        for handler in (settings.jira, settings.bugzilla):
+            handler.cache_ttl.open = 3600
+            handler.cache_ttl.closed = 86400
+
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+        return str(tmp_path / 'issue_cache.json')
+
+    @staticmethod
+    def collected(**issues):
+        collected_data = defaultdict(lambda: {"data": {}, "used_in": []})
+        for key, status in issues.items():
+            collected_data[key.replace('_', '-')]['data'] = {
+                'key': key.replace('_', '-'),
+                'status': status,
+                'is_open': True,
+            }
+        return collected_data
+
+    def test_ttl_by_status(self, cache_path):
+        """Assert open issues expire before the closed ones"""
+        now = datetime(2024, 1, 1)
+        cache = IssueCache(cache_path)
+        cache.update(self.collected(SAT_1='New', SAT_2='Closed'), {}, now=now)
+        cache.save()
+
+        cache = IssueCache(cache_path)
+        assert set(cache.get_cached_data([], now=now + timedelta(minutes=30))) == {
+            'SAT-1',
+            'SAT-2',
+        }
+        assert set(cache.get_cached_data([], now=now + timedelta(hours=2))) == {'SAT-2'}
+        # the computed fields are not cached
+        assert 'is_open' not in cache.issues['SAT-1']['data']
+
+    def test_errors_not_cached(self, cache_path):
+        """Assert the default data of unreachable APIs is not cached"""
+        collected_data = self.collected(SAT_1='New')
+        collected_data['SAT-1']['data']['error'] = 'missing jira api_key'
+        cache = IssueCache(cache_path)
+        cache.update(collected_data, {})
+        assert not cache.issues
+
+    def test_refresh_updated_jira(self, cache_path, mocker):
+        """Assert only the stale Jira issues updated since their fetch are downloaded again"""
+        now = datetime(2024, 1, 1)
+        cache = IssueCache(cache_path)
+        cache.update(self.collected(SAT_1='New', SAT_2='New', SAT_3='New'), {}, now=now)
+        get_data = mocker.patch.object(
+            jira, 'get_data_jira', return_value=[{'key': 'SAT-2', 'status': 'Closed'}]
+        )
+
+        later = now + timedelta(hours=2)
+        cached_data = cache.get_cached_data(['SAT-1', 'SAT-2'], now=later)
+
+        get_data.assert_called_once_with(['SAT-1', 'SAT-2'], updated_since='-125m')
+        assert cached_data['SAT-1']['data']['status'] == 'New'
+        assert cached_data['SAT-2']['data']['status'] == 'Closed'
+        # not collected, SAT-3 is neither refreshed nor used
+        assert 'SAT-3' not in cached_data
+
+    def test_save_merges_other_processes(self, cache_path):
+        """Assert the issues cached by an other process are kept, the newest data wins"""
+        now = datetime(2024, 1, 1)
+        first, second = IssueCache(cache_path), IssueCache(cache_path)
+        first.update(self.collected(SAT_1='New', SAT_2='New'), {}, now=now)
+        first.save()
+        second.update(self.collected(SAT_2='Closed'), {}, now=now + timedelta(minutes=1))
+        second.save()
+
+        cache = IssueCache(cache_path)
+        assert cache.issues['SAT-1']['data']['status'] == 'New'
+        assert cache.issues['SAT-2']['data']['status'] == 'Closed'
+
+
 def test_add_workaround():
     """Assert helper function adds current items to given data"""
     data = defaultdict(lambda: {"data": {}, "used_in": []})
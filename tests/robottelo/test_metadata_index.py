@@ -0,0 +1,154 @@
+import importlib.util
+import os
+
+import pytest
+
+from robottelo.utils import metadata_index
+from robottelo.utils.metadata_index import MetadataIndex
+
+MODULE_SOURCE = '''"""Test module
+
+:CaseComponent: Repositories
+
+:Team: Phoenix
+"""
+
+
+def is_open(issue):
+    return True
+
+
+class TestRepository:
+    """Repository tests
+
+    :CaseImportance: High
+    """
+
+    def test_sync(self):
+        """Sync a repository
+
+        :Verifies: SAT-1, SAT-2
+
+        :BZ: 123, 456
+        """
+        if is_open('BZ:123'):
+            pass
+        if not is_open('BZ:456'):
+            pass
+
+
+def test_no_docstring():
+    pass
+'''
+
+
+def _import_module(path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def test_module(tmp_path):
+    path = tmp_path / 'test_indexed.py'
+    path.write_text(MODULE_SOURCE)
+    return _import_module(path)
+
+
+@pytest.fixture
+def parse_counter(monkeypatch):
+    calls = []
+    for name in ('parse_docstring', 'parse_source'):
+        parse = getattr(metadata_index, name)
+
+        def counted(text, parse=parse):
+            calls.append(text)
+            return parse(text)
+
+        monkeypatch.setattr(metadata_index, name, counted)
+    return calls
+
+
+def test_docstring_tokens(test_module):
+    index = MetadataIndex()
+    assert index.docstring_tokens(test_module) == {
+        'component': 'Repositories',
+        'importance': None,
+        'team': 'Phoenix',
+        'verifies': None,
+        'blocked_by': None,
+        'bz': None,
+    }
+    assert index.docstring_tokens(test_module.TestRepository)['importance'] == 'High'
+    tokens = index.docstring_tokens(test_module.TestRepository.test_sync)
+    assert tokens['verifies'] == ['SAT-1', 'SAT-2']
+    assert tokens['bz'] == ['123', '456']
+    assert index.docstring_tokens(test_module.test_no_docstring) is None
+    assert index.docstring_tokens(None) is None
+
+
+def test_source_workarounds(test_module):
+    index = MetadataIndex()
+    workarounds = index.source_workarounds(test_module.TestRepository.test_sync)
+    assert workarounds['is_open'] == [['BZ', '123']]
+    assert workarounds['not_is_open'] == [['BZ', '456']]
+    assert index.source_workarounds(test_module)['component'] == 'Repositories'
+    assert index.source_workarounds(test_module.test_no_docstring)['is_open'] == []
+
+
+def test_parsed_once(test_module, parse_counter):
+    index = MetadataIndex()
+    for _ in range(3):
+        index.docstring_tokens(test_module.TestRepository.test_sync)
+        index.source_workarounds(test_module.TestRepository.test_sync)
+    assert len(parse_counter) == 2
+
+
+def test_persisted_index_reused(test_module, tmp_path, parse_counter):
+    index_path = tmp_path / 'index.json'
+    index = MetadataIndex(index_path)
+    tokens = index.docstring_tokens(test_module.TestRepository.test_sync)
+    index.save()
+    parse_counter.clear()
+
+    index = MetadataIndex(index_path)
+    assert index.docstring_tokens(test_module.TestRepository.test_sync) == tokens
+    assert not parse_counter
+
+
+def test_persisted_index_touched_file(test_module, tmp_path, parse_counter):
+    index_path = tmp_path / 'index.json'
+    index = MetadataIndex(index_path)
+    index.docstring_tokens(test_module.TestRepository.test_sync)
+    index.save()
+    parse_counter.clear()
+
+    # same content, different mtime: the content hash keeps the entry
+    stat = os.stat(test_module.__file__)
+    os.utime(test_module.__file__, (stat.st_atime, stat.st_mtime + 10))
+    index = MetadataIndex(index_path)
+    index.docstring_tokens(test_module.TestRepository.test_sync)
+    assert not parse_counter
+
+
+def test_persisted_index_changed_file(test_module, tmp_path):
+    index_path = tmp_path / 'index.json'
+    index = MetadataIndex(index_path)
+    assert index.docstring_tokens(test_module.TestRepository)['importance'] == 'High'
+    index.save()
+
+    path = tmp_path / 'test_indexed.py'
+    path.write_text(MODULE_SOURCE.replace(':CaseImportance: High', ':CaseImportance: Low'))
+    changed_module = _import_module(path)
+    index = MetadataIndex(index_path)
+    assert index.docstring_tokens(changed_module.TestRepository)['importance'] == 'Low'
+
+
+def test_corrupted_index(test_module, tmp_path):
+    index_path = tmp_path / 'index.json'
+    index_path.write_text('{')
+    index = MetadataIndex(index_path)
+    assert index.docstring_tokens(test_module)['component'] == 'Repositories'
+    index.save()
+    assert MetadataIndex(index_path).docstring_tokens(test_module)['team'] == 'Phoenix'
@@ -0,0 +1,120 @@
+"""Tests for module ``robottelo.host_helpers.repository_mixins``."""
+
+from unittest import mock
+
+import pytest
+
+from robottelo import constants
+from robottelo.exceptions import CLIReturnCodeError, RepositorySyncError
+from robottelo.host_helpers import repository_mixins
+from robottelo.host_helpers.repository_mixins import (
+    GenericRHRepository,
+    RepositoryCollection,
+    YumRepository,
+)
+
+
+class RHCustomRepository(GenericRHRepository):
+    """RH repository served from a custom url"""
+
+    _key = constants.PRODUCT_KEY_RHEL
+
+
+@pytest.fixture
+def satellite():
+    satellite = mock.Mock()
+    satellite.cli_factory.make_product_wait.return_value = {'id': 10}
+    satellite.cli_factory.make_repository.side_effect = lambda options: {
+        'id': options['url'].rsplit('/', 1)[-1]
+    }
+    satellite.cli.Repository.synchronize.side_effect = lambda options, timeout=None: [
+        {'id': f'task-{options["id"]}'}
+    ]
+    return satellite
+
+
+@pytest.fixture
+def collection(satellite):
+    repos = [YumRepository(url=f'http://example.com/repo{index}') for index in range(4)]
+    for repo in repos:
+        repo.satellite = satellite
+    collection = RepositoryCollection(repositories=repos)
+    collection.satellite = satellite
+    return collection
+
+
+def test_synchronize_failures(satellite, collection):
+    """The repositories failing to start, failing or timing out are reported together"""
+    collection.setup(1, synchronize=False)
+
+    def synchronize(options):
+        if options['id'] == 'repo0':
+            raise CLIReturnCodeError(65, 'busy', 'repository is busy')
+        return [{'id': options['id']}]
+
+    satellite.cli.Repository.synchronize.side_effect = synchronize
+    poll_errors = {
+        'repo1': repository_mixins.TaskFailedError('task failed'),
+        'repo2': repository_mixins.TaskTimedOutError('task timed out'),
+    }
+
+    def foreman_task(id):
+        return mock.Mock(poll=mock.Mock(side_effect=poll_errors.get(id)))
+
+    satellite.api.ForemanTask.side_effect = foreman_task
+    with pytest.raises(RepositorySyncError) as err:
+        collection.synchronize(timeout=60)
+    message = str(err.value)
+    assert 'repository is busy' in message
+    assert 'task failed' in message
+    assert 'task timed out' in message
+    assert repr(list(collection)[3]) not in message
+    # the repositories that did not start are not polled
+    assert [call.kwargs['id'] for call in satellite.api.ForemanTask.call_args_list] == [
+        'repo1',
+        'repo2',
+        'repo3',
+    ]
+
+
+def test_setup_parallel_sync(satellite, collection):
+    """All the repositories are created before any synchronization starts"""
+    collection.setup(1, parallel_sync=True)
+    calls = [name for name, _, _ in satellite.mock_calls]
+    creates = [index for index, name in enumerate(calls) if name == 'cli_factory.make_repository']
+    syncs = [index for index, name in enumerate(calls) if name == 'cli.Repository.synchronize']
+    assert len(creates) == len(syncs) == 4
+    assert max(creates) < min(syncs)
+    assert all(call.args[0]['async'] for call in satellite.cli.Repository.synchronize.mock_calls)
+    assert satellite.api.ForemanTask.call_count == 4
+
+
+def test_setup_content_view_batch(satellite, collection):
+    """The repositories are set on the content view in a single update"""
+    collection.setup(1, synchronize=False)
+    satellite.cli_factory.make_lifecycle_environment.return_value = {
+        'id': 2,
+        'name': constants.ENVIRONMENT,
+    }
+    satellite.cli_factory.make_content_view.return_value = {'id': 3}
+    collection.setup_content_view(1, batch=True)
+    satellite.cli.ContentView.update.assert_called_once_with(
+        {
+            'id': 3,
+            'organization-id': 1,
+            'repository-ids': ['repo0', 'repo1', 'repo2', 'repo3'],
+        }
+    )
+    satellite.cli.ContentView.add_repository.assert_not_called()
+
+
+@pytest.mark.parametrize('synchronize', [True, False])
+def test_rh_custom_repository_create_synchronize(satellite, synchronize):
+    """A non cdn RH repository is only synchronized when asked to"""
+    repo = RHCustomRepository(url='http://example.com/rhel')
+    repo.satellite = satellite
+    with mock.patch.object(repository_mixins, 'settings') as settings:
+        settings.robottelo.cdn = False
+        assert not repo.cdn
+        assert repo.create(1, 10, synchronize=synchronize) == {'id': 'rhel'}
+    assert satellite.cli.Repository.synchronize.called is synchronize
@@ -0,0 +1,108 @@
+"""Tests for module ``robottelo.cli.rest_read``."""
+
+from unittest import mock
+
+import pytest
+
+from robottelo.cli import rest_read
+from robottelo.cli.base import Base
+from robottelo.exceptions import CLIReturnCodeError
+
+
+class Org(Base):
+    command_base = 'organization'
+    hostname = 'sat.example.com'
+    foreman_admin_username = 'admin'
+    foreman_admin_password = 'changeme'
+
+
+@pytest.fixture
+def rest_settings():
+    with mock.patch('robottelo.cli.rest_read.settings') as settings:
+        settings.performance.rest_read.enabled = True
+        settings.performance.rest_read.validate = False
+        settings.performance.rest_read.entities = ['organization']
+        yield settings
+
+
+@pytest.fixture
+def session(rest_settings):
+    session = mock.Mock()
+    with mock.patch('robottelo.cli.rest_read._session', return_value=session):
+        yield session
+
+
+def api_response(data, status_code=200):
+    return mock.Mock(ok=status_code < 400, status_code=status_code, json=lambda: data, text='')
+
+
+@pytest.mark.parametrize(
+    ('command_sub', 'options', 'expected'),
+    [
+        ('list', {'search': 'name="org"', 'per-page': 10000}, True),
+        ('list', {'organization-id': 1, 'fields': None}, True),
+        ('list', {'fields': 'Id'}, False),
+        ('info', {'id': 1}, False),
+        ('info', {}, False),
+    ],
+)
+def test_supports(rest_settings, command_sub, options, expected):
+    assert rest_read.supports(Org, command_sub, options) is expected
+
+
+def test_supports_disabled_entity(rest_settings):
+    rest_settings.performance.rest_read.entities = ['location']
+    assert not rest_read.supports(Org, 'list', {})
+
+
+def test_read_list(session):
+    session.get.return_value = api_response(
+        {
+            'results': [
+                {
+                    'id': 1,
+                    'title': 'org',
+                    'name': 'org',
+                    'description': None,
+                    'label': 'org',
+                    'created_at': '2024-01-01',
+                }
+            ]
+        }
+    )
+    result = rest_read.read(Org, 'list', {'search': 'name=\\"org\\"', 'per-page': 10000})
+    session.get.assert_called_once_with(
+        'https://sat.example.com/katello/api/organizations',
+        params={'search': 'name="org"', 'per_page': '10000'},
+        timeout=rest_read.REST_READ_TIMEOUT,
+    )
+    assert result == [{'id': '1', 'title': 'org', 'name': 'org', 'description': '', 'label': 'org'}]
+
+
+def test_read_not_found(session):
+    session.get.return_value = api_response({}, status_code=404)
+    with pytest.raises(CLIReturnCodeError) as err:
+        rest_read.read(Org, 'list', {'search': 'name=missing'})
+    assert err.value.status == 65
+
+
+def test_validate(session):
+    session.get.return_value = api_response({'results': [{'id': 1, 'name': 'org'}]})
+    hammer_result = [{'id': '1', 'title': '', 'name': 'org', 'description': '', 'label': ''}]
+    assert rest_read.validate(Org, 'list', {}, hammer_result)
+    hammer_result[0]['name'] = 'other'
+    assert not rest_read.validate(Org, 'list', {}, hammer_result)
+
+
+@mock.patch('robottelo.cli.base.Base.execute')
+@mock.patch('robottelo.cli.base.settings')
+def test_list_from_api(settings, execute, session):
+    session.get.return_value = api_response({'results': [{'id': 1, 'name': 'org'}]})
+    settings.performance.pagination.per_page = 10000
+    settings.performance.validate_hammer_options = False
+    settings.performance.rest_read.validate = False
+    assert Org.list()[0]['name'] == 'org'
+    execute.assert_not_called()
+    settings.performance.rest_read.validate = True
+    execute.return_value = [{'id': '1', 'name': 'org'}]
+    assert Org.list() is execute.return_value
@@ -4,6 +4,9 @@ import random
 from threading import Thread
 import time
 
+import pytest
+
+from robottelo.utils import shared_resource
 from robottelo.utils.shared_resource import SharedResource
 
 
@@ -59,3 +62,80 @@ def test_shared_resource_multithreading():
     t2.join()
 
     assert not Path("/tmp/test_resource_th.shared").exists()
+
+
+def run_barrier(resource_name, delay, action, results):
+    """Register, get ready after delay and record when the resource was released."""
+    try:
+        with SharedResource(resource_name, action, action_is_recoverable=True) as resource:
+            time.sleep(delay)
+            results.append(("ready", time.monotonic()))
+            resource.ready()
+            results.append(("released", time.monotonic()))
+    except Exception as err:
+        results.append(("error", err))
+
+
+def run_threads(resource_name, action, count=4):
+    results = []
+    threads = [
+        Thread(target=run_barrier, args=(resource_name, index * 0.2, action, results))
+        for index in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+        # let the first thread register as the main watcher
+        time.sleep(0.05)
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.mark.parametrize("notified", [True, False], ids=["inotify", "polling"])
+def test_shared_resource_release_latency(monkeypatch, notified):
+    """Test that the watchers are released soon after the last one is ready."""
+    if not notified:
+        monkeypatch.setattr(shared_resource, "inotify_simple", None)
+    results = run_threads("test_resource_latency", upgrade_action)
+
+    last_ready = max(timestamp for event, timestamp in results if event == "ready")
+    released = [timestamp for event, timestamp in results if event == "released"]
+    assert len(released) == 4
+    # the action takes 1 second
+    assert max(released) - last_ready < 1.5
+    assert not Path("/tmp/test_resource_latency.shared").exists()
+
+
+def test_shared_resource_action_error():
+    """Test that the watchers fail when the action of the main watcher fails."""
+
+    def failing_action():
+        raise ValueError("upgrade failed")
+
+    with (  # noqa: PT012
+        SharedResource("test_resource_error", failing_action) as resource,
+        pytest.raises(Exception, match="Error in main watcher"),
+        SharedResource("test_resource_error", failing_action) as other,
+    ):
+        other._update_status("ready")
+        with pytest.raises(ValueError, match="upgrade failed"):
+            resource.ready()
+        other.wait()
+
+    assert not Path("/tmp/test_resource_error.shared").exists()
+
+
+def test_shared_resource_recoverable_action():
+    """Test that another watcher takes over when a recoverable action fails."""
+    calls = []
+
+    def flaky_action():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise ValueError("upgrade failed")
+
+    results = run_threads("test_resource_recover", flaky_action, count=2)
+
+    assert len(calls) == 2
+    assert sorted(event for event, _ in results) == ["error", "ready", "ready", "released"]
+    assert not Path("/tmp/test_resource_recover.shared").exists()
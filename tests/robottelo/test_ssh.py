@@ -1,8 +1,13 @@
 """Tests for module ``robottelo.utils.ssh``."""
 
+import threading
 from unittest import mock
 
+import pytest
+
 from robottelo import ssh
+from robottelo.utils import ssh as ssh_utils
+from robottelo.utils.ssh import SSHSessionPool
 
 
 class MockChannel:
@@ -102,3 +107,187 @@ class TestSSH:
 
         ret = ssh.command('ls -la')
         assert ret[1].cmd == 'ls -la'
+
+
+class MockPooledClient:
+    """A mock pooled client recording health probes and closes."""
+
+    def __init__(self, healthy=True):
+        self.hostname = 'example.com'
+        self.healthy = healthy
+        self.probes = 0
+        self.closed = False
+
+    def execute(self, cmd, timeout=None):
+        self.probes += 1
+        return mock.Mock(status=0 if self.healthy else 1)
+
+    def close(self):
+        self.closed = True
+
+
+class TestSSHSessionPool:
+    """Tests for ``robottelo.utils.ssh.SSHSessionPool``."""
+
+    key = ('example.com', 22, 'root', False)
+
+    def test_reuse_client(self):
+        pool = SSHSessionPool()
+        client = pool.get(self.key, MockPooledClient)
+        assert pool.get(self.key, MockPooledClient) is client
+        assert pool.get(('other.com', 22, 'root', False), MockPooledClient) is not client
+        assert pool.stats() == {
+            'size': 2,
+            'hits': 1,
+            'misses': 2,
+            'evictions': 0,
+            'hit_rate': 1 / 3,
+        }
+
+    def test_client_per_thread(self):
+        pool = SSHSessionPool()
+        client = pool.get(self.key, MockPooledClient)
+        clients = []
+        thread = threading.Thread(
+            target=lambda: clients.append(pool.get(self.key, MockPooledClient))
+        )
+        thread.start()
+        thread.join()
+        assert clients[0] is not client
+        # the client of the finished thread is evicted on next access
+        assert pool.get(self.key, MockPooledClient) is client
+        assert clients[0].closed
+        assert pool.stats()['size'] == 1
+
+    def test_max_size(self):
+        pool = SSHSessionPool(max_size=2)
+        first = pool.get(('a', 22, 'root', False), MockPooledClient)
+        pool.get(('b', 22, 'root', False), MockPooledClient)
+        pool.get(('c', 22, 'root', False), MockPooledClient)
+        assert first.closed
+        assert pool.stats()['size'] == 2
+        assert pool.stats()['evictions'] == 1
+
+    def test_idle_eviction(self):
+        pool = SSHSessionPool(idle_timeout=0)
+        client = pool.get(self.key, MockPooledClient)
+        assert pool.get(self.key, MockPooledClient) is not client
+        assert client.closed
+
+    def test_health_check(self):
+        pool = SSHSessionPool(health_check_interval=-1)
+        healthy = pool.get(self.key, MockPooledClient)
+        assert pool.get(self.key, MockPooledClient) is healthy
+        assert healthy.probes == 1
+        pool.discard(self.key)
+        unhealthy = pool.get(self.key, lambda: MockPooledClient(healthy=False))
+        assert pool.get(self.key, MockPooledClient) is not unhealthy
+        assert unhealthy.closed
+
+    @pytest.mark.parametrize('probe', [False, True])
+    def test_connect_and_probe_without_lock(self, probe):
+        """A thread connecting or probing its client does not block the other threads"""
+        pool = SSHSessionPool(health_check_interval=-1)
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return MockPooledClient()
+
+        def slow_thread():
+            if probe:
+                client = pool.get(self.key, MockPooledClient)
+                client.execute = lambda cmd, timeout=None: slow().execute(cmd)
+                pool.get(self.key, MockPooledClient)
+            else:
+                pool.get(self.key, slow)
+
+        clients = []
+        other_thread = threading.Thread(
+            target=lambda: clients.append(pool.get(self.key, MockPooledClient))
+        )
+        thread = threading.Thread(target=slow_thread)
+        thread.start()
+        try:
+            assert started.wait(5)
+            other_thread.start()
+            other_thread.join(2)
+            assert clients, 'the pool was locked while a client was connecting or probed'
+        finally:
+            release.set()
+            thread.join()
+            other_thread.join()
+
+    def test_clear(self):
+        pool = SSHSessionPool()
+        client = pool.get(self.key, MockPooledClient)
+        pool.clear()
+        assert client.closed
+        assert pool.stats()['size'] == 0
+
+
+class MockStreamChannel:
+    """A mock ssh2 channel returning canned chunks of stdout."""
+
+    def __init__(self, chunks, stderr=b'', status=0):
+        self.chunks = list(chunks)
+        self.stderr = [stderr] if stderr else []
+        self.status = status
+        self.command = None
+        self.closed = False
+
+    def execute(self, cmd):
+        self.command = cmd
+
+    def read(self):
+        data = self.chunks.pop(0) if self.chunks else b''
+        return len(data), data
+
+    def read_stderr(self):
+        data = self.stderr.pop(0) if self.stderr else b''
+        return len(data), data
+
+    def wait_eof(self):
+        pass
+
+    def get_exit_status(self):
+        return self.status
+
+    def close(self):
+        self.closed = True
+
+
+class TestStreamCommand:
+    """Tests for ``robottelo.utils.ssh.stream_command``."""
+
+    def stream(self, channel):
+        client = MockPooledClient()
+        client.session = mock.Mock()
+        client.session.session.open_session.return_value = channel
+        with mock.patch('robottelo.utils.ssh.get_client', return_value=client) as get_client:
+            result = ssh_utils.stream_command('hammer host list', timeout=1000)
+        assert not get_client.call_args.kwargs['pooled']
+        return client, result
+
+    def test_stream_lines(self):
+        channel = MockStreamChannel(
+            [b'Id,Na', b'me\n1,h\xc3', b'\xa5st\n2,', b'other'], stderr=b'warning', status=0
+        )
+        client, result = self.stream(channel)
+        assert not client.session.session.open_session.called
+        assert list(result.stdout) == ['Id,Name', '1,håst', '2,other']
+        assert channel.command == 'hammer host list'
+        assert result.status == 0
+        assert result.stderr == 'warning'
+        assert channel.closed
+        assert client.closed
+
+    def test_stop_early(self):
+        channel = MockStreamChannel([b'Id,Name\n1,host\n', b'2,other\n'])
+        client, result = self.stream(channel)
+        assert next(result.stdout) == 'Id,Name'
+        result.stdout.close()
+        assert result.status is None
+        assert channel.closed
+        assert client.closed
@@ -0,0 +1,63 @@
+"""Tests for module ``robottelo.host_helpers.task_graph``."""
+
+import threading
+
+import pytest
+
+from robottelo.exceptions import CLIFactoryError
+from robottelo.host_helpers.task_graph import TaskGraph
+
+
+def test_run_passes_required_results():
+    graph = TaskGraph()
+    graph.add('org_id', lambda: 1)
+    graph.add('product', lambda org_id: {'id': 2, 'org': org_id}, requires=['org_id'])
+    graph.add('repo', lambda product, url: (product['id'], url), requires=['product', 'url'])
+    assert graph.run(url='http://repo') == {
+        'url': 'http://repo',
+        'org_id': 1,
+        'product': {'id': 2, 'org': 1},
+        'repo': (2, 'http://repo'),
+    }
+
+
+def test_independent_steps_run_concurrently():
+    barrier = threading.Barrier(3, timeout=10)
+    graph = TaskGraph(max_workers=3)
+    graph.add('org_id', lambda: 1)
+    for name in ('env_id', 'product', 'cv_id'):
+        graph.add(name, lambda org_id: barrier.wait(), requires=['org_id'])
+    order = []
+    graph.add('published', lambda: order.append('published'), after=['env_id', 'cv_id'])
+    results = graph.run()
+    assert sorted(results[name] for name in ('env_id', 'product', 'cv_id')) == [0, 1, 2]
+    assert order == ['published']
+
+
+def test_failed_step_stops_the_graph():
+    started = []
+    graph = TaskGraph(max_workers=2)
+    graph.add('org_id', lambda: 1)
+
+    def fail(org_id):
+        raise CLIFactoryError('Failed to synchronize repository')
+
+    graph.add('synced', fail, requires=['org_id'])
+    graph.add('env_id', lambda org_id: started.append('env_id'), requires=['org_id'])
+    graph.add('published', lambda: started.append('published'), after=['synced'])
+    with pytest.raises(CLIFactoryError, match='Failed to synchronize repository'):
+        graph.run()
+    assert 'published' not in started
+
+
+def test_invalid_graph():
+    graph = TaskGraph()
+    graph.add('org_id', lambda: 1)
+    with pytest.raises(ValueError, match='already declared'):
+        graph.add('org_id', lambda: 2)
+    graph.add('repo', lambda product: product, requires=['product'])
+    graph.add('product', lambda org_id: org_id, requires=['org_id'])
+    with pytest.raises(ValueError, match="unknown step or input 'product'"):
+        graph.run()
+    with pytest.raises(ValueError, match='also given as an input'):
+        graph.run(org_id=1, product=2)